@@ -10,6 +10,7 @@ Week 3 POC required to validate feasibility.
 Usage:
   - PR Pipeline: python mutmut_ada.py --paths-to-mutate $(git diff --name-only main...HEAD | grep -E '\.adb$' | tr '\n' ',')
   - Nightly Full Scan: python mutmut_ada.py --paths-to-mutate src/
+  - Tree-wide Ada driver: python improvements/generate_mutants.py --config configs/mutmut_config.py -b <build tree>
 
 Target: ≥80% mutation score for new code, ≥75% for legacy
 
@@ -85,7 +86,7 @@ THRESHOLDS = {
 
 # Performance configuration
 PARALLEL_WORKERS = 4                    # Parallel execution (adjust based on CI runner cores)
-TIMEOUT_PER_MUTANT = 60                 # 60s timeout per mutant
+TIMEOUT_PER_MUTANT = 60                 # Upper limit on the calibrated per-mutant timeout (s)
 CACHE_DIR = ".mutmut-tmp/cache"         # Incremental mode cache
 
 # Reporting
@@ -17,24 +17,62 @@ Usage:
     python baseline_capture.py --services all --duration 300
     python baseline_capture.py --services api-gateway,widget-core --duration 60
     python baseline_capture.py --output baselines/2024-01-15.json
+    python baseline_capture.py --services api-gateway --rps 2000 --workers 4
+    python baseline_capture.py --history-db ../../../improvements/performance/history.db
 """
 
 import argparse
+import asyncio
 import json
+import multiprocessing
+import os
+import platform
+import random
+import socket
+import subprocess
 import time
+import queue
 import statistics
-import psutil
-import requests
-from typing import Dict, List, Tuple, Any
-from dataclasses import dataclass, asdict
+import httpx
+from typing import Any, Dict, Iterator, List, Optional
+from dataclasses import dataclass, asdict, field
 from datetime import datetime, timezone
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+from polyorb_tooling import LatencyHistogram, PerformanceHistory
+from resource_collector import ProcessSampler, ResourceSample, prometheus_values, redis_info
 
 # ==============================================================================
 # Service Configuration
 # ==============================================================================
 
+# Seconds before a single request counts as failed
+REQUEST_TIMEOUT = 10.0
+
+# Latencies are recorded in whole microseconds; the histogram keeps them
+# within 1/64 (1.6%) relative precision
+LATENCY_UNIT = 'us'
+
+# Seconds between the histogram and counter reports of load workers
+WORKER_REPORT_INTERVAL = 1.0
+
+# Seconds between the last load worker reporting ready and the start of
+# their shared schedule
+WORKER_START_DELAY = 0.1
+
+# Seconds between resource samples of the services' processes
+SAMPLE_INTERVAL = 1.0
+
+# Redis instance behind the services' caches
+REDIS = {'host': 'localhost', 'port': 6379}
+
+# Besides url and endpoints, a service may set:
+#   'pid_file': file holding the service's PID
+#   'cgroup': cgroup directory or container ID of the service
+#   'pool_metrics': names of its Prometheus metrics for connection pool
+#       'active', 'idle' and 'max_size'
+# Without pid_file or cgroup, the process listening on the URL's port is
+# sampled (see resource_collector.py).
 SERVICES = {
     'api-gateway': {
         'url': 'http://localhost:8080',
@@ -83,20 +121,33 @@ SERVICES = {
 
 @dataclass
 class LatencyMetrics:
-    """Latency metrics for an endpoint"""
+    """
+    Latency metrics for an endpoint
+
+    The raw statistics are None (sample_count 0) when no request got a
+    response, e.g. every request timed out during a stall; the corrected
+    statistics still record how long those requests waited.
+    """
     endpoint: str
     method: str
-    min: float
-    max: float
-    mean: float
-    median: float
-    p50: float
-    p90: float
-    p95: float
-    p99: float
-    p999: float
-    stddev: float
+    min: Optional[float]
+    max: Optional[float]
+    mean: Optional[float]
+    median: Optional[float]
+    p50: Optional[float]
+    p90: Optional[float]
+    p95: Optional[float]
+    p99: Optional[float]
+    p999: Optional[float]
+    stddev: Optional[float]
     sample_count: int
+    # Same statistics measured from the intended send time, failures
+    # included (coordinated-omission corrected); None in older snapshots
+    corrected: Optional[Dict[str, float]] = None
+    # Serialized LatencyHistogram (microseconds) behind the raw and
+    # corrected statistics, mergeable across captures; None in older snapshots
+    histogram: Optional[Dict[str, Any]] = None
+    corrected_histogram: Optional[Dict[str, Any]] = None
 
 @dataclass
 class ThroughputMetrics:
@@ -115,18 +166,25 @@ class MemoryMetrics:
     service: str
     rss_mb: float           # Resident Set Size (actual physical memory)
     vms_mb: float           # Virtual Memory Size
-    heap_mb: float          # Heap memory (if available)
-    shared_mb: float        # Shared memory
+    heap_mb: Optional[float]    # Anonymous memory: heap and anonymous mmaps (if available)
+    shared_mb: Optional[float]  # Shared memory (if available)
     percent: float          # Memory percentage
+    # Means over the capture, like the fields above; None without access
+    # to /proc/<pid>/smaps_rollup or in older snapshots
+    pss_mb: Optional[float] = None      # Proportional Set Size
+    uss_mb: Optional[float] = None      # Unique Set Size (private memory)
+    peak_rss_mb: Optional[float] = None
 
 @dataclass
 class CPUMetrics:
     """CPU usage metrics"""
     service: str
-    cpu_percent: float
-    user_time: float
+    cpu_percent: float      # Mean over the capture (100 = one core)
+    user_time: float        # CPU seconds used during the capture
     system_time: float
-    num_threads: int
+    num_threads: int        # Peak over the capture
+    peak_cpu_percent: Optional[float] = None
+    num_fds: Optional[int] = None       # Peak open file descriptors
 
 @dataclass
 class ConnectionPoolMetrics:
@@ -140,11 +198,11 @@ class ConnectionPoolMetrics:
 
 @dataclass
 class CacheMetrics:
-    """Redis cache metrics"""
+    """Redis cache metrics (rates over the capture)"""
     service: str
     hit_rate: float
     miss_rate: float
-    eviction_rate: float
+    eviction_rate: float    # Evicted keys per second
     memory_usage_mb: float
     keys_count: int
 
@@ -161,6 +219,80 @@ class BaselineSnapshot:
     connection_pools: List[ConnectionPoolMetrics]
     cache: List[CacheMetrics]
     metadata: Dict[str, Any]
+    # Resource samples of each service's processes over the capture
+    resources: Dict[str, List[ResourceSample]] = field(default_factory=dict)
+
+# ==============================================================================
+# Latency Recording
+# ==============================================================================
+
+class LatencyRecorder:
+    """
+    Raw and coordinated-omission-corrected latencies of one endpoint
+
+    Raw latency runs from the moment a request was actually sent, which
+    is what a closed-loop client sees. Corrected latency runs from the
+    moment the arrival schedule intended to send it, so time spent
+    queued behind a stalled service counts, just like the back-filled
+    samples of HdrHistogram's corrected recording. Failed requests
+    (timeouts, resets) have no raw latency, but their time until failure
+    is a corrected sample, so stalls that end in errors are not omitted
+    from the tail.
+
+    Both are kept as log-linear histograms rather than sample lists, so
+    recording is O(1), memory stays constant however long or hard the
+    capture runs, and recorders from several captures merge exactly.
+    """
+
+    def __init__(self):
+        self.raw = LatencyHistogram(unit=LATENCY_UNIT)
+        self.corrected = LatencyHistogram(unit=LATENCY_UNIT)
+
+    def record(self, intended: float, sent: float, completed: float):
+        """Record a response; times in seconds on one monotonic clock"""
+        self.raw.record((completed - sent) * 1e6)
+        self.corrected.record((completed - intended) * 1e6)
+
+    def record_failure(self, intended: float, failed: float):
+        self.corrected.record((failed - intended) * 1e6)
+
+    def merge(self, other: 'LatencyRecorder') -> 'LatencyRecorder':
+        self.raw.merge(other.raw)
+        self.corrected.merge(other.corrected)
+        return self
+
+class ServiceLoad:
+    """
+    Latency recorders and request counters of one service's load
+
+    In worker mode each worker process keeps its own ServiceLoad and
+    periodically hands over what it recorded since the last report
+    (take()); the coordinator merges these deltas (merge()) into one
+    ServiceLoad per service. Recorders and counters only ever add up, so
+    the merged result is the same as one process doing all the work.
+    """
+
+    def __init__(self, endpoints: List[Dict]):
+        self.recorders = {ep['name']: LatencyRecorder() for ep in endpoints}
+        self.counts = {'total': 0, 'success': 0, 'failed': 0}
+        self.elapsed = 0.0      # Seconds from first intended send to last completion
+
+    def take(self) -> 'ServiceLoad':
+        """Return everything recorded so far and start over empty"""
+        delta = ServiceLoad([])
+        delta.recorders, delta.counts, delta.elapsed = self.recorders, self.counts, self.elapsed
+        self.recorders = {name: LatencyRecorder() for name in delta.recorders}
+        self.counts = {key: 0 for key in delta.counts}
+        return delta
+
+    def merge(self, other: 'ServiceLoad') -> 'ServiceLoad':
+        for name, recorder in other.recorders.items():
+            self.recorders.setdefault(name, LatencyRecorder()).merge(recorder)
+        for key, count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+        # Workers run side by side: the load lasted as long as the slowest
+        self.elapsed = max(self.elapsed, other.elapsed)
+        return self
 
 # ==============================================================================
 # Baseline Capture Class
@@ -169,11 +301,21 @@ class BaselineSnapshot:
 class BaselineCapture:
     """Captures performance baselines for services"""
 
-    def __init__(self, services: List[str], duration: int, rps: int = 10):
+    def __init__(self, services: List[str], duration: int, rps: int = 10,
+                 arrival: str = 'constant', max_in_flight: int = 1000, seed: int = 0,
+                 workers: int = 1, worker_index: Optional[int] = None,
+                 sample_interval: float = SAMPLE_INTERVAL):
         self.services = {k: v for k, v in SERVICES.items() if k in services}
         self.duration = duration
-        self.rps = rps  # Requests per second for load generation
-        self.session = requests.Session()
+        self.rps = rps  # Requests per second for load generation (per service)
+        self.arrival = arrival  # 'constant' or 'poisson' inter-arrival times
+        self.max_in_flight = max_in_flight  # Concurrent requests per service
+        self.seed = seed
+        self.workers = workers  # Load generation processes (1: in-process)
+        self.worker_index = worker_index  # Set inside a worker process
+        self.sample_interval = sample_interval  # Seconds between resource samples
+        self.load = {name: ServiceLoad(config['test_endpoints'])
+                     for name, config in self.services.items()}
         self.results = {
             'latency': [],
             'throughput': [],
@@ -181,12 +323,15 @@ class BaselineCapture:
             'cpu': [],
             'connection_pools': [],
             'cache': [],
+            'resources': {},
         }
 
     def run(self) -> BaselineSnapshot:
         """Run complete baseline capture"""
         print(f"Starting baseline capture for {list(self.services.keys())}")
-        print(f"Duration: {self.duration}s, Target RPS: {self.rps}")
+        print(f"Duration: {self.duration}s, Target RPS: {self.rps} per service "
+              f"({self.arrival} arrivals, up to {self.max_in_flight} in flight"
+              f"{f', {self.workers} worker processes' if self.workers > 1 else ''})")
 
         # Check service health
         self._check_health()
@@ -194,18 +339,17 @@ class BaselineCapture:
         # Capture baseline metrics
         start_time = time.time()
 
-        # Run load generation and metric collection concurrently
-        with ThreadPoolExecutor(max_workers=len(self.services) + 2) as executor:
-            futures = []
-
-            # Start load generation for each service
-            for service_name, service_config in self.services.items():
-                future = executor.submit(self._generate_load, service_name, service_config)
-                futures.append(('load', service_name, future))
-
-            # Start metric collection
-            future = executor.submit(self._collect_metrics_continuously)
-            futures.append(('metrics', 'all', future))
+        # Run load generation (one event loop for all services, or worker
+        # processes) and metric collection concurrently
+        if self.workers > 1:
+            generate_load = self._run_load_workers
+        else:
+            generate_load = lambda: asyncio.run(self._generate_load_all())
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                ('load', 'all', executor.submit(generate_load)),
+                ('metrics', 'all', executor.submit(self._collect_metrics_continuously)),
+            ]
 
             # Wait for completion
             for task_type, service_name, future in futures:
@@ -217,6 +361,9 @@ class BaselineCapture:
         end_time = time.time()
         actual_duration = int(end_time - start_time)
 
+        for service_name in self.services:
+            self._summarize_load(service_name)
+
         # Build baseline snapshot
         snapshot = BaselineSnapshot(
             timestamp=datetime.now(timezone.utc).isoformat(),
@@ -228,10 +375,16 @@ class BaselineCapture:
             cpu=self.results['cpu'],
             connection_pools=self.results['connection_pools'],
             cache=self.results['cache'],
+            resources=self.results['resources'],
             metadata={
                 'target_rps': self.rps,
-                'python_version': psutil.PYTHON,
-                'platform': psutil.PROCFS_PATH if hasattr(psutil, 'PROCFS_PATH') else 'unknown',
+                'arrival': self.arrival,
+                'max_in_flight': self.max_in_flight,
+                'seed': self.seed,
+                'workers': self.workers,
+                'sample_interval': self.sample_interval,
+                'python_version': platform.python_version(),
+                'platform': platform.platform(),
             }
         )
 
@@ -240,236 +393,488 @@ class BaselineCapture:
     def _check_health(self):
         """Check all services are healthy"""
         print("\nChecking service health...")
-        for service_name, service_config in self.services.items():
-            url = f"{service_config['url']}{service_config['health_endpoint']}"
+        with httpx.Client(timeout=5) as client:
+            for service_name, service_config in self.services.items():
+                url = f"{service_config['url']}{service_config['health_endpoint']}"
+                try:
+                    response = client.get(url)
+                    if response.status_code == 200:
+                        print(f"  ✓ {service_name}: healthy")
+                    else:
+                        print(f"  ✗ {service_name}: unhealthy (HTTP {response.status_code})")
+                        raise RuntimeError(f"{service_name} is not healthy")
+                except httpx.HTTPError as e:
+                    print(f"  ✗ {service_name}: unreachable ({e})")
+                    raise RuntimeError(f"{service_name} is unreachable")
+
+    async def _generate_load_all(self, start_at: Optional[float] = None,
+                                 reports: Optional[Any] = None):
+        """
+        Drive every service from one event loop and connection pool
+
+        start_at: monotonic time at which the arrival schedules begin
+            (default: now); workers share it so their slices line up
+        reports: queue that receives this worker's recorded deltas every
+            WORKER_REPORT_INTERVAL seconds (worker processes only)
+        """
+        max_in_flight = -(-self.max_in_flight // self.workers)
+        limits = httpx.Limits(max_connections=max_in_flight * len(self.services),
+                              max_keepalive_connections=max_in_flight * len(self.services))
+        # No pool timeout: waiting for a connection is part of the latency
+        timeout = httpx.Timeout(REQUEST_TIMEOUT, pool=None)
+        reporter = None
+        if reports is not None:
+            reporter = asyncio.ensure_future(self._report_load(reports))
+        try:
+            async with httpx.AsyncClient(limits=limits, timeout=timeout) as client:
+                await asyncio.gather(*(
+                    self._generate_load(client, service_name, service_config,
+                                        max_in_flight, start_at)
+                    for service_name, service_config in self.services.items()))
+        finally:
+            if reporter is not None:
+                reporter.cancel()
+
+    async def _report_load(self, reports: Any):
+        """Stream what this worker recorded since its last report"""
+        while True:
+            await asyncio.sleep(WORKER_REPORT_INTERVAL)
+            reports.put(('report', self.worker_index, self._take_load()))
+
+    def _take_load(self) -> Dict[str, ServiceLoad]:
+        return {service_name: load.take() for service_name, load in self.load.items()}
+
+    def _run_load_workers(self):
+        """
+        Spawn load worker processes and merge their reports
+
+        Each worker runs the open-loop generator for every service at
+        rps / workers and streams its histograms and counters back over a
+        queue, so a single service can be loaded past what one
+        GIL-bound event loop can issue.
+
+        Workers are spawned rather than forked: the coordinator already
+        runs the metrics collection thread, and a forked child could
+        inherit a lock that thread holds. Spawned workers take a while to
+        import, so each reports 'ready' and the shared schedule is set
+        only once all of them have.
+        """
+        context = multiprocessing.get_context('spawn')
+        reports = context.Queue()
+        go = context.Event()
+        start_at = context.Value('d', 0.0)
+        settings = {
+            'services': list(self.services), 'duration': self.duration, 'rps': self.rps,
+            'arrival': self.arrival, 'max_in_flight': self.max_in_flight,
+            'seed': self.seed, 'workers': self.workers,
+        }
+        processes = [
+            context.Process(target=_load_worker, args=(settings, index, go, start_at, reports),
+                            daemon=True)
+            for index in range(self.workers)
+        ]
+        for process in processes:
+            process.start()
+        for service_name in self.services:
+            print(f"Starting load generation for {service_name} "
+                  f"({self.workers} workers at {self.rps / self.workers:g} RPS each)")
+
+        running = set(range(self.workers))
+        ready = set()
+        while running:
+            if not go.is_set() and running <= ready:
+                start_at.value = time.monotonic() + WORKER_START_DELAY
+                go.set()
             try:
-                response = self.session.get(url, timeout=5)
-                if response.status_code == 200:
-                    print(f"  ✓ {service_name}: healthy")
-                else:
-                    print(f"  ✗ {service_name}: unhealthy (HTTP {response.status_code})")
-                    raise RuntimeError(f"{service_name} is not healthy")
-            except requests.RequestException as e:
-                print(f"  ✗ {service_name}: unreachable ({e})")
-                raise RuntimeError(f"{service_name} is unreachable")
-
-    def _generate_load(self, service_name: str, service_config: Dict):
-        """Generate load for a service"""
-        print(f"Starting load generation for {service_name}")
+                kind, index, payload = reports.get(timeout=WORKER_REPORT_INTERVAL * 5)
+            except queue.Empty:
+                # A worker that died without a final report is not coming back
+                for index in [i for i in running if not processes[i].is_alive()]:
+                    print(f"  Load worker {index} exited with code {processes[index].exitcode}")
+                    running.discard(index)
+                continue
+            if kind == 'ready':
+                ready.add(index)
+                continue
+            if kind == 'error':
+                print(f"  Load worker {index} failed: {payload}")
+                running.discard(index)
+                continue
+            for service_name, delta in payload.items():
+                self.load[service_name].merge(delta)
+            if kind == 'done':
+                running.discard(index)
+
+        for process in processes:
+            process.join()
+
+    def _arrival_offsets(self, service_name: str) -> Iterator[float]:
+        """Intended send times of one service, in seconds from the start"""
+        if self.worker_index is None:
+            rng = random.Random(f"{self.seed}:{service_name}")
+            rate = self.rps
+            offset = 0.0
+        else:
+            # Each worker drives rps / workers. Constant schedules are
+            # staggered so the combined stream stays evenly spaced;
+            # independent Poisson streams add up to one at the full rate
+            rng = random.Random(f"{self.seed}:{service_name}:{self.worker_index}")
+            rate = self.rps / self.workers
+            if self.arrival == 'poisson':
+                offset = rng.expovariate(rate)
+            else:
+                offset = self.worker_index / self.rps
+        while offset < self.duration:
+            yield offset
+            if self.arrival == 'poisson':
+                offset += rng.expovariate(rate)
+            else:
+                offset += 1.0 / rate
+
+    async def _generate_load(self, client: 'httpx.AsyncClient', service_name: str,
+                             service_config: Dict, max_in_flight: int,
+                             start_at: Optional[float] = None):
+        """
+        Generate open-loop load for a service
+
+        Requests are issued on a fixed arrival timeline (constant or
+        Poisson at self.rps) whether or not earlier ones have completed,
+        and latency is measured from each request's intended send time.
+        A stalled service therefore shows up as queueing in the latency
+        instead of silently lowering the request rate.
+        """
+        if self.worker_index is None:
+            print(f"Starting load generation for {service_name}")
 
         base_url = service_config['url']
         endpoints = service_config['test_endpoints']
-        request_interval = 1.0 / self.rps  # Time between requests
-
-        latencies = {ep['name']: [] for ep in endpoints}
-        request_counts = {'total': 0, 'success': 0, 'failed': 0}
 
-        start_time = time.time()
-        end_time = start_time + self.duration
+        load = self.load[service_name]
+        reported_errors = set()
 
-        while time.time() < end_time:
-            for endpoint in endpoints:
-                request_start = time.time()
+        loop = asyncio.get_running_loop()
+        in_flight = asyncio.Semaphore(max_in_flight)
+        pending = set()
 
+        # The recorders are looked up when a request completes, not when it
+        # is issued: a worker report may have swapped them in between
+        async def issue(endpoint: Dict, intended: float):
+            async with in_flight:
+                sent = loop.time()
                 try:
-                    url = f"{base_url}{endpoint['path']}"
-                    method = endpoint['method']
-                    body = endpoint.get('body')
-                    headers = endpoint.get('headers', {})
-
-                    if method == 'GET':
-                        response = self.session.get(url, headers=headers, timeout=10)
-                    elif method == 'POST':
-                        response = self.session.post(url, json=body, headers=headers, timeout=10)
-                    elif method == 'PUT':
-                        response = self.session.put(url, json=body, headers=headers, timeout=10)
-                    elif method == 'DELETE':
-                        response = self.session.delete(url, headers=headers, timeout=10)
-
-                    request_end = time.time()
-                    latency_ms = (request_end - request_start) * 1000
-
-                    latencies[endpoint['name']].append(latency_ms)
-                    request_counts['total'] += 1
-
-                    if 200 <= response.status_code < 400:
-                        request_counts['success'] += 1
-                    else:
-                        request_counts['failed'] += 1
-
-                except requests.RequestException as e:
-                    request_counts['total'] += 1
-                    request_counts['failed'] += 1
-                    print(f"  Request failed for {service_name} {endpoint['name']}: {e}")
-
-                # Rate limiting
-                time.sleep(request_interval)
+                    response = await client.request(
+                        endpoint['method'], f"{base_url}{endpoint['path']}",
+                        json=endpoint.get('body'), headers=endpoint.get('headers'))
+                except httpx.HTTPError as e:
+                    load.recorders[endpoint['name']].record_failure(intended, loop.time())
+                    load.counts['total'] += 1
+                    load.counts['failed'] += 1
+                    if endpoint['name'] not in reported_errors:
+                        reported_errors.add(endpoint['name'])
+                        print(f"  Request failed for {service_name} {endpoint['name']}: "
+                              f"{e!r} (further failures counted silently)")
+                    return
+
+            load.recorders[endpoint['name']].record(intended, sent, loop.time())
+            load.counts['total'] += 1
+            if 200 <= response.status_code < 400:
+                load.counts['success'] += 1
+            else:
+                load.counts['failed'] += 1
+
+        start_time = start_at if start_at is not None else loop.time()
+        for i, offset in enumerate(self._arrival_offsets(service_name)):
+            intended = start_time + offset
+            delay = intended - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            task = asyncio.ensure_future(issue(endpoints[i % len(endpoints)], intended))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+
+        if pending:
+            await asyncio.gather(*pending)
+
+        load.elapsed = loop.time() - start_time
+
+    def _summarize_load(self, service_name: str):
+        """Turn a service's (merged) load recording into latency and throughput metrics"""
+        service_config = self.services[service_name]
+        load = self.load[service_name]
 
         # Calculate latency metrics
-        for endpoint in endpoints:
-            if latencies[endpoint['name']]:
+        for endpoint in service_config['test_endpoints']:
+            recorder = load.recorders[endpoint['name']]
+            # Corrected samples include failed requests: an endpoint that
+            # only timed out still gets an entry
+            if recorder.corrected.total_count:
                 self._calculate_latency_metrics(
                     service_name,
                     endpoint['name'],
                     endpoint['method'],
-                    latencies[endpoint['name']]
+                    recorder
                 )
 
         # Calculate throughput metrics
-        actual_duration = time.time() - start_time
+        counts = load.counts
+        actual_duration = load.elapsed or self.duration
         throughput = ThroughputMetrics(
             service=service_name,
-            requests_per_second=request_counts['total'] / actual_duration,
-            requests_per_minute=request_counts['total'] / actual_duration * 60,
-            total_requests=request_counts['total'],
-            successful_requests=request_counts['success'],
-            failed_requests=request_counts['failed'],
-            error_rate=request_counts['failed'] / max(request_counts['total'], 1)
+            requests_per_second=counts['total'] / actual_duration,
+            requests_per_minute=counts['total'] / actual_duration * 60,
+            total_requests=counts['total'],
+            successful_requests=counts['success'],
+            failed_requests=counts['failed'],
+            error_rate=counts['failed'] / max(counts['total'], 1)
         )
         self.results['throughput'].append(throughput)
 
         print(f"Load generation complete for {service_name}: " +
-              f"{request_counts['total']} requests, " +
+              f"{counts['total']} requests, " +
               f"{throughput.requests_per_second:.2f} RPS")
 
-    def _calculate_latency_metrics(self, service: str, endpoint: str, method: str, latencies: List[float]):
-        """Calculate latency percentiles"""
-        latencies_sorted = sorted(latencies)
+    def _calculate_latency_metrics(self, service: str, endpoint: str, method: str,
+                                   recorder: LatencyRecorder):
+        """Calculate raw and corrected latency percentiles"""
+        raw = self._latency_statistics(recorder.raw)
         metrics = LatencyMetrics(
             endpoint=f"{service}/{endpoint}",
             method=method,
-            min=min(latencies),
-            max=max(latencies),
-            mean=statistics.mean(latencies),
-            median=statistics.median(latencies),
-            p50=np.percentile(latencies_sorted, 50),
-            p90=np.percentile(latencies_sorted, 90),
-            p95=np.percentile(latencies_sorted, 95),
-            p99=np.percentile(latencies_sorted, 99),
-            p999=np.percentile(latencies_sorted, 99.9),
-            stddev=statistics.stdev(latencies) if len(latencies) > 1 else 0,
-            sample_count=len(latencies)
+            corrected=self._latency_statistics(recorder.corrected),
+            histogram=recorder.raw.to_dict(),
+            corrected_histogram=recorder.corrected.to_dict(),
+            **raw
         )
         self.results['latency'].append(metrics)
 
+    @staticmethod
+    def _latency_statistics(histogram: LatencyHistogram) -> Dict[str, Optional[float]]:
+        """Statistics in milliseconds from a microsecond histogram (None if empty)"""
+        if not histogram.total_count:
+            statistics_ms = dict.fromkeys(('min', 'max', 'mean', 'median', 'p50', 'p90',
+                                           'p95', 'p99', 'p999', 'stddev'))
+            statistics_ms['sample_count'] = 0
+            return statistics_ms
+        median = histogram.percentile(50) / 1000
+        return {
+            'min': histogram.min_value / 1000,
+            'max': histogram.max_value / 1000,
+            'mean': histogram.mean() / 1000,
+            'median': median,
+            'p50': median,
+            'p90': histogram.percentile(90) / 1000,
+            'p95': histogram.percentile(95) / 1000,
+            'p99': histogram.percentile(99) / 1000,
+            'p999': histogram.percentile(99.9) / 1000,
+            'stddev': histogram.stddev() / 1000,
+            'sample_count': histogram.total_count,
+        }
+
     def _collect_metrics_continuously(self):
-        """Continuously collect system metrics"""
+        """Sample the services' processes, pools and cache until the capture ends"""
         print("Starting continuous metric collection")
 
-        samples = {service: {'memory': [], 'cpu': []} for service in self.services}
-        collection_interval = 5  # Collect every 5 seconds
+        samplers = {name: ProcessSampler(config) for name, config in self.services.items()}
+        samples: Dict[str, List[ResourceSample]] = {name: [] for name in self.services}
+        unresolved = set()
+        cache_start = redis_info(REDIS['host'], REDIS['port'])
 
-        start_time = time.time()
+        start_time = time.monotonic()
         end_time = start_time + self.duration
-
-        while time.time() < end_time:
-            for service_name in self.services:
-                # Get process metrics (requires service PIDs)
-                # For now, collect from metrics endpoints
-
-                # Memory metrics
-                memory = self._collect_memory_metrics(service_name)
-                if memory:
-                    samples[service_name]['memory'].append(memory)
-
-                # CPU metrics
-                cpu = self._collect_cpu_metrics(service_name)
-                if cpu:
-                    samples[service_name]['cpu'].append(cpu)
-
-            # Connection pool metrics
-            for service_name, service_config in self.services.items():
-                pool = self._collect_connection_pool_metrics(service_name, service_config)
-                if pool:
-                    self.results['connection_pools'].append(pool)
-
-            # Cache metrics (once)
-            if not self.results['cache']:
-                cache = self._collect_cache_metrics()
-                if cache:
-                    self.results['cache'].append(cache)
-
-            time.sleep(collection_interval)
-
-        # Average memory and CPU metrics
+        next_sample = start_time
+
+        with httpx.Client(timeout=max(self.sample_interval, 1.0)) as client:
+            while next_sample <= end_time:
+                delay = next_sample - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                next_sample += self.sample_interval
+                elapsed = time.monotonic() - start_time
+
+                for service_name, service_config in self.services.items():
+                    # Process resources (memory, CPU, threads, fds)
+                    sample = samplers[service_name].sample(elapsed)
+                    if sample:
+                        samples[service_name].append(sample)
+                    elif service_name not in unresolved:
+                        unresolved.add(service_name)
+                        print(f"  ✗ {service_name}: no processes found; set 'pid_file' or "
+                              f"'cgroup' in SERVICES if it does not listen on this host")
+
+                    # Connection pool metrics
+                    pool = self._collect_connection_pool_metrics(client, service_name, service_config)
+                    if pool:
+                        self.results['connection_pools'].append(pool)
+
+        # Cache metrics over the whole capture
+        cache = self._collect_cache_metrics(cache_start, redis_info(REDIS['host'], REDIS['port']),
+                                            time.monotonic() - start_time)
+        if cache:
+            self.results['cache'].append(cache)
+        else:
+            print(f"  ✗ redis: no INFO from {REDIS['host']}:{REDIS['port']}, no cache metrics")
+
+        # Summarize memory and CPU, keep the timeseries
         for service_name, service_samples in samples.items():
-            if service_samples['memory']:
-                avg_memory = self._average_memory_samples(service_name, service_samples['memory'])
-                self.results['memory'].append(avg_memory)
-
-            if service_samples['cpu']:
-                avg_cpu = self._average_cpu_samples(service_name, service_samples['cpu'])
-                self.results['cpu'].append(avg_cpu)
-
-    def _collect_memory_metrics(self, service: str) -> MemoryMetrics:
-        """Collect memory metrics from service metrics endpoint"""
-        # Placeholder: Real implementation would parse Prometheus metrics
-        # or query service-specific metrics endpoints
-        return MemoryMetrics(
-            service=service,
-            rss_mb=150.0,  # Placeholder
-            vms_mb=300.0,
-            heap_mb=100.0,
-            shared_mb=20.0,
-            percent=5.0
-        )
-
-    def _collect_cpu_metrics(self, service: str) -> CPUMetrics:
-        """Collect CPU metrics from service metrics endpoint"""
-        # Placeholder: Real implementation would parse Prometheus metrics
-        return CPUMetrics(
-            service=service,
-            cpu_percent=15.0,  # Placeholder
-            user_time=10.5,
-            system_time=2.3,
-            num_threads=8
-        )
-
-    def _collect_connection_pool_metrics(self, service: str, config: Dict) -> ConnectionPoolMetrics:
-        """Collect connection pool metrics"""
-        # Placeholder: Parse from metrics endpoint
+            if not service_samples:
+                continue
+            self.results['resources'][service_name] = service_samples
+            self.results['memory'].append(self._summarize_memory(service_name, service_samples))
+            self.results['cpu'].append(self._summarize_cpu(service_name, service_samples))
+
+    def _collect_connection_pool_metrics(self, client: httpx.Client, service: str,
+                                         config: Dict) -> Optional[ConnectionPoolMetrics]:
+        """Read connection pool gauges from the service's Prometheus metrics endpoint"""
+        names = config.get('pool_metrics')
+        if not names:
+            return None
+        try:
+            response = client.get(f"{config['url']}{config['metrics_endpoint']}")
+            response.raise_for_status()
+        except httpx.HTTPError:
+            return None
+
+        values = prometheus_values(response.text)
+        if names.get('active') not in values:
+            return None
+        active = int(values[names['active']])
+        idle = int(values.get(names.get('idle'), 0))
+        max_size = int(values.get(names.get('max_size'), 0))
         return ConnectionPoolMetrics(
             service=service,
-            total=10,
-            active=3,
-            idle=7,
-            max_size=20,
-            utilization=0.15
+            total=active + idle,
+            active=active,
+            idle=idle,
+            max_size=max_size,
+            utilization=active / max_size if max_size else 0.0
         )
 
-    def _collect_cache_metrics(self) -> CacheMetrics:
-        """Collect Redis cache metrics"""
-        # Placeholder: Query Redis INFO command
+    @staticmethod
+    def _collect_cache_metrics(start: Optional[Dict[str, str]], end: Optional[Dict[str, str]],
+                               seconds: float) -> Optional[CacheMetrics]:
+        """Redis cache metrics from INFO before and after the capture"""
+        if not start or not end:
+            return None
+
+        def delta(key: str) -> int:
+            return int(end.get(key, 0)) - int(start.get(key, 0))
+
+        hits, misses = delta('keyspace_hits'), delta('keyspace_misses')
+        lookups = hits + misses
+        # Keyspace lines look like db0:keys=1000,expires=10,avg_ttl=0
+        keys = sum(int(part.split('=', 1)[1])
+                   for key, value in end.items() if key.startswith('db')
+                   for part in value.split(',') if part.startswith('keys='))
         return CacheMetrics(
             service='redis',
-            hit_rate=0.85,
-            miss_rate=0.15,
-            eviction_rate=0.01,
-            memory_usage_mb=50.0,
-            keys_count=1000
+            hit_rate=hits / lookups if lookups else 0.0,
+            miss_rate=misses / lookups if lookups else 0.0,
+            eviction_rate=delta('evicted_keys') / seconds if seconds else 0.0,
+            memory_usage_mb=int(end.get('used_memory', 0)) / (1024 * 1024),
+            keys_count=keys
         )
 
-    def _average_memory_samples(self, service: str, samples: List[MemoryMetrics]) -> MemoryMetrics:
-        """Average memory samples"""
+    def _summarize_memory(self, service: str, samples: List[ResourceSample]) -> MemoryMetrics:
+        """Mean and peak memory over the capture"""
         return MemoryMetrics(
             service=service,
-            rss_mb=statistics.mean([s.rss_mb for s in samples]),
-            vms_mb=statistics.mean([s.vms_mb for s in samples]),
-            heap_mb=statistics.mean([s.heap_mb for s in samples]),
-            shared_mb=statistics.mean([s.shared_mb for s in samples]),
-            percent=statistics.mean([s.percent for s in samples])
+            rss_mb=_mean_of(samples, 'rss_mb'),
+            vms_mb=_mean_of(samples, 'vms_mb'),
+            heap_mb=_mean_of(samples, 'anon_mb'),
+            shared_mb=_mean_of(samples, 'shared_mb'),
+            percent=_mean_of(samples, 'memory_percent'),
+            pss_mb=_mean_of(samples, 'pss_mb'),
+            uss_mb=_mean_of(samples, 'uss_mb'),
+            peak_rss_mb=max(s.rss_mb for s in samples)
         )
 
-    def _average_cpu_samples(self, service: str, samples: List[CPUMetrics]) -> CPUMetrics:
-        """Average CPU samples"""
+    def _summarize_cpu(self, service: str, samples: List[ResourceSample]) -> CPUMetrics:
+        """CPU time used over the capture, with peaks of the per-interval values"""
+        intervals = [s for s in samples if s.cpu_percent is not None]
+        user_time = sum(s.user_time for s in intervals)
+        system_time = sum(s.system_time for s in intervals)
+        span = samples[-1].elapsed - samples[0].elapsed
+        fds = [s.num_fds for s in samples if s.num_fds is not None]
         return CPUMetrics(
             service=service,
-            cpu_percent=statistics.mean([s.cpu_percent for s in samples]),
-            user_time=statistics.mean([s.user_time for s in samples]),
-            system_time=statistics.mean([s.system_time for s in samples]),
-            num_threads=int(statistics.mean([s.num_threads for s in samples]))
+            cpu_percent=(user_time + system_time) / span * 100 if span else 0.0,
+            user_time=user_time,
+            system_time=system_time,
+            num_threads=max(s.num_threads for s in samples),
+            peak_cpu_percent=max((s.cpu_percent for s in intervals), default=None),
+            num_fds=max(fds) if fds else None
         )
 
+def _mean_of(samples: List[ResourceSample], name: str) -> Optional[float]:
+    """Mean of a sample field, ignoring samples where it is unavailable"""
+    values = [getattr(s, name) for s in samples if getattr(s, name) is not None]
+    return statistics.mean(values) if values else None
+
+# ==============================================================================
+# Load Workers
+# ==============================================================================
+
+def _load_worker(settings: Dict, worker_index: int, go: Any, start_at: Any, reports: Any):
+    """Entry point of a load worker process (see BaselineCapture._run_load_workers)"""
+    capture = BaselineCapture(**settings, worker_index=worker_index)
+    reports.put(('ready', worker_index, None))
+    go.wait()
+    try:
+        asyncio.run(capture._generate_load_all(start_at.value, reports))
+    except Exception as e:
+        reports.put(('error', worker_index, repr(e)))
+    else:
+        reports.put(('done', worker_index, capture._take_load()))
+
+# ==============================================================================
+# Performance History
+# ==============================================================================
+
+HISTORY_SOURCE = 'baseline-capture'
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.check_output(['git', *args], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def record_history(snapshot: BaselineSnapshot, history_db: str) -> int:
+    """Append a snapshot to the shared performance history database"""
+    measurements = []
+    for latency in snapshot.latency:
+        for metric in ('p50', 'p95', 'p99', 'p999', 'mean'):
+            if getattr(latency, metric) is not None:
+                measurements.append({'series': latency.endpoint, 'metric': f'{metric}_ms',
+                                     'value': getattr(latency, metric), 'unit': 'ms'})
+    for throughput in snapshot.throughput:
+        measurements.append({'series': throughput.service, 'metric': 'requests_per_second',
+                             'value': throughput.requests_per_second, 'unit': 'req/s',
+                             'higher_is_better': True})
+        measurements.append({'series': throughput.service, 'metric': 'error_rate',
+                             'value': throughput.error_rate})
+    for memory in snapshot.memory:
+        measurements.append({'series': memory.service, 'metric': 'rss_mb',
+                             'value': memory.rss_mb, 'unit': 'MB'})
+        if memory.uss_mb is not None:
+            measurements.append({'series': memory.service, 'metric': 'uss_mb',
+                                 'value': memory.uss_mb, 'unit': 'MB'})
+    for cpu in snapshot.cpu:
+        measurements.append({'series': cpu.service, 'metric': 'cpu_percent',
+                             'value': cpu.cpu_percent, 'unit': '%'})
+
+    history = PerformanceHistory(history_db)
+    try:
+        return history.record_run(
+            HISTORY_SOURCE, _git('rev-parse', 'HEAD'), measurements,
+            version=_git('describe', '--tags', '--always'),
+            host=socket.gethostname(),
+            environment={'duration_seconds': snapshot.duration_seconds,
+                         'services': snapshot.services, **snapshot.metadata},
+            recorded_at=snapshot.timestamp)
+    finally:
+        history.close()
+
 # ==============================================================================
 # Main
 # ==============================================================================
@@ -481,9 +886,21 @@ def main():
     parser.add_argument('--duration', type=int, default=300,
                         help='Duration in seconds (default: 300)')
     parser.add_argument('--rps', type=int, default=10,
-                        help='Target requests per second (default: 10)')
+                        help='Target requests per second per service (default: 10)')
+    parser.add_argument('--arrival', choices=['constant', 'poisson'], default='constant',
+                        help='Inter-arrival times of the open-loop schedule (default: constant)')
+    parser.add_argument('--max-in-flight', type=int, default=1000,
+                        help='Concurrent requests per service (default: 1000)')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Seed for Poisson arrivals (default: 0)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Load generation processes, each driving rps/workers (default: 1)')
+    parser.add_argument('--sample-interval', type=float, default=SAMPLE_INTERVAL,
+                        help=f'Seconds between resource samples (default: {SAMPLE_INTERVAL:g})')
     parser.add_argument('--output', type=str, default=None,
                         help='Output file path (default: baselines/<timestamp>.json)')
+    parser.add_argument('--history-db', type=str, default=None,
+                        help='Also append the snapshot to this performance history database')
     args = parser.parse_args()
 
     # Parse services
@@ -499,8 +916,14 @@ def main():
             print(f"Available: {', '.join(SERVICES.keys())}")
             return 1
 
+    if args.workers < 1:
+        print("Error: --workers must be at least 1")
+        return 1
+
     # Run baseline capture
-    capture = BaselineCapture(services, args.duration, args.rps)
+    capture = BaselineCapture(services, args.duration, args.rps, args.arrival,
+                              args.max_in_flight, args.seed, args.workers,
+                              sample_interval=args.sample_interval)
     snapshot = capture.run()
 
     # Determine output path
@@ -511,7 +934,6 @@ def main():
         output_path = f"baselines/{timestamp}.json"
 
     # Save snapshot
-    import os
     os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else 'baselines', exist_ok=True)
 
     # Convert to dict with custom serialization
@@ -525,6 +947,10 @@ def main():
 
     print(f"\n✓ Baseline snapshot saved to {output_path}")
 
+    if args.history_db:
+        run_id = record_history(snapshot, args.history_db)
+        print(f"✓ Recorded history run {run_id} in {args.history_db}")
+
     # Print summary
     print("\n" + "="*80)
     print("BASELINE SUMMARY")
@@ -533,24 +959,41 @@ def main():
     print(f"Duration: {snapshot.duration_seconds}s")
     print(f"Services: {', '.join(snapshot.services)}")
 
-    print("\nLatency Metrics (P95/P99):")
+    print("\nLatency Metrics (P95/P99, raw | corrected for coordinated omission):")
+    def ms(value: Optional[float]) -> str:
+        return f"{value:.2f}ms" if value is not None else "n/a"
+
     for latency in snapshot.latency:
+        corrected = latency.corrected or {}
         print(f"  {latency.endpoint} ({latency.method}): " +
-              f"P95={latency.p95:.2f}ms, P99={latency.p99:.2f}ms, " +
-              f"Mean={latency.mean:.2f}ms")
+              f"P95={ms(latency.p95)}, P99={ms(latency.p99)}, " +
+              f"Mean={ms(latency.mean)} | " +
+              f"P95={ms(corrected.get('p95'))}, P99={ms(corrected.get('p99'))}")
 
     print("\nThroughput Metrics:")
     for throughput in snapshot.throughput:
         print(f"  {throughput.service}: {throughput.requests_per_second:.2f} RPS, " +
               f"Error Rate={throughput.error_rate*100:.2f}%")
 
-    print("\nMemory Metrics:")
+    def mb(value: Optional[float]) -> str:
+        return f"{value:.1f}MB" if value is not None else "n/a"
+
+    print("\nMemory Metrics (mean over the capture):")
     for memory in snapshot.memory:
-        print(f"  {memory.service}: RSS={memory.rss_mb:.1f}MB, Heap={memory.heap_mb:.1f}MB")
+        print(f"  {memory.service}: RSS={mb(memory.rss_mb)} (peak {mb(memory.peak_rss_mb)}), " +
+              f"PSS={mb(memory.pss_mb)}, USS={mb(memory.uss_mb)}, Heap={mb(memory.heap_mb)}")
 
     print("\nCPU Metrics:")
     for cpu in snapshot.cpu:
-        print(f"  {cpu.service}: {cpu.cpu_percent:.1f}%, Threads={cpu.num_threads}")
+        peak = f"{cpu.peak_cpu_percent:.1f}%" if cpu.peak_cpu_percent is not None else "n/a"
+        print(f"  {cpu.service}: {cpu.cpu_percent:.1f}% (peak {peak}), " +
+              f"Threads={cpu.num_threads}, FDs={cpu.num_fds if cpu.num_fds is not None else 'n/a'}")
+
+    if snapshot.cache:
+        print("\nCache Metrics:")
+        for cache in snapshot.cache:
+            print(f"  {cache.service}: Hit Rate={cache.hit_rate*100:.1f}%, " +
+                  f"Evictions={cache.eviction_rate:.2f}/s, Memory={mb(cache.memory_usage_mb)}")
 
     print("="*80)
 
@@ -10,14 +10,36 @@ identifying regressions and improvements.
 Usage:
     python baseline_compare.py baselines/baseline.json baselines/current.json
     python baseline_compare.py --baseline baselines/baseline.json --current baselines/current.json --threshold 10
+
+Latency changes are only called regressions when they are both large (P95
+moved by at least --threshold percent) and statistically significant
+(p < --alpha). The per-request samples are rebuilt from the latency
+histograms stored in each snapshot and compared with perf_stats: bootstrap
+CI and one-sided test of the P95 change, plus Cliff's delta. Snapshots
+without histograms fall back to a Welch t-test on the recorded mean and
+stddev.
 """
 
 import argparse
 import json
-from typing import Dict, List, Tuple
+import math
+from statistics import NormalDist
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+from polyorb_tooling import LatencyHistogram, compare_samples, format_p
+
+# Latency percentile that regressions are gated on
+GATED_PERCENTILE = 95.0
+
+# Histograms with more requests are thinned to this many evenly spaced
+# quantiles before testing, which bounds the bootstrap's cost
+MAX_TEST_SAMPLES = 2000
+
+# Milliseconds per histogram unit
+UNIT_MS = {'ns': 1e-6, 'us': 1e-3, 'ms': 1.0}
+
 # ==============================================================================
 # Comparison Enums
 # ==============================================================================
@@ -26,6 +48,7 @@ class ChangeType(Enum):
     IMPROVEMENT = "improvement"
     REGRESSION = "regression"
     NEUTRAL = "neutral"
+    INCONCLUSIVE = "inconclusive"    # large change, not significant
 
 class Severity(Enum):
     CRITICAL = "critical"    # > 25% regression
@@ -49,6 +72,13 @@ class LatencyComparison:
     p99_change_pct: float
     change_type: ChangeType
     severity: Severity
+    p_value: Optional[float] = None         # one-sided: current is slower
+    samples_needed: Optional[int] = None    # per snapshot, when inconclusive (Welch)
+    corrected: bool = False                 # coordinated-omission-corrected values
+    test: Optional[str] = None              # 'histogram' (P95 bootstrap) or 'welch' (means)
+    ci_low_pct: Optional[float] = None      # bootstrap CI of the P95 change
+    ci_high_pct: Optional[float] = None
+    cliffs_delta: Optional[float] = None    # P(current > baseline) - P(current < baseline)
 
 @dataclass
 class ThroughputComparison:
@@ -86,7 +116,8 @@ class ComparisonReport:
 class BaselineComparison:
     """Compare baseline snapshots"""
 
-    def __init__(self, baseline_path: str, current_path: str, threshold: float = 10.0):
+    def __init__(self, baseline_path: str, current_path: str, threshold: float = 10.0,
+                 alpha: float = 0.01):
         """
         Initialize comparison
 
@@ -94,8 +125,10 @@ class BaselineComparison:
             baseline_path: Path to baseline snapshot
             current_path: Path to current snapshot
             threshold: Regression threshold percentage (default: 10%)
+            alpha: Significance level for latency regressions (default: 0.01)
         """
         self.threshold = threshold
+        self.alpha = alpha
 
         with open(baseline_path, 'r') as f:
             self.baseline = json.load(f)
@@ -122,8 +155,13 @@ class BaselineComparison:
         critical_issues = []
         for c in latency_comparisons:
             if c.severity in [Severity.CRITICAL, Severity.HIGH]:
+                significance = f" ({format_p(c.p_value)})" if c.p_value is not None else ""
+                if c.ci_low_pct is not None:
+                    significance += (f", 95% CI [{c.ci_low_pct:+.1f}%, {c.ci_high_pct:+.1f}%], "
+                                     f"Cliff's delta {c.cliffs_delta:+.2f}")
                 critical_issues.append(
-                    f"Latency regression in {c.endpoint}: P95 +{c.p95_change_pct:.1f}%, P99 +{c.p99_change_pct:.1f}%"
+                    f"Latency regression in {c.endpoint}: P95 +{c.p95_change_pct:.1f}%, "
+                    f"P99 +{c.p99_change_pct:.1f}%{significance}"
                 )
         for c in throughput_comparisons:
             if c.severity in [Severity.CRITICAL, Severity.HIGH]:
@@ -162,14 +200,22 @@ class BaselineComparison:
 
             baseline = baseline_latency[endpoint]
 
+            # Prefer latencies measured from the intended send time when
+            # both snapshots have them; older snapshots only have raw ones
+            corrected = bool(baseline.get('corrected') and current.get('corrected'))
+            histogram_key = 'corrected_histogram' if corrected else 'histogram'
+            baseline_histogram = baseline.get(histogram_key)
+            current_histogram = current.get(histogram_key)
+            if corrected:
+                baseline, current = baseline['corrected'], current['corrected']
+            elif baseline.get('p95') is None or current.get('p95') is None:
+                continue  # No responses at all, and no corrected values to compare
+
             # Calculate P95/P99 changes
             p95_change_pct = self._calculate_change_pct(baseline['p95'], current['p95'])
             p99_change_pct = self._calculate_change_pct(baseline['p99'], current['p99'])
 
-            # Determine change type and severity (use P95 as primary indicator)
-            change_type, severity = self._classify_change(p95_change_pct, is_latency=True)
-
-            comparisons.append(LatencyComparison(
+            comparison = LatencyComparison(
                 endpoint=endpoint,
                 baseline_p95=baseline['p95'],
                 current_p95=current['p95'],
@@ -177,12 +223,61 @@ class BaselineComparison:
                 current_p99=current['p99'],
                 p95_change_pct=p95_change_pct,
                 p99_change_pct=p99_change_pct,
-                change_type=change_type,
-                severity=severity
-            ))
+                change_type=ChangeType.NEUTRAL,
+                severity=Severity.NONE,
+                corrected=corrected
+            )
+
+            if baseline_histogram and current_histogram:
+                self._test_histograms(comparison, baseline_histogram, current_histogram)
+            else:
+                # Older snapshots: P95 as primary indicator, the mean latency
+                # samples for significance
+                comparison.test = 'welch'
+                comparison.p_value = self._welch_test(baseline, current)
+                comparison.change_type, comparison.severity = self._classify_change(
+                    p95_change_pct, is_latency=True, p_value=comparison.p_value)
+                if comparison.change_type == ChangeType.INCONCLUSIVE:
+                    comparison.samples_needed = self._samples_needed(baseline, current)
+
+            comparisons.append(comparison)
 
         return comparisons
 
+    def _test_histograms(self, comparison: LatencyComparison,
+                         baseline_histogram: Dict, current_histogram: Dict):
+        """
+        Gate the P95 change on the samples rebuilt from both histograms
+
+        Significance, bootstrap CI, threshold and reported change all refer
+        to the P95, so a regression confined to the tail is caught and a
+        shift of the mean alone does not make a P95 change significant.
+        """
+        baseline_samples = _histogram_samples(baseline_histogram)
+        current_samples = _histogram_samples(current_histogram)
+        if not baseline_samples or not current_samples:
+            return
+        result = compare_samples(current_samples, baseline_samples,
+                                 threshold_percent=self.threshold, alpha=self.alpha,
+                                 percentile=GATED_PERCENTILE)
+
+        comparison.test = 'histogram'
+        comparison.p95_change_pct = result.change_percent
+        comparison.ci_low_pct = result.ci_low_percent
+        comparison.ci_high_pct = result.ci_high_percent
+        comparison.cliffs_delta = result.cliffs_delta
+        if result.verdict == 'regression':
+            comparison.p_value = result.p_slower
+            comparison.change_type = ChangeType.REGRESSION
+            _, comparison.severity = self._classify_change(result.change_percent, is_latency=True)
+        elif result.verdict == 'improvement':
+            comparison.p_value = result.p_faster
+            comparison.change_type = ChangeType.IMPROVEMENT
+        else:
+            comparison.p_value = result.p_slower
+            comparison.change_type = (ChangeType.INCONCLUSIVE if result.verdict == 'inconclusive'
+                                      else ChangeType.NEUTRAL)
+
     def _compare_throughput(self) -> List[ThroughputComparison]:
         """Compare throughput metrics"""
         comparisons = []
@@ -252,13 +347,53 @@ class BaselineComparison:
 
         return ((current - baseline) / baseline) * 100
 
-    def _classify_change(self, change_pct: float, is_latency: bool) -> Tuple[ChangeType, Severity]:
+    def _welch_test(self, baseline: Dict, current: Dict) -> Optional[float]:
+        """
+        One-sided Welch t-test that the current mean latency is higher
+
+        Uses the mean, stddev and sample_count each snapshot records per
+        endpoint. Returns None when a snapshot lacks them.
+        """
+        try:
+            n1, n2 = int(baseline['sample_count']), int(current['sample_count'])
+            m1, m2 = float(baseline['mean']), float(current['mean'])
+            s1, s2 = float(baseline['stddev']), float(current['stddev'])
+        except (KeyError, TypeError, ValueError):
+            return None
+        if n1 < 2 or n2 < 2:
+            return None
+
+        v1, v2 = s1 * s1 / n1, s2 * s2 / n2
+        if v1 + v2 == 0:
+            return 0.0 if m2 > m1 else 1.0
+        t = (m2 - m1) / math.sqrt(v1 + v2)
+        df = (v1 + v2) ** 2 / ((v1 * v1) / (n1 - 1) + (v2 * v2) / (n2 - 1))
+        return _student_t_sf(t, df)
+
+    def _samples_needed(self, baseline: Dict, current: Dict, power: float = 0.8) -> Optional[int]:
+        """Samples per snapshot for the observed mean shift to reach significance"""
+        try:
+            delta = abs(float(current['mean']) - float(baseline['mean']))
+            variance = float(baseline['stddev']) ** 2 + float(current['stddev']) ** 2
+        except (KeyError, TypeError, ValueError):
+            return None
+        if delta == 0:
+            return None
+        z = NormalDist().inv_cdf(1 - self.alpha) + NormalDist().inv_cdf(power)
+        return math.ceil(z * z * variance / (delta * delta))
+
+    def _classify_change(self, change_pct: float, is_latency: bool,
+                         p_value: Optional[float] = None) -> Tuple[ChangeType, Severity]:
         """
         Classify change as improvement, regression, or neutral
 
         Args:
             change_pct: Percentage change
             is_latency: True if metric is latency (higher is worse)
+            p_value: One-sided p that the metric got worse. When given, a
+                change must reach self.threshold AND be significant at
+                self.alpha; a large change that is not significant is
+                INCONCLUSIVE. Without it, fixed percentage buckets apply.
 
         Returns:
             Tuple of (ChangeType, Severity)
@@ -268,6 +403,15 @@ class BaselineComparison:
 
         abs_change = abs(change_pct)
 
+        if p_value is not None:
+            if abs_change < self.threshold:
+                return ChangeType.NEUTRAL, Severity.NONE
+            significant = p_value < self.alpha if change_pct > 0 else 1 - p_value < self.alpha
+            if not significant:
+                return ChangeType.INCONCLUSIVE, Severity.NONE
+            if change_pct < 0:
+                return ChangeType.IMPROVEMENT, Severity.NONE
+
         # Determine severity
         if abs_change >= 25:
             severity = Severity.CRITICAL
@@ -292,6 +436,76 @@ class BaselineComparison:
 
         return change_type, severity
 
+def _histogram_samples(data: Dict, limit: int = MAX_TEST_SAMPLES) -> List[float]:
+    """
+    Per-request latencies in ms rebuilt from a serialized LatencyHistogram
+
+    Every request becomes its bucket's midpoint (clamped to the recorded
+    min and max), within the histogram's 1.6% precision. Histograms of
+    more than `limit` requests are thinned to `limit` evenly spaced
+    quantiles, which keeps the distribution's shape and makes the tests
+    conservative.
+    """
+    histogram = LatencyHistogram.from_dict(data)
+    total = histogram.total_count
+    if not total:
+        return []
+    scale = UNIT_MS.get(histogram.unit, 1.0)
+    if total <= limit:
+        ranks = range(total)
+    else:
+        ranks = [int((i + 0.5) * total / limit) for i in range(limit)]
+
+    samples = []
+    ranks = iter(ranks)
+    rank = next(ranks, None)
+    seen = 0
+    for index in sorted(histogram.counts):
+        seen += histogram.counts[index]
+        low, high = histogram.bucket_bounds(index)
+        value = low if high - low == 1 else (low + high - 1) / 2
+        value = min(max(value, histogram.min_value), histogram.max_value) * scale
+        while rank is not None and rank < seen:
+            samples.append(value)
+            rank = next(ranks, None)
+    return samples
+
+def _student_t_sf(t: float, df: float) -> float:
+    """P(T > t) for Student's t with df degrees of freedom"""
+    x = df / (df + t * t)
+    tail = 0.5 * _regularized_beta(x, df / 2, 0.5)
+    return tail if t > 0 else 1 - tail
+
+def _regularized_beta(x: float, a: float, b: float) -> float:
+    """Regularized incomplete beta I_x(a, b) by continued fraction (Lentz)"""
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    if x > (a + 1) / (a + b + 2):
+        return 1 - _regularized_beta(1 - x, b, a)
+
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b)
+                     + a * math.log(x) + b * math.log(1 - x)) / a
+    tiny = 1e-300
+    f, c, d = 1.0, 1.0, 0.0
+    for i in range(400):
+        m = i // 2
+        if i == 0:
+            numerator = 1.0
+        elif i % 2 == 0:
+            numerator = m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m))
+        else:
+            numerator = -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))
+        d = 1 + numerator * d
+        d = 1 / (d if abs(d) > tiny else tiny)
+        c = 1 + numerator / c
+        c = c if abs(c) > tiny else tiny
+        f *= c * d
+        if abs(1 - c * d) < 1e-12:
+            break
+    return front * (f - 1)
+
 # ==============================================================================
 # Report Formatting
 # ==============================================================================
@@ -316,20 +530,37 @@ def print_report(report: ComparisonReport):
 
     # Latency comparison
     print("\n" + "-"*80)
-    print("LATENCY COMPARISON (P95/P99)")
+    corrected = any(c.corrected for c in report.latency_comparisons)
+    print("LATENCY COMPARISON (P95/P99" +
+          (", corrected for coordinated omission)" if corrected else ")"))
     print("-"*80)
     print(f"{'Endpoint':<40} {'Baseline P95':>12} {'Current P95':>12} {'Change':>10} {'Status':>12}")
     print("-"*80)
 
     for comp in report.latency_comparisons:
         status_icon = "⚠️" if comp.change_type == ChangeType.REGRESSION else \
-                      "✓" if comp.change_type == ChangeType.IMPROVEMENT else "→"
+                      "✓" if comp.change_type == ChangeType.IMPROVEMENT else \
+                      "?" if comp.change_type == ChangeType.INCONCLUSIVE else "→"
+        significance = f" ({format_p(comp.p_value)})" if comp.p_value is not None and \
+            comp.change_type in (ChangeType.REGRESSION, ChangeType.IMPROVEMENT) else ""
 
         print(f"{comp.endpoint:<40} " +
               f"{comp.baseline_p95:>11.2f}ms " +
               f"{comp.current_p95:>11.2f}ms " +
               f"{comp.p95_change_pct:>9.1f}% " +
-              f"{status_icon} {comp.change_type.value}")
+              f"{status_icon} {comp.change_type.value}{significance}")
+        if comp.ci_low_pct is not None and comp.change_type != ChangeType.NEUTRAL:
+            print(f"{'':<40} 95% CI [{comp.ci_low_pct:+.1f}%, {comp.ci_high_pct:+.1f}%], " +
+                  f"Cliff's delta {comp.cliffs_delta:+.2f}")
+
+    inconclusive = [c for c in report.latency_comparisons if c.change_type == ChangeType.INCONCLUSIVE]
+    if inconclusive:
+        print("\nInconclusive (large change, not significant) - capture more samples:")
+        for comp in inconclusive:
+            needed = f"~{comp.samples_needed:,} samples per snapshot" if comp.samples_needed else "more samples"
+            if comp.ci_low_pct is not None:
+                needed = f"95% CI [{comp.ci_low_pct:+.1f}%, {comp.ci_high_pct:+.1f}%], {needed}"
+            print(f"  ? {comp.endpoint}: P95 {comp.p95_change_pct:+.1f}%, {needed}")
 
     # Throughput comparison
     print("\n" + "-"*80)
@@ -390,12 +621,14 @@ def main():
                         help='Path to current snapshot')
     parser.add_argument('--threshold', type=float, default=10.0,
                         help='Regression threshold percentage (default: 10.0)')
+    parser.add_argument('--alpha', type=float, default=0.01,
+                        help='Significance level for latency regressions (default: 0.01)')
     parser.add_argument('--output', type=str, default=None,
                         help='Output report to JSON file')
     args = parser.parse_args()
 
     # Run comparison
-    comparison = BaselineComparison(args.baseline, args.current, args.threshold)
+    comparison = BaselineComparison(args.baseline, args.current, args.threshold, args.alpha)
     report = comparison.compare()
 
     # Print report
@@ -417,6 +650,13 @@ def main():
                     'p95_change_pct': c.p95_change_pct,
                     'change_type': c.change_type.value,
                     'severity': c.severity.value,
+                    'p_value': c.p_value,
+                    'samples_needed': c.samples_needed,
+                    'corrected': c.corrected,
+                    'test': c.test,
+                    'ci_low_pct': c.ci_low_pct,
+                    'ci_high_pct': c.ci_high_pct,
+                    'cliffs_delta': c.cliffs_delta,
                 }
                 for c in report.latency_comparisons
             ],
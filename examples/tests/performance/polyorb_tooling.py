@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Shared Performance Tooling for the Baseline Scripts
+Task: 57fbde - Comprehensive Test Framework / RDB-002
+Purpose: Import the modules baseline_capture.py and baseline_compare.py share with improvements/
+
+The latency histogram, statistics and history database are the ones the
+PolyORB benchmarks use (improvements/latency_histogram.py, perf_stats.py,
+perf_history.py), so service and benchmark results bucket, compare and
+record the same way. They are plain modules, not an installed package:
+this module finds them in the improvements/ directory of the checkout
+these scripts live in, or in POLYORB_IMPROVEMENTS_DIR when the scripts
+are copied elsewhere.
+"""
+
+import os
+import sys
+
+IMPROVEMENTS_DIR = os.path.abspath(os.environ.get('POLYORB_IMPROVEMENTS_DIR') or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'improvements'))
+
+if os.path.isdir(IMPROVEMENTS_DIR) and IMPROVEMENTS_DIR not in sys.path:
+    sys.path.insert(0, IMPROVEMENTS_DIR)
+
+try:
+    from latency_histogram import LatencyHistogram
+    from perf_history import PerformanceHistory
+    from perf_stats import compare_samples, format_p
+except ImportError as e:
+    if e.name not in ('latency_histogram', 'perf_history', 'perf_stats'):
+        raise
+    raise ImportError(
+        f"{e.name}.py not found in {IMPROVEMENTS_DIR}: run these scripts from a PolyORB "
+        f"checkout, or set POLYORB_IMPROVEMENTS_DIR to its improvements/ directory",
+        name=e.name) from e
+
+__all__ = ['IMPROVEMENTS_DIR', 'LatencyHistogram', 'PerformanceHistory',
+           'compare_samples', 'format_p']
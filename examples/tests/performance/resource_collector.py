@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Service Resource Collection for Baseline Capture
+Task: 57fbde - Comprehensive Test Framework / RDB-002
+Purpose: Resolve services to processes and sample their resources from /proc
+
+A service's processes are found, in order of preference, through:
+- 'pid_file' in its SERVICES entry: the PID written there
+- 'cgroup' in its SERVICES entry: every process in that cgroup directory,
+  or in the cgroup of the container with that ID (prefix)
+- the port of its URL: the process listening on it
+Processes found through a PID file or port include their descendants, so
+pre-forked workers are counted with their parent.
+
+Memory comes from /proc/<pid>/smaps_rollup (RSS, PSS, USS, anonymous),
+CPU time, thread counts and file descriptors from /proc/<pid>/stat and
+/proc/<pid>/fd. Reading smaps_rollup and fd/ of another user's process
+needs the same privileges as ptrace; without them PSS, USS and fd counts
+are None and RSS/VMS come from psutil.
+"""
+
+import glob
+import os
+import socket
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+import psutil
+
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+CGROUP_ROOT = '/sys/fs/cgroup'
+
+# Where container runtimes put a container's cgroup (v2 systemd, v2
+# cgroupfs, v1 memory controller)
+CONTAINER_CGROUP_PATTERNS = (
+    'system.slice/docker-{id}*.scope',
+    'system.slice/*/docker-{id}*.scope',
+    'docker/{id}*',
+    'memory/docker/{id}*',
+    'system.slice/crio-{id}*.scope',
+)
+
+# ==============================================================================
+# Data Classes
+# ==============================================================================
+
+@dataclass
+class ResourceSample:
+    """Resources of all processes of one service at one point in time"""
+    elapsed: float                  # Seconds since collection started
+    pids: List[int]
+    rss_mb: float
+    vms_mb: float
+    pss_mb: Optional[float]         # None without access to smaps_rollup
+    uss_mb: Optional[float]         # Private (unshared) memory
+    shared_mb: Optional[float]
+    anon_mb: Optional[float]        # Anonymous memory: heap and anonymous mmaps
+    memory_percent: float           # RSS as a share of physical memory
+    cpu_percent: Optional[float]    # Since the previous sample (100 = one core)
+    user_time: Optional[float]      # CPU seconds in user mode since the previous sample
+    system_time: Optional[float]
+    num_threads: int
+    num_fds: Optional[int]          # None without access to /proc/<pid>/fd
+
+# ==============================================================================
+# Process Resolution
+# ==============================================================================
+
+def _pids_from_pid_file(path: str) -> List[int]:
+    try:
+        with open(path) as f:
+            return [int(f.read().split()[0])]
+    except (OSError, ValueError, IndexError):
+        return []
+
+
+def _cgroup_directories(cgroup: str) -> List[str]:
+    """cgroup directories for a path (absolute or below /sys/fs/cgroup) or container ID"""
+    if '/' in cgroup:
+        path = cgroup if os.path.isabs(cgroup) else os.path.join(CGROUP_ROOT, cgroup)
+        return [path] if os.path.isdir(path) else []
+    for pattern in CONTAINER_CGROUP_PATTERNS:
+        matches = glob.glob(os.path.join(CGROUP_ROOT, pattern.format(id=cgroup)))
+        if matches:
+            return matches
+    return []
+
+
+def _pids_from_cgroup(cgroup: str) -> List[int]:
+    pids: Set[int] = set()
+    for directory in _cgroup_directories(cgroup):
+        # cgroup v2 lists only a directory's own processes: walk the subtree
+        for root, _, files in os.walk(directory):
+            if 'cgroup.procs' not in files:
+                continue
+            try:
+                with open(os.path.join(root, 'cgroup.procs')) as f:
+                    pids.update(int(line) for line in f if line.strip())
+            except (OSError, ValueError):
+                continue
+    return sorted(pids)
+
+
+def _pids_listening_on(port: int) -> List[int]:
+    try:
+        connections = psutil.net_connections(kind='tcp')
+    except (psutil.AccessDenied, OSError):
+        return []
+    return sorted({c.pid for c in connections
+                   if c.pid and c.status == psutil.CONN_LISTEN and c.laddr and c.laddr.port == port})
+
+
+def _with_descendants(pids: List[int]) -> List[int]:
+    result = set(pids)
+    for pid in pids:
+        try:
+            result.update(child.pid for child in psutil.Process(pid).children(recursive=True))
+        except psutil.Error:
+            continue
+    return sorted(result)
+
+
+def resolve_pids(service_config: Dict) -> List[int]:
+    """PIDs of a service via its pid_file, cgroup or listening port"""
+    if service_config.get('pid_file'):
+        return _with_descendants(_pids_from_pid_file(service_config['pid_file']))
+    if service_config.get('cgroup'):
+        return _pids_from_cgroup(service_config['cgroup'])
+    port = urlsplit(service_config['url']).port
+    return _with_descendants(_pids_listening_on(port)) if port else []
+
+# ==============================================================================
+# /proc Sampling
+# ==============================================================================
+
+def _read_smaps_rollup(pid: int) -> Optional[Dict[str, int]]:
+    """smaps_rollup fields in kB, or None if unreadable"""
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            lines = f.readlines()
+    except OSError:
+        return None
+    fields = {}
+    for line in lines[1:]:
+        parts = line.split()
+        if len(parts) >= 2 and parts[0].endswith(':'):
+            fields[parts[0][:-1]] = int(parts[1])
+    return fields or None
+
+
+def _read_stat(pid: int) -> Optional[Tuple[float, float, int]]:
+    """(user seconds, system seconds, threads) from /proc/<pid>/stat"""
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            # The command name may contain spaces; fields resume after ')'
+            fields = f.read().rsplit(')', 1)[1].split()
+    except (OSError, IndexError):
+        return None
+    return int(fields[11]) / CLOCK_TICKS, int(fields[12]) / CLOCK_TICKS, int(fields[17])
+
+
+def _count_fds(pid: int) -> Optional[int]:
+    try:
+        return len(os.listdir(f'/proc/{pid}/fd'))
+    except OSError:
+        return None
+
+
+class ProcessSampler:
+    """
+    Samples the processes of one service
+
+    PIDs are resolved again whenever one of them disappears, so a
+    restarted service is followed. CPU time is reported per interval:
+    for each PID seen in both samples, the difference of its cumulative
+    user and system time.
+    """
+
+    def __init__(self, service_config: Dict):
+        self.service_config = service_config
+        self.pids: List[int] = []
+        self.previous_cpu: Dict[int, Tuple[float, float]] = {}
+        self.previous_time: Optional[float] = None
+        self.total_memory = psutil.virtual_memory().total
+
+    def _current_pids(self) -> List[int]:
+        if not self.pids or not all(psutil.pid_exists(pid) for pid in self.pids):
+            self.pids = resolve_pids(self.service_config)
+        return self.pids
+
+    def sample(self, elapsed: float) -> Optional[ResourceSample]:
+        """Sample all processes of the service; None if none were found"""
+        now = time.monotonic()
+        rss = vms = threads = 0
+        pss: Optional[int] = 0
+        uss: Optional[int] = 0
+        shared: Optional[int] = 0
+        anon: Optional[int] = 0
+        fds: Optional[int] = 0
+        user = system = 0.0
+        cpu_now: Dict[int, Tuple[float, float]] = {}
+        sampled = []
+
+        for pid in self._current_pids():
+            stat = _read_stat(pid)
+            try:
+                memory = psutil.Process(pid).memory_info()
+            except psutil.Error:
+                continue
+            if stat is None:
+                continue
+            sampled.append(pid)
+            rss += memory.rss
+            vms += memory.vms
+            threads += stat[2]
+            cpu_now[pid] = stat[:2]
+            if pid in self.previous_cpu:
+                user += stat[0] - self.previous_cpu[pid][0]
+                system += stat[1] - self.previous_cpu[pid][1]
+
+            rollup = _read_smaps_rollup(pid)
+            if rollup is None:
+                pss = uss = shared = anon = None
+            elif pss is not None:
+                pss += rollup.get('Pss', 0) * 1024
+                uss += (rollup.get('Private_Clean', 0) + rollup.get('Private_Dirty', 0)) * 1024
+                shared += (rollup.get('Shared_Clean', 0) + rollup.get('Shared_Dirty', 0)) * 1024
+                anon += rollup.get('Anonymous', 0) * 1024
+
+            pid_fds = _count_fds(pid)
+            fds = None if fds is None or pid_fds is None else fds + pid_fds
+
+        if not sampled:
+            self.pids = []
+            return None
+
+        interval = now - self.previous_time if self.previous_time is not None else None
+        first = interval is None or not self.previous_cpu
+        self.previous_cpu, self.previous_time = cpu_now, now
+
+        mb = 1024 * 1024
+        return ResourceSample(
+            elapsed=elapsed,
+            pids=sampled,
+            rss_mb=rss / mb,
+            vms_mb=vms / mb,
+            pss_mb=pss / mb if pss is not None else None,
+            uss_mb=uss / mb if uss is not None else None,
+            shared_mb=shared / mb if shared is not None else None,
+            anon_mb=anon / mb if anon is not None else None,
+            memory_percent=rss / self.total_memory * 100,
+            cpu_percent=None if first else (user + system) / interval * 100,
+            user_time=None if first else user,
+            system_time=None if first else system,
+            num_threads=threads,
+            num_fds=fds,
+        )
+
+# ==============================================================================
+# Metrics Endpoints
+# ==============================================================================
+
+def redis_info(host: str, port: int, timeout: float = 2.0) -> Optional[Dict[str, str]]:
+    """Fields of Redis' INFO reply, or None if Redis is unreachable"""
+    try:
+        with socket.create_connection((host, port), timeout=timeout) as connection:
+            connection.sendall(b'INFO\r\n')
+            reply = b''
+            while b'\r\n' not in reply:
+                chunk = connection.recv(65536)
+                if not chunk:
+                    return None
+                reply += chunk
+            header, body = reply.split(b'\r\n', 1)
+            if not header.startswith(b'$'):
+                return None
+            length = int(header[1:])
+            while len(body) < length:
+                chunk = connection.recv(65536)
+                if not chunk:
+                    return None
+                body += chunk
+    except (OSError, ValueError):
+        return None
+
+    info = {}
+    for line in body[:length].decode(errors='replace').splitlines():
+        if line and not line.startswith('#') and ':' in line:
+            key, value = line.split(':', 1)
+            info[key] = value
+    return info
+
+
+def prometheus_values(text: str) -> Dict[str, float]:
+    """Prometheus text exposition as {metric name: value summed over labels}"""
+    values: Dict[str, float] = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if '}' in line:
+            name, rest = line.split('{', 1)[0], line.rsplit('}', 1)[1]
+        else:
+            name, _, rest = line.partition(' ')
+        try:
+            value = float(rest.split()[0])
+        except (IndexError, ValueError):
+            continue
+        values[name] = values.get(name, 0.0) + value
+    return values
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Stand-in HTTP Server for Offline Load Testing
+Task: 57fbde - Comprehensive Test Framework / RDB-002
+Purpose: Answer baseline_capture.py requests on localhost without the real services
+
+Listens on the port of every selected service in SERVICES and answers
+any GET or POST with a small JSON body after a configurable service
+time. Periodic stalls can be switched on to make coordinated omission
+visible in the corrected latencies.
+
+Usage:
+    python stand_in_server.py
+    python stand_in_server.py --services api-gateway --latency-ms 2
+    python stand_in_server.py --stall-every 10 --stall-for 1
+"""
+
+import argparse
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+from urllib.parse import urlsplit
+
+from baseline_capture import SERVICES
+
+# ==============================================================================
+# Request Handling
+# ==============================================================================
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Keep-alive handler answering every path with 200 and '{}'"""
+
+    protocol_version = 'HTTP/1.1'
+    latency = 0.002             # Service time per request, seconds
+    stall_every: Optional[float] = None
+    stall_for = 0.0
+    started = time.monotonic()
+
+    def setup(self):
+        super().setup()
+        # Without TCP_NODELAY, Nagle and delayed ACKs add ~40ms per response
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def _reply(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+
+        if self.stall_every:
+            # Requests arriving during a stall window wait for its end
+            into_period = (time.monotonic() - self.started) % self.stall_every
+            if into_period < self.stall_for:
+                time.sleep(self.stall_for - into_period)
+        if self.latency:
+            time.sleep(self.latency)
+
+        body = b'{}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _reply
+    do_POST = _reply
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+# ==============================================================================
+# Main
+# ==============================================================================
+
+def serve(services: List[str], host: str = '127.0.0.1') -> List[StandInServer]:
+    """Start one server thread per service port; returns the servers"""
+    servers = []
+    for service in services:
+        port = urlsplit(SERVICES[service]['url']).port
+        server = StandInServer((host, port), StandInHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        print(f"  ✓ {service}: stand-in listening on http://{host}:{port}")
+    return servers
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve stand-ins for the baselined services')
+    parser.add_argument('--services', type=str, default='all',
+                        help='Comma-separated list of services or "all"')
+    parser.add_argument('--host', type=str, default='127.0.0.1',
+                        help='Address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--latency-ms', type=float, default=2.0,
+                        help='Service time per request in ms (default: 2)')
+    parser.add_argument('--stall-every', type=float, default=None,
+                        help='Stall all responses once every N seconds (default: never)')
+    parser.add_argument('--stall-for', type=float, default=1.0,
+                        help='Length of each stall in seconds (default: 1)')
+    args = parser.parse_args()
+
+    if args.services == 'all':
+        services = list(SERVICES.keys())
+    else:
+        services = [s.strip() for s in args.services.split(',')]
+    for service in services:
+        if service not in SERVICES:
+            print(f"Error: Unknown service '{service}'")
+            print(f"Available: {', '.join(SERVICES.keys())}")
+            return 1
+
+    StandInHandler.latency = args.latency_ms / 1000
+    StandInHandler.stall_every = args.stall_every
+    StandInHandler.stall_for = args.stall_for
+    StandInHandler.started = time.monotonic()
+
+    servers = serve(services, args.host)
+    print("Press Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for server in servers:
+            server.shutdown()
+    return 0
+
+if __name__ == '__main__':
+    exit(main())
@@ -11,28 +11,410 @@ Context: RDB-004 Task 6 Pre-Work - Mutation Testing Baseline
 import re
 import os
 import sys
+import fnmatch
+import importlib.util
+import math
+import queue
+import random
+import selectors
+import signal
+import shutil
 import subprocess
+import tempfile
+import threading
+import time
 import json
-from typing import List, Tuple, Dict
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from statistics import NormalDist
+from typing import List, Tuple, Dict, Optional
 from pathlib import Path
 import hashlib
 
+from mutation_db import MutationResultsDB, DEFAULT_DB_PATH
+
+
+# Default location of the incremental result cache (see configs/mutmut_config.py)
+DEFAULT_CACHE_DIR = ".mutmut-tmp/cache"
+
+# Verdicts that are a pure function of the mutant and the test suite.
+# TIMEOUT depends on machine load, so it is always re-run.
+CACHEABLE_STATUSES = ('KILLED', 'SURVIVED', 'COMPILE_ERROR')
+
+# Per-mutant test budget: TIMEOUT_FACTOR x unmutated suite runtime + slack
+DEFAULT_TIMEOUT_FACTOR = 3.0
+DEFAULT_TIMEOUT_SLACK = 5.0
+COMPILE_TIMEOUT = 60
+# Upper bound for the unmutated baseline run itself
+BASELINE_TIMEOUT = 1800
+
+# AUnit text reporter lines for a failed or crashed test, e.g.
+# "FAIL Any Tests : Test_Finalize"
+AUNIT_FAILURE = re.compile(r'^\s*(?:FAIL|ERROR)\s+(.*\S)')
+
+# Runtime switch of a mutant schema build: the id of the active mutant
+SCHEMA_ENV_VAR = 'POLYORB_MUTANT_ID'
+SCHEMA_PACKAGE = 'Mutant_Schema'
+
+
+def run_process(command: List[str], cwd: Path, timeout: float,
+                env: Dict[str, str] = None) -> Tuple[Optional[int], str, str]:
+    """
+    Run a command in its own process group
+
+    On timeout the whole group is killed, so children spawned by gprbuild
+    or the test runner cannot outlive it, and the process is reaped.
+
+    Returns: (returncode, stdout, stderr); returncode is None on timeout
+    """
+    process = subprocess.Popen(
+        command,
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        env=env,
+        start_new_session=True
+    )
+    try:
+        stdout, stderr = process.communicate(timeout=timeout)
+        return process.returncode, stdout, stderr
+    except subprocess.TimeoutExpired:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        stdout, stderr = process.communicate()
+        return None, stdout, stderr
+
+
+def stream_process(command: List[str], cwd: Path, timeout: float, stop_pattern,
+                   env: Dict[str, str] = None) -> Tuple[Optional[int], str, Optional[re.Match]]:
+    """
+    Run a command in its own process group, reading output as it arrives
+
+    As soon as a line matches stop_pattern the process group is killed, so
+    the caller only pays for the time up to that line.
+
+    Returns: (returncode, output, stop_match); returncode is None on timeout
+    """
+    process = subprocess.Popen(
+        command,
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        env=env,
+        start_new_session=True
+    )
+    deadline = time.monotonic() + timeout
+    lines: List[str] = []
+    pending = b''
+    stop_match = None
+    timed_out = False
+
+    with selectors.DefaultSelector() as selector:
+        selector.register(process.stdout, selectors.EVENT_READ)
+        while stop_match is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                timed_out = True
+                break
+            if not selector.select(remaining):
+                continue
+            chunk = os.read(process.stdout.fileno(), 65536)
+            if not chunk:
+                break
+            *complete, pending = (pending + chunk).split(b'\n')
+            for raw in complete:
+                line = raw.decode('utf-8', errors='replace')
+                lines.append(line)
+                stop_match = stop_pattern.match(line)
+                if stop_match:
+                    break
+
+    if stop_match is None and not timed_out:
+        try:
+            process.wait(timeout=max(deadline - time.monotonic(), 0))
+        except subprocess.TimeoutExpired:
+            timed_out = True
+
+    if stop_match is not None or timed_out:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    process.wait()
+    process.stdout.close()
+
+    if pending:
+        lines.append(pending.decode('utf-8', errors='replace'))
+    return (None if timed_out else process.returncode), '\n'.join(lines), stop_match
+
+
+def make_patch(line_num: int, original_line: str, mutated_line: str) -> Dict:
+    """
+    Describe a single-line mutation as a minimal (line, column span,
+    replacement) patch by trimming the text common to both versions
+    """
+    prefix = 0
+    limit = min(len(original_line), len(mutated_line))
+    while prefix < limit and original_line[prefix] == mutated_line[prefix]:
+        prefix += 1
+
+    suffix = 0
+    limit -= prefix
+    while (suffix < limit and
+           original_line[-1 - suffix] == mutated_line[-1 - suffix]):
+        suffix += 1
+
+    return {
+        'line': line_num,
+        'col_start': prefix,
+        'col_end': len(original_line) - suffix,
+        'replacement': mutated_line[prefix:len(mutated_line) - suffix],
+    }
+
+
+def apply_patch(source_lines: List[str], patch: Dict) -> str:
+    """Materialize the full mutated source for a patch"""
+    index = patch['line'] - 1
+    line = source_lines[index]
+    mutated_line = line[:patch['col_start']] + patch['replacement'] + line[patch['col_end']:]
+    return '\n'.join(source_lines[:index] + [mutated_line] + source_lines[index + 1:])
+
+
+HUNK_HEADER = re.compile(r'^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@')
+
+
+class DiffScope:
+    """
+    Lines of a source file touched since a base revision
+
+    Built from `git diff -U0` hunks. changed() tells whether a line of the
+    working copy is in scope (a touched line, or within `context` lines of
+    one); map_base_line() maps a line of the base revision to its line in
+    the working copy, or None if the line was modified or deleted.
+    """
+
+    def __init__(self, hunks: List[Tuple[int, int, int, int]], context: int = 0,
+                 whole_file: bool = False):
+        self.hunks = sorted(hunks)
+        self.whole_file = whole_file
+        self.lines = set()
+        for _, _, new_start, new_count in self.hunks:
+            if new_count == 0:
+                # Pure deletion: the lines on either side of the gap
+                touched = range(new_start, new_start + 2)
+            else:
+                touched = range(new_start, new_start + new_count)
+            for line in touched:
+                self.lines.update(range(max(1, line - context), line + context + 1))
+
+    @classmethod
+    def from_git(cls, path: Path, base: str, context: int = 0) -> 'DiffScope':
+        """Diff the working copy of path against base"""
+        directory, name = path.resolve().parent, path.name
+        tracked = subprocess.run(
+            ['git', '-C', str(directory), 'ls-files', '--error-unmatch', name],
+            capture_output=True, text=True
+        )
+        if tracked.returncode != 0:
+            # Untracked: every line is new
+            return cls([], context, whole_file=True)
+
+        diff = subprocess.run(
+            ['git', '-C', str(directory), 'diff', '-U0', '--no-color', '--no-ext-diff',
+             base, '--', name],
+            capture_output=True, text=True
+        )
+        if diff.returncode != 0:
+            raise RuntimeError(f"git diff {base} failed for {path}: {diff.stderr.strip()}")
+
+        hunks = []
+        for line in diff.stdout.splitlines():
+            match = HUNK_HEADER.match(line)
+            if match:
+                old_start, old_count, new_start, new_count = match.groups()
+                hunks.append((int(old_start), int(old_count or 1),
+                              int(new_start), int(new_count or 1)))
+        return cls(hunks, context)
+
+    def changed(self, line: int) -> bool:
+        return self.whole_file or line in self.lines
+
+    def map_base_line(self, line: int) -> Optional[int]:
+        if self.whole_file:
+            return None
+        offset = 0
+        for old_start, old_count, _, new_count in self.hunks:
+            if old_count == 0:
+                # Pure insertion after old_start
+                if line <= old_start:
+                    break
+            else:
+                if line < old_start:
+                    break
+                if line < old_start + old_count:
+                    return None
+            offset += new_count - old_count
+        return line + offset
+
+
+# Ada reserved words (RM 2.9). A tick after one of these starts a
+# character literal ("when 'a' =>"), except after "all" (Ptr.all'Size).
+ADA_RESERVED = frozenset("""
+abort abs abstract accept access aliased all and array at begin body case
+constant declare delay delta digits do else elsif end entry exception exit
+for function generic goto if in interface is limited loop mod new not null
+of or others out overriding package parallel pragma private procedure
+protected raise range record rem renames requeue return reverse select
+separate some subtype synchronized tagged task terminate then type until
+use when while with xor
+""".split())
+
+ADA_TOKEN = re.compile(r"""
+    (?P<comment>--.*)
+  | (?P<string>"(?:[^"]|"")*"?)
+  | (?P<number>\d[\d_]*(?:\#[\da-fA-F_.]+\#|\.[\d_]+)?(?:[eE][+-]?[\d_]+)?)
+  | (?P<identifier>[^\W\d]\w*)
+  | (?P<delimiter>=>|\.\.|\*\*|:=|/=|>=|<=|<<|>>|<>|[&'()*+,\-./:;<>=|])
+""", re.VERBOSE)
+
+
+class AdaLine:
+    """
+    One source line split into Ada lexical tokens
+
+    Tokens are (kind, start, end) with kind one of 'identifier',
+    'keyword', 'number', 'string', 'character', 'delimiter' or 'comment'.
+    Ada has no multi-line tokens, so lines are lexed independently. The
+    mutation rules stay plain regexes; aligned() is what keeps their
+    matches on real code tokens instead of inside comments, string and
+    character literals, longer identifiers or numbers.
+    """
+
+    OPAQUE = ('comment', 'string', 'character')
+
+    def __init__(self, line: str):
+        self.line = line
+        self.tokens: List[Tuple[str, int, int]] = []
+        position = 0
+        while position < len(line):
+            if line[position].isspace():
+                position += 1
+                continue
+            if line[position] == "'" and line[position + 2:position + 3] == "'" \
+                    and not self._tick_allowed():
+                self.tokens.append(('character', position, position + 3))
+                position += 3
+                continue
+            match = ADA_TOKEN.match(line, position)
+            if match is None:
+                # Not Ada (e.g. a stray '#' or '$'); never mutate it
+                self.tokens.append(('comment', position, position + 1))
+                position += 1
+                continue
+            kind = match.lastgroup
+            if kind == 'identifier' and match.group().lower() in ADA_RESERVED:
+                kind = 'keyword'
+            self.tokens.append((kind, match.start(), match.end()))
+            position = match.end()
+        self.starts = {start: index for index, (_, start, _) in enumerate(self.tokens)}
+        self.ends = {end: index for index, (_, _, end) in enumerate(self.tokens)}
+
+    def _tick_allowed(self) -> bool:
+        """True if a "'" here is an attribute tick or a qualification"""
+        if not self.tokens:
+            return False
+        kind, start, end = self.tokens[-1]
+        return kind == 'identifier' or self.line[start:end].lower() in (')', 'all')
+
+    def aligned(self, start: int, end: int) -> bool:
+        """True if line[start:end], blanks trimmed, is a run of whole code tokens"""
+        line = self.line
+        while start < end and line[start].isspace():
+            start += 1
+        while end > start and line[end - 1].isspace():
+            end -= 1
+        first = self.starts.get(start)
+        last = self.ends.get(end)
+        if first is None or last is None or last < first:
+            return False
+        return all(kind not in self.OPAQUE for kind, _, _ in self.tokens[first:last + 1])
+
+
+class MutationRule:
+    """
+    One precompiled mutation: where it applies and how it rewrites a line
+
+    The first match of `pattern` that lines up with whole code tokens
+    (see AdaLine) is replaced by `replacement`, which is either a regex
+    template (expanded against the match) or a callable taking (line,
+    match) and returning the whole mutated line. `trigger` is an optional
+    extra condition the line must satisfy. `key` is a literal that every
+    match contains; the scanner uses it to skip the regex entirely on
+    lines that cannot match.
+    """
+
+    def __init__(self, pattern: str, replacement, description: str,
+                 key: str, trigger: str = None):
+        self.pattern = re.compile(pattern)
+        self.replacement = replacement
+        self.description = description
+        self.key = key
+        self.trigger = re.compile(trigger) if trigger else None
+        self._literal = isinstance(replacement, str) and '\\' not in replacement
+
+    def mutate(self, line: str, lexed: Optional[AdaLine] = None):
+        """Return the mutated line, or None if the rule does not apply"""
+        if self.trigger is not None and not self.trigger.search(line):
+            return None
+
+        match = None
+        for candidate in self.pattern.finditer(line):
+            if lexed is None:
+                lexed = AdaLine(line)
+            if lexed.aligned(candidate.start(), candidate.end()):
+                match = candidate
+                break
+        if match is None:
+            return None
+
+        if callable(self.replacement):
+            return self.replacement(line, match)
+        replacement = self.replacement if self._literal else match.expand(self.replacement)
+        return line[:match.start()] + replacement + line[match.end():]
+
 
 class MutationOperator:
     """Base class for mutation operators"""
 
+    # Bump when an operator's patterns or replacements change, so cached
+    # verdicts produced by the old definition are not reused.
+    # 2: matches must align with Ada tokens; no "-- MUTANT" markers mid-line
+    version = 2
+
     def __init__(self, name: str, category: str, priority: str):
         self.name = name
         self.category = category
         self.priority = priority  # CRITICAL, HIGH, MEDIUM, LOW
+        self.rules: List[MutationRule] = []
+
+    def skip_line(self, line: str) -> bool:
+        """Return True if no rule of this operator should touch the line"""
+        return False
 
-    def apply(self, source: str) -> List[Tuple[str, str, int]]:
+    def apply(self, source: str) -> List[Tuple[Dict, str, int]]:
         """
         Apply mutation operator to source code
 
-        Returns: List of (mutant_source, description, line_number)
+        Returns: List of (patch, description, line_number), see make_patch
         """
-        raise NotImplementedError
+        return MutationScanner([self]).scan(source)[0]
+
+
+def _comment_out(note: str):
+    """Replacement that turns the whole line into a comment"""
+    return lambda line, match: '      -- ' + line + '  -- MUTANT: ' + note
 
 
 class ArithmeticMutationOperator(MutationOperator):
@@ -40,71 +422,31 @@ class ArithmeticMutationOperator(MutationOperator):
 
     def __init__(self):
         super().__init__("Arithmetic", "arithmetic", "MEDIUM")
-        self.mutations = [
-            (r'(\s+)\+(\s+)', r'\1-\2', '+ → -'),
-            (r'(\s+)-(\s+)', r'\1+\2', '- → +'),
-            (r'(\s+)\*(\s+)', r'\1/\2', '* → /'),
-            (r'(\s+)/(\s+)', r'\1*\2', '/ → *'),
+        self.rules = [
+            MutationRule(r'(?<=\s)\+(?=\s)', '-', '+ → -', key='+'),
+            MutationRule(r'(?<=\s)-(?=\s)', '+', '- → +', key='-'),
+            MutationRule(r'(?<=\s)\*(?=\s)', '/', '* → /', key='*'),
+            MutationRule(r'(?<=\s)/(?=\s)', '*', '/ → *', key='/'),
         ]
 
-    def apply(self, source: str) -> List[Tuple[str, str, int]]:
-        mutants = []
-        lines = source.split('\n')
-
-        for line_num, line in enumerate(lines, 1):
-            for pattern, replacement, desc in self.mutations:
-                if re.search(pattern, line):
-                    mutated_lines = lines.copy()
-                    mutated_lines[line_num - 1] = re.sub(
-                        pattern, replacement, line, count=1
-                    )
-                    mutant_source = '\n'.join(mutated_lines)
-                    mutants.append((
-                        mutant_source,
-                        f"Line {line_num}: {desc}",
-                        line_num
-                    ))
-
-        return mutants
-
 
 class RelationalMutationOperator(MutationOperator):
     """Mutate relational operators: >, >=, <, <=, =, /="""
 
     def __init__(self):
         super().__init__("Relational", "relational", "HIGH")
-        self.mutations = [
-            (r'(\s+)>(\s+)', r'\1>=\2', '> → >='),
-            (r'(\s+)>=(\s+)', r'\1>\2', '>= → >'),
-            (r'(\s+)<(\s+)', r'\1<=\2', '< → <='),
-            (r'(\s+)<=(\s+)', r'\1<\2', '<= → <'),
-            (r'(\s+)=(\s+)', r'\1/=\2', '= → /='),
-            (r'(\s+)/=(\s+)', r'\1=\2', '/= → ='),
+        self.rules = [
+            MutationRule(r'(?<=\s)>(?=\s)', '>=', '> → >=', key='>'),
+            MutationRule(r'(?<=\s)>=(?=\s)', '>', '>= → >', key='>='),
+            MutationRule(r'(?<=\s)<(?=\s)', '<=', '< → <=', key='<'),
+            MutationRule(r'(?<=\s)<=(?=\s)', '<', '<= → <', key='<='),
+            MutationRule(r'(?<=\s)=(?=\s)', '/=', '= → /=', key='='),
+            MutationRule(r'(?<=\s)/=(?=\s)', '=', '/= → =', key='/='),
         ]
 
-    def apply(self, source: str) -> List[Tuple[str, str, int]]:
-        mutants = []
-        lines = source.split('\n')
-
-        for line_num, line in enumerate(lines, 1):
-            # Skip variable assignments (use context)
-            if ':=' in line:
-                continue
-
-            for pattern, replacement, desc in self.mutations:
-                if re.search(pattern, line):
-                    mutated_lines = lines.copy()
-                    mutated_lines[line_num - 1] = re.sub(
-                        pattern, replacement, line, count=1
-                    )
-                    mutant_source = '\n'.join(mutated_lines)
-                    mutants.append((
-                        mutant_source,
-                        f"Line {line_num}: {desc}",
-                        line_num
-                    ))
-
-        return mutants
+    def skip_line(self, line: str) -> bool:
+        # Skip variable assignments (use context)
+        return ':=' in line
 
 
 class LogicalMutationOperator(MutationOperator):
@@ -112,31 +454,23 @@ class LogicalMutationOperator(MutationOperator):
 
     def __init__(self):
         super().__init__("Logical", "logical", "HIGH")
-        self.mutations = [
-            (r'\band\b', 'or', 'and → or'),
-            (r'\bor\b', 'and', 'or → and'),
-            (r'\bnot\b', '', 'not → (removed)'),
+        self.rules = [
+            # Short-circuit forms swap as a whole: "or then" is not Ada
+            MutationRule(r'\band\s+then\b', 'or else', 'and then → or else', key='and'),
+            MutationRule(r'\bor\s+else\b', 'and then', 'or else → and then', key='or'),
+            MutationRule(r'\band\b(?!\s+then\b)', 'or', 'and → or', key='and'),
+            MutationRule(r'\bor\b(?!\s+else\b)', 'and', 'or → and', key='or'),
+            # "not null" and "not overriding" are not negations
+            MutationRule(r'\bnot\b(?!\s+(?:null|overriding)\b)', '',
+                         'not → (removed)', key='not'),
         ]
 
-    def apply(self, source: str) -> List[Tuple[str, str, int]]:
-        mutants = []
-        lines = source.split('\n')
-
-        for line_num, line in enumerate(lines, 1):
-            for pattern, replacement, desc in self.mutations:
-                if re.search(pattern, line):
-                    mutated_lines = lines.copy()
-                    mutated_lines[line_num - 1] = re.sub(
-                        pattern, replacement, line, count=1
-                    )
-                    mutant_source = '\n'.join(mutated_lines)
-                    mutants.append((
-                        mutant_source,
-                        f"Line {line_num}: {desc}",
-                        line_num
-                    ))
+    # "or" opening a select alternative
+    SELECT_OR = re.compile(r'\s*or\s*(?:--|$)|\s*or\s+(?:accept|delay|terminate|when)\b',
+                           re.IGNORECASE)
 
-        return mutants
+    def skip_line(self, line: str) -> bool:
+        return self.SELECT_OR.match(line) is not None
 
 
 class AdaAttributeMutationOperator(MutationOperator):
@@ -144,69 +478,27 @@ class AdaAttributeMutationOperator(MutationOperator):
 
     def __init__(self):
         super().__init__("Ada Attribute", "ada_attribute", "MEDIUM")
-        self.mutations = [
-            (r"'First\b", "'Last", "'First → 'Last"),
-            (r"'Last\b", "'First", "'Last → 'First"),
-            (r"'Length\b", "'Length - 1", "'Length → 'Length - 1"),
+        self.rules = [
+            MutationRule(r"'First\b", "'Last", "'First → 'Last", key="'First"),
+            MutationRule(r"'Last\b", "'First", "'Last → 'First", key="'Last"),
+            MutationRule(r"'Length\b", "'Length - 1", "'Length → 'Length - 1",
+                         key="'Length"),
         ]
 
-    def apply(self, source: str) -> List[Tuple[str, str, int]]:
-        mutants = []
-        lines = source.split('\n')
-
-        for line_num, line in enumerate(lines, 1):
-            for pattern, replacement, desc in self.mutations:
-                if re.search(pattern, line):
-                    mutated_lines = lines.copy()
-                    mutated_lines[line_num - 1] = re.sub(
-                        pattern, replacement, line, count=1
-                    )
-                    mutant_source = '\n'.join(mutated_lines)
-                    mutants.append((
-                        mutant_source,
-                        f"Line {line_num}: {desc}",
-                        line_num
-                    ))
-
-        return mutants
-
 
 class MemoryManagementMutationOperator(MutationOperator):
     """Mutate memory management operations: Deallocate, new, null"""
 
     def __init__(self):
         super().__init__("Memory Management", "memory", "CRITICAL")
-
-    def apply(self, source: str) -> List[Tuple[str, str, int]]:
-        mutants = []
-        lines = source.split('\n')
-
-        for line_num, line in enumerate(lines, 1):
-            # Mutation 1: Comment out Deallocate calls
-            if re.search(r'\bDeallocate\s*\(', line):
-                mutated_lines = lines.copy()
-                mutated_lines[line_num - 1] = '      -- ' + line + '  -- MUTANT: Skip deallocation'
-                mutant_source = '\n'.join(mutated_lines)
-                mutants.append((
-                    mutant_source,
-                    f"Line {line_num}: Deallocate → (removed) [MEMORY LEAK]",
-                    line_num
-                ))
-
-            # Mutation 2: new → null
-            if re.search(r'\bnew\s+\w+', line):
-                mutated_lines = lines.copy()
-                mutated_lines[line_num - 1] = re.sub(
-                    r'\bnew\s+\w+', 'null  -- MUTANT', line, count=1
-                )
-                mutant_source = '\n'.join(mutated_lines)
-                mutants.append((
-                    mutant_source,
-                    f"Line {line_num}: new T → null [NULL POINTER]",
-                    line_num
-                ))
-
-        return mutants
+        self.rules = [
+            # Comment out Deallocate calls
+            MutationRule(r'\bDeallocate\s*\(', _comment_out('Skip deallocation'),
+                         'Deallocate → (removed) [MEMORY LEAK]', key='Deallocate'),
+            # new T → null (plain allocators; "null'(...)" would not compile)
+            MutationRule(r'\bnew\s+[\w.]+(?![\w.]|\s*[\'(])', 'null',
+                         'new T → null [NULL POINTER]', key='new'),
+        ]
 
 
 class ReferenceCountingMutationOperator(MutationOperator):
@@ -214,50 +506,17 @@ class ReferenceCountingMutationOperator(MutationOperator):
 
     def __init__(self):
         super().__init__("Reference Counting", "ref_count", "CRITICAL")
-
-    def apply(self, source: str) -> List[Tuple[str, str, int]]:
-        mutants = []
-        lines = source.split('\n')
-
-        for line_num, line in enumerate(lines, 1):
-            # Mutation 1: +1 → +2 (off-by-one)
-            if re.search(r'Ref_Count.*\+\s*1', line):
-                mutated_lines = lines.copy()
-                mutated_lines[line_num - 1] = re.sub(
-                    r'\+\s*1', '+ 2  -- MUTANT', line, count=1
-                )
-                mutant_source = '\n'.join(mutated_lines)
-                mutants.append((
-                    mutant_source,
-                    f"Line {line_num}: +1 → +2 [REF COUNT ERROR]",
-                    line_num
-                ))
-
-            # Mutation 2: -1 → -2 (off-by-one)
-            if re.search(r'Ref_Count.*-\s*1', line):
-                mutated_lines = lines.copy()
-                mutated_lines[line_num - 1] = re.sub(
-                    r'-\s*1', '- 2  -- MUTANT', line, count=1
-                )
-                mutant_source = '\n'.join(mutated_lines)
-                mutants.append((
-                    mutant_source,
-                    f"Line {line_num}: -1 → -2 [REF COUNT ERROR]",
-                    line_num
-                ))
-
-            # Mutation 3: Comment out ref count updates
-            if re.search(r'Ref_Count\s*:=', line):
-                mutated_lines = lines.copy()
-                mutated_lines[line_num - 1] = '      -- ' + line + '  -- MUTANT: Skip ref count'
-                mutant_source = '\n'.join(mutated_lines)
-                mutants.append((
-                    mutant_source,
-                    f"Line {line_num}: Ref_Count update → (removed)",
-                    line_num
-                ))
-
-        return mutants
+        self.rules = [
+            # +1 → +2 (off-by-one)
+            MutationRule(r'\+\s*1', '+ 2', '+1 → +2 [REF COUNT ERROR]',
+                         key='Ref_Count', trigger=r'Ref_Count.*\+\s*1'),
+            # -1 → -2 (off-by-one)
+            MutationRule(r'-\s*1', '- 2', '-1 → -2 [REF COUNT ERROR]',
+                         key='Ref_Count', trigger=r'Ref_Count.*-\s*1'),
+            # Comment out ref count updates
+            MutationRule(r'Ref_Count\s*:=', _comment_out('Skip ref count'),
+                         'Ref_Count update → (removed)', key='Ref_Count'),
+        ]
 
 
 class ExceptionMutationOperator(MutationOperator):
@@ -265,37 +524,14 @@ class ExceptionMutationOperator(MutationOperator):
 
     def __init__(self):
         super().__init__("Exception", "exception", "HIGH")
-
-    def apply(self, source: str) -> List[Tuple[str, str, int]]:
-        mutants = []
-        lines = source.split('\n')
-
-        for line_num, line in enumerate(lines, 1):
-            # Mutation 1: Comment out raise statements
-            if re.search(r'\braise\s+\w+', line):
-                mutated_lines = lines.copy()
-                mutated_lines[line_num - 1] = '      -- ' + line + '  -- MUTANT: Exception suppressed'
-                mutant_source = '\n'.join(mutated_lines)
-                mutants.append((
-                    mutant_source,
-                    f"Line {line_num}: raise → (removed) [ERROR MASKING]",
-                    line_num
-                ))
-
-            # Mutation 2: Change exception type
-            if 'raise Constraint_Error' in line:
-                mutated_lines = lines.copy()
-                mutated_lines[line_num - 1] = line.replace(
-                    'Constraint_Error', 'Program_Error  -- MUTANT'
-                )
-                mutant_source = '\n'.join(mutated_lines)
-                mutants.append((
-                    mutant_source,
-                    f"Line {line_num}: Constraint_Error → Program_Error",
-                    line_num
-                ))
-
-        return mutants
+        self.rules = [
+            # Comment out raise statements
+            MutationRule(r'\braise\s+\w+', _comment_out('Exception suppressed'),
+                         'raise → (removed) [ERROR MASKING]', key='raise'),
+            # Change exception type
+            MutationRule(r'\braise\s+Constraint_Error\b', 'raise Program_Error',
+                         'Constraint_Error → Program_Error', key='Constraint_Error'),
+        ]
 
 
 class ConstantMutationOperator(MutationOperator):
@@ -303,47 +539,876 @@ class ConstantMutationOperator(MutationOperator):
 
     def __init__(self):
         super().__init__("Constant", "constant", "MEDIUM")
+        self.rules = [
+            MutationRule(r'(?<=[=<>])(\s*)0\b', r'\g<1>1', '0 → 1', key='0'),
+            MutationRule(r'(?<=[=<>])(\s*)1\b', r'\g<1>0', '1 → 0', key='1'),
+        ]
 
-    def apply(self, source: str) -> List[Tuple[str, str, int]]:
-        mutants = []
-        lines = source.split('\n')
-
-        for line_num, line in enumerate(lines, 1):
-            # Mutation 1: 0 → 1
-            if re.search(r'[=<>]\s*0\b', line):
-                mutated_lines = lines.copy()
-                mutated_lines[line_num - 1] = re.sub(
-                    r'([=<>]\s*)0\b', r'\g<1>1  -- MUTANT', line, count=1
-                )
-                mutant_source = '\n'.join(mutated_lines)
-                mutants.append((
-                    mutant_source,
-                    f"Line {line_num}: 0 → 1",
-                    line_num
-                ))
-
-            # Mutation 2: 1 → 0
-            if re.search(r'[=<>]\s*1\b', line):
-                mutated_lines = lines.copy()
-                mutated_lines[line_num - 1] = re.sub(
-                    r'([=<>]\s*)1\b', r'\g<1>0  -- MUTANT', line, count=1
+
+class MutationScanner:
+    """
+    Single-pass mutation site scanner for a set of operators
+
+    Every operator's rules are flattened into one table up front and
+    indexed by their key literal. Each line is checked once per distinct
+    key (a plain substring test), and only the rules whose key is present
+    run their regex, so lines that no rule can touch cost almost nothing.
+    """
+
+    def __init__(self, operators: List[MutationOperator]):
+        self.operators = operators
+        self.table: List[Tuple[int, MutationOperator, MutationRule]] = [
+            (index, operator, rule)
+            for index, operator in enumerate(operators)
+            for rule in operator.rules
+        ]
+        self.rules_by_key: Dict[str, List[int]] = {}
+        for position, (_, _, rule) in enumerate(self.table):
+            self.rules_by_key.setdefault(rule.key, []).append(position)
+
+    def scan(self, source: str) -> List[List[Tuple[Dict, str, int]]]:
+        """
+        Find every mutation site for every operator
+
+        Returns: one list of (patch, description, line_number) per operator,
+        in operator order, each sorted by line as apply() always produced
+        """
+        found: List[List[Tuple[Dict, str, int]]] = [[] for _ in self.operators]
+        keyed_rules = list(self.rules_by_key.items())
+        table = self.table
+
+        for line_num, line in enumerate(source.split('\n'), 1):
+            candidates = [
+                position
+                for key, positions in keyed_rules if key in line
+                for position in positions
+            ]
+            if not candidates:
+                continue
+            candidates.sort()
+
+            skipped = {}
+            lexed = AdaLine(line)
+            for position in candidates:
+                index, operator, rule = table[position]
+                if index not in skipped:
+                    skipped[index] = operator.skip_line(line)
+                if skipped[index]:
+                    continue
+
+                mutated_line = rule.mutate(line, lexed)
+                if mutated_line is not None:
+                    found[index].append((
+                        make_patch(line_num, line, mutated_line),
+                        f"Line {line_num}: {rule.description}",
+                        line_num
+                    ))
+
+        return found
+
+
+class MutationCache:
+    """
+    Persistent mutant verdict cache
+
+    A verdict is keyed on the mutated source, the fingerprint of the test
+    suite inputs, the operator name/version and, when coverage selects
+    the tests, the selected tests, so it is reused only when none of the
+    things that could change the outcome have changed.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.cache_file = self.cache_dir / "results.json"
+        self.entries: Dict[str, Dict] = {}
+        self.hits = 0
+        self._lock = threading.Lock()
+
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                print(f"Warning: ignoring unreadable cache {self.cache_file}")
+                self.entries = {}
+
+    @staticmethod
+    def fingerprint_inputs(build_dir: Path, exclude: str,
+                           extra_inputs: List[str] = None) -> str:
+        """
+        Hash the test suite inputs: every Ada source and project file under
+        build_dir (except the file being mutated, given relative to
+        build_dir) plus any extra paths
+        """
+        digest = hashlib.sha256()
+        roots = [build_dir] + [Path(p) for p in (extra_inputs or [])]
+
+        for root in roots:
+            files = [root] if root.is_file() else sorted(
+                p for p in root.rglob('*')
+                if p.is_file() and p.suffix in ('.adb', '.ads', '.gpr')
+            )
+            for path in files:
+                if root == build_dir and str(path.relative_to(root)) in (exclude, f"{exclude}.backup"):
+                    continue
+                digest.update(str(path.relative_to(root) if path != root else path).encode())
+                digest.update(b'\0')
+                digest.update(path.read_bytes())
+                digest.update(b'\0')
+
+        return digest.hexdigest()
+
+    @staticmethod
+    def key(mutant: Dict, inputs_fingerprint: str, tests: Optional[List[str]] = None) -> str:
+        """
+        Cache key for a mutant under a given fingerprint of the original
+        source and test suite (the patch plus the original source fully
+        determine the mutated source)
+
+        `tests` is the coverage-selected subset the mutant runs against
+        (None: the whole suite). A mutant that survives its subset may be
+        killed by a test a different coverage index selects, so the
+        subset is part of the key.
+        """
+        digest = hashlib.sha256()
+        digest.update(json.dumps(mutant['patch'], sort_keys=True).encode())
+        digest.update(inputs_fingerprint.encode())
+        digest.update(f"{mutant['operator']}@{mutant['operator_version']}".encode())
+        if tests is not None:
+            digest.update(json.dumps(tests).encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> str:
+        """Return the cached status for key, or None"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        self.hits += 1
+        return entry['status']
+
+    def put(self, key: str, mutant: Dict):
+        """Record a mutant verdict (non-deterministic verdicts are skipped)"""
+        if mutant['status'] not in CACHEABLE_STATUSES:
+            return
+        if mutant.get('covering_tests') == 0:
+            # Decided by the coverage data alone, which is not part of the key
+            return
+        with self._lock:
+            self.entries[key] = {
+                'status': mutant['status'],
+                'operator': mutant['operator'],
+                'description': mutant['description'],
+                'recorded': time.strftime('%Y-%m-%d %H:%M:%S UTC', time.gmtime()),
+            }
+
+    def save(self):
+        """Write the cache atomically"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, self.cache_file)
+
+
+class KillerHistory:
+    """
+    Which tests killed mutants where, remembered across runs
+
+    Used to order test execution so the test most likely to fail for a
+    mutant runs first: tests that killed a mutant on the same line, then
+    the tests that killed the most mutants in the same file.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.history_file = Path(cache_dir) / "killers.json"
+        self.lines: Dict[str, Dict[str, List[str]]] = {}
+        self.files: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+        if self.history_file.exists():
+            try:
+                with open(self.history_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.lines = data.get('lines', {})
+                self.files = data.get('files', {})
+            except (OSError, ValueError):
+                print(f"Warning: ignoring unreadable killer history {self.history_file}")
+
+    def record(self, source: str, line: int, test: str):
+        """Remember that test killed a mutant on source:line"""
+        with self._lock:
+            line_killers = self.lines.setdefault(source, {}).setdefault(str(line), [])
+            if test in line_killers:
+                line_killers.remove(test)
+            line_killers.insert(0, test)
+            file_killers = self.files.setdefault(source, {})
+            file_killers[test] = file_killers.get(test, 0) + 1
+
+    def suggest(self, source: str, line: int, limit: int = 3) -> List[str]:
+        """Tests to try first for a mutant on source:line, best first"""
+        with self._lock:
+            candidates = list(self.lines.get(source, {}).get(str(line), []))
+            by_count = sorted(self.files.get(source, {}).items(), key=lambda kv: -kv[1])
+        for test, _ in by_count:
+            if test not in candidates:
+                candidates.append(test)
+        return candidates[:limit]
+
+    def save(self):
+        """Write the history atomically"""
+        self.history_file.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            fd, tmp_path = tempfile.mkstemp(dir=self.history_file.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'lines': self.lines, 'files': self.files}, f)
+            os.replace(tmp_path, self.history_file)
+
+
+class RunJournal:
+    """
+    Checkpoint of a mutation run: one JSON line per finished mutant
+
+    Lines are flushed and synced as each verdict arrives, so a run killed
+    halfway (CI preemption, OOM) can be resumed from the journal. Entries
+    are keyed by mutant hash, which covers both source and patch; a line
+    torn by the crash is ignored.
+    """
+
+    VERDICT_FIELDS = ('status', 'killed_by', 'covering_tests', 'seconds', 'schema', 'cached')
+
+    def __init__(self, path: Path, resume: bool = False):
+        self.path = Path(path)
+        self.entries: Dict[str, Dict] = {}
+        torn = False
+        if resume and self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    torn = not line.endswith('\n')
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    self.entries[entry['hash']] = entry
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+        if torn:
+            # Finish the torn line, or the next entry would be appended to it
+            self._file.write('\n')
+
+    def restore(self, mutant: Dict) -> bool:
+        """Copy a journaled verdict onto the mutant; False if there is none"""
+        entry = self.entries.get(mutant['hash'])
+        if entry is None:
+            return False
+        mutant.update((k, entry[k]) for k in self.VERDICT_FIELDS if k in entry)
+        mutant['resumed'] = True
+        return True
+
+    def append(self, mutant: Dict):
+        entry = {k: mutant[k] for k in self.VERDICT_FIELDS if k in mutant}
+        entry['hash'] = mutant['hash']
+        self._file.write(json.dumps(entry) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+class CoverageIndex:
+    """
+    Index from (source file, line) to the tests that execute that line
+
+    Built from per-test gcov output of a coverage build, laid out as one
+    directory per test:
+
+        coverage/
+          001/
+            test_name          <- optional, full AUnit test name
+            polyorb-any.adb.gcov
+          002/
+            ...
+
+    When test_name is absent the directory name is used as the test name.
+
+    Sources are keyed by the path in the report's 'Source:' line (or the
+    gcov --preserve-paths file name), so files with the same name in
+    different directories stay apart. Lookups take the path relative to
+    the source root and match it against the end of those paths.
+    """
+
+    GCOV_LINE = re.compile(r'^\s*([^:]+):\s*(\d+):')
+
+    def __init__(self):
+        self.lines: Dict[str, Dict[int, set]] = {}
+        self.tests: List[str] = []
+        self._sources: Dict[str, List[str]] = {}
+
+    @classmethod
+    def load(cls, path: str) -> 'CoverageIndex':
+        """Load an index from a gcov directory or a saved JSON index"""
+        path = Path(path)
+        index = cls()
+
+        if path.is_file():
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            index.tests = data['tests']
+            for source, lines in data['lines'].items():
+                index.lines[source] = {
+                    int(line): {index.tests[t] for t in tests}
+                    for line, tests in lines.items()
+                }
+            return index
+
+        for test_dir in sorted(p for p in path.iterdir() if p.is_dir()):
+            name_file = test_dir / 'test_name'
+            test_name = (name_file.read_text(encoding='utf-8').strip()
+                         if name_file.exists() else test_dir.name)
+            index.tests.append(test_name)
+            for gcov_file in test_dir.rglob('*.gcov'):
+                index._ingest_gcov(gcov_file, test_name)
+
+        return index
+
+    def _ingest_gcov(self, gcov_file: Path, test_name: str):
+        """Record the lines a gcov report shows as executed"""
+        # --preserve-paths mangles '/' to '#'
+        source = gcov_file.name[:-len('.gcov')].replace('#', '/')
+        with open(gcov_file, 'r', encoding='utf-8', errors='replace') as f:
+            for text in f:
+                match = self.GCOV_LINE.match(text)
+                if not match:
+                    continue
+                count, line = match.group(1).strip(), int(match.group(2))
+                if line == 0:
+                    if text.split(':', 2)[-1].startswith('Source:'):
+                        source = os.path.normpath(text.split('Source:', 1)[1].strip())
+                    continue
+                # '-' is non-executable, '#####'/'=====' never executed
+                if count[:1].isdigit():
+                    self.lines.setdefault(source, {}).setdefault(line, set()).add(test_name)
+
+    def save(self, path: str):
+        """Save the index as JSON for fast reloading"""
+        test_ids = {name: i for i, name in enumerate(self.tests)}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'tests': self.tests,
+                'lines': {
+                    source: {str(line): sorted(test_ids[t] for t in tests)
+                             for line, tests in lines.items()}
+                    for source, lines in self.lines.items()
+                },
+            }, f)
+
+    def _sources_for(self, relpath: str) -> List[str]:
+        """
+        Index keys for a path relative to the source root: keys ending in
+        that path, else the one key with the same file name (reports
+        without directories, indexes saved by older versions)
+        """
+        if relpath not in self._sources:
+            path = Path(relpath).as_posix()
+            matches = [s for s in self.lines if s == path or s.endswith('/' + path)]
+            if not matches:
+                named = [s for s in self.lines if Path(s).name == Path(path).name]
+                matches = named if len(named) == 1 else []
+            self._sources[relpath] = matches
+        return self._sources[relpath]
+
+    def tests_for(self, source: str, line: int) -> List[str]:
+        """Tests that execute a line of a source (path relative to the source root), in index order"""
+        covering = set()
+        for key in self._sources_for(source):
+            covering |= self.lines[key].get(line, set())
+        return [t for t in self.tests if t in covering]
+
+
+def split_comment(line: str) -> Tuple[str, str]:
+    """Split an Ada source line into (code, comment), ignoring '--' in literals"""
+    i = 0
+    while i < len(line):
+        char = line[i]
+        if char == '"':
+            end = line.find('"', i + 1)
+            while end != -1 and line[end + 1:end + 2] == '"':
+                end = line.find('"', end + 2)
+            if end == -1:
+                break
+            i = end + 1
+            continue
+        if char == "'" and line[i + 2:i + 3] == "'":
+            i += 3
+            continue
+        if line.startswith('--', i):
+            return line[:i], line[i:]
+        i += 1
+    return line, ''
+
+
+class MutantSchema:
+    """
+    Compile-once build of all mutants of one source file
+
+    Every switchable statement is replaced by a runtime switch on the active
+    mutant id, read from SCHEMA_ENV_VAR by a small generated package:
+
+        if Mutant_Schema.Active (12) then
+           <mutated statement>
+        else
+           <original statement>
+        end if;
+
+    Conditions of one-line `if/elsif ... then` and `while ... loop` headers
+    are switched with an Ada 2012 conditional expression instead. Code that
+    is not a simple statement in a statement sequence (declarations,
+    compound statements, `when`/`end` lines, ...) and mutations that break
+    the statement shape are left to per-mutant builds.
+    """
+
+    HEADER = re.compile(r'^(\s*)(if|elsif|while)\s+(.*\S)\s+(then|loop)\s*$', re.IGNORECASE)
+    DECLARATION = re.compile(r'^\s*[A-Za-z]\w*(\s*,\s*[A-Za-z]\w*)*\s*:(?!=)')
+    NOT_STATEMENT = re.compile(
+        r'^\s*(end|when|else|elsif|exception|begin|declare|pragma|with|use|'
+        r'procedure|function|package|task|protected|entry|type|subtype|generic|'
+        r'private|separate|for|if|while|case|select|accept|loop|or|then|is|do)\b',
+        re.IGNORECASE
+    )
+    UNIT_START = re.compile(r'^\s*(procedure|function|entry|package\s+body|'
+                            r'task\s+body|protected\s+body)\b', re.IGNORECASE)
+    CONTEXT_START = re.compile(r'^\s*(with|use|package|procedure|function|'
+                               r'separate|private|generic)\b', re.IGNORECASE)
+    END_OF_SCOPE = re.compile(r'^\s*end\b(?!\s+(if|loop|case|record|select)\b)',
+                              re.IGNORECASE)
+    STATEMENT_BOUNDARY = re.compile(r'(;|\bthen|\belse|\bloop|\bbegin|=>|\bdo)\s*$',
+                                    re.IGNORECASE)
+    SHORT_CIRCUIT = re.compile(r'\b(and\s+then|or\s+else)\s*$', re.IGNORECASE)
+    COMPOUND_END = re.compile(r'\b(then|else|loop|begin|do|is|declare|exception|select)$',
+                              re.IGNORECASE)
+    LITERAL = re.compile(r'"(?:[^"]|"")*"|\'.\'')
+
+    def __init__(self, source_lines: List[str]):
+        self.source_lines = source_lines
+        self.statements = self._find_statements()
+
+    @classmethod
+    def _depth(cls, code: str) -> int:
+        """Parenthesis balance of a code fragment, ignoring literals"""
+        code = cls.LITERAL.sub('', code)
+        return code.count('(') - code.count(')')
+
+    def _statement_end(self, start: int) -> Optional[int]:
+        """
+        Last line (1-based) of the simple statement starting at start
+
+        Returns None if the code from start on is not one simple statement.
+        """
+        depth = 0
+        for line_num in range(start, len(self.source_lines) + 1):
+            code = split_comment(self.source_lines[line_num - 1])[0].strip()
+            depth += self._depth(code)
+            if depth < 0:
+                return None
+            if depth == 0 and code.endswith(';'):
+                return line_num
+            if depth == 0 and self.COMPOUND_END.search(code):
+                return None
+        return None
+
+    def _find_statements(self) -> Dict[int, Tuple[int, int]]:
+        """
+        Map each line of a simple statement to the statement's line span
+
+        A lightweight scope tracker: subprogram and package bodies and
+        declare blocks open a declarative part, `begin`/`do` start a
+        statement sequence and a bare `end [Name];` closes the scope.
+        """
+        scopes: List[str] = []
+        pending_body = False
+        previous = ';'
+        statement_end = 0
+        found: Dict[int, Tuple[int, int]] = {}
+
+        for line_num, line in enumerate(self.source_lines, 1):
+            code = split_comment(line)[0].strip()
+            if not code:
+                continue
+
+            if (line_num > statement_end
+                    and scopes and scopes[-1] == 'statements'
+                    and self.STATEMENT_BOUNDARY.search(previous)
+                    and not self.SHORT_CIRCUIT.search(previous)
+                    and not self.NOT_STATEMENT.match(code)
+                    and not self.DECLARATION.match(code)):
+                end = self._statement_end(line_num)
+                if end is not None:
+                    statement_end = end
+                    for covered in range(line_num, end + 1):
+                        found[covered] = (line_num, end)
+
+            if self.UNIT_START.match(code):
+                pending_body = True
+            if pending_body and re.search(r'\bis$', code, re.IGNORECASE):
+                scopes.append('declarations')
+                pending_body = False
+            elif pending_body and code.endswith(';'):
+                pending_body = False
+            elif re.match(r'^declare$', code, re.IGNORECASE):
+                scopes.append('declarations')
+            elif re.match(r'^begin$', code, re.IGNORECASE):
+                if scopes and scopes[-1] == 'declarations':
+                    scopes[-1] = 'statements'
+                else:
+                    # Block statement without a declarative part
+                    scopes.append('statements')
+            elif re.search(r'\bdo$', code, re.IGNORECASE):
+                scopes.append('statements')
+            elif self.END_OF_SCOPE.match(code) and scopes:
+                scopes.pop()
+
+            previous = code
+
+        return found
+
+    @staticmethod
+    def _indent(lines: List[str], indent: str) -> List[str]:
+        """Nest statement lines one level below indent, keeping their layout"""
+        return [f"{indent}   {text[len(indent):] if text.startswith(indent) else text.strip()}"
+                for text in lines]
+
+    def switch(self, mutant: Dict) -> Optional[Tuple[int, str, List[str]]]:
+        """
+        The (first line, kind, mutated lines) a mutant contributes to a switch
+
+        Returns None when the mutant cannot be expressed as a runtime switch.
+        """
+        line_num = mutant['patch']['line']
+        original = self.source_lines[line_num - 1]
+        mutated = apply_patch([original], dict(mutant['patch'], line=1))
+
+        if line_num in self.statements:
+            start, end = self.statements[line_num]
+            lines = self.source_lines[start - 1:end]
+            lines[line_num - start] = mutated
+            code = ' '.join(split_comment(line)[0].strip() for line in lines).strip()
+            if not code:
+                return start, 'statement', ['null;']
+            if code.endswith(';') and self._depth(code) == 0:
+                return start, 'statement', lines
+            return None
+
+        header = self.HEADER.match(split_comment(original)[0])
+        mutated_header = self.HEADER.match(split_comment(mutated)[0])
+        if header and mutated_header and \
+                header.group(2, 4) == mutated_header.group(2, 4):
+            return line_num, 'condition', [mutated_header.group(3)]
+        return None
+
+    def build(self, mutants: List[Dict]) -> Tuple[str, List[Dict]]:
+        """
+        Generate the schema source for the mutants that can be switched
+
+        Returns: (schema source, schema mutants); the remaining mutants need
+        per-mutant builds.
+        """
+        switches: Dict[int, List[Tuple[Dict, str, List[str]]]] = {}
+        for mutant in mutants:
+            switch = self.switch(mutant)
+            if switch is not None:
+                start, kind, lines = switch
+                switches.setdefault(start, []).append((mutant, kind, lines))
+
+        if not switches:
+            return '', []
+
+        output = []
+        context_added = False
+        skip_until = 0
+        for line_num, line in enumerate(self.source_lines, 1):
+            if not context_added and self.CONTEXT_START.match(split_comment(line)[0]):
+                output.append(f"with {SCHEMA_PACKAGE};")
+                context_added = True
+
+            if line_num <= skip_until:
+                continue
+            if line_num not in switches:
+                output.append(line)
+                continue
+
+            indent = line[:len(line) - len(line.lstrip())]
+            entries = switches[line_num]
+            if entries[0][1] == 'statement':
+                end = self.statements[line_num][1]
+                for i, (mutant, _, lines) in enumerate(entries):
+                    keyword = 'if' if i == 0 else 'elsif'
+                    output.append(f"{indent}{keyword} {SCHEMA_PACKAGE}.Active ({mutant['id']}) then")
+                    output.extend(self._indent(lines, indent))
+                output.append(f"{indent}else")
+                output.extend(self._indent(self.source_lines[line_num - 1:end], indent))
+                output.append(f"{indent}end if;")
+                skip_until = end
+            else:
+                header = self.HEADER.match(split_comment(line)[0])
+                alternatives = ' '.join(
+                    f"{'if' if i == 0 else 'elsif'} {SCHEMA_PACKAGE}.Active ({mutant['id']}) "
+                    f"then ({lines[0]})"
+                    for i, (mutant, _, lines) in enumerate(entries)
                 )
-                mutant_source = '\n'.join(mutated_lines)
-                mutants.append((
-                    mutant_source,
-                    f"Line {line_num}: 1 → 0",
-                    line_num
-                ))
+                output.append(f"{indent}{header.group(2)} ({alternatives} "
+                              f"else ({header.group(3)})) {header.group(4)}")
+
+        schema_mutants = [m for entries in switches.values() for m, _, _ in entries]
+        return '\n'.join(output), schema_mutants
+
+    @staticmethod
+    def write_package(directory: Path):
+        """Write the Mutant_Schema package that reads the active mutant id"""
+        unit = SCHEMA_PACKAGE.lower()
+        (directory / f"{unit}.ads").write_text(f"""package {SCHEMA_PACKAGE} is
+   function Active (Id : Natural) return Boolean;
+   pragma Inline (Active);
+end {SCHEMA_PACKAGE};
+""", encoding='utf-8')
+        (directory / f"{unit}.adb").write_text(f"""with Ada.Environment_Variables;
+
+package body {SCHEMA_PACKAGE} is
+
+   function Read_Id return Integer is
+   begin
+      if Ada.Environment_Variables.Exists ("{SCHEMA_ENV_VAR}") then
+         return Integer'Value (Ada.Environment_Variables.Value ("{SCHEMA_ENV_VAR}"));
+      end if;
+      return 0;
+   exception
+      when Constraint_Error =>
+         return 0;
+   end Read_Id;
+
+   Selected : constant Integer := Read_Id;
+
+   function Active (Id : Natural) return Boolean is
+   begin
+      return Id = Selected;
+   end Active;
+
+end {SCHEMA_PACKAGE};
+""", encoding='utf-8')
+
+
+class MutantScheduler:
+    """
+    Execution order, sampling and time budget for a mutation run
+
+    Mutants are grouped into strata (operator, category or file). With a
+    sample size, each stratum gets at least one mutant and the rest is
+    allocated in proportion to stratum size x priority weight, so CRITICAL
+    operators are oversampled without starving the others. Within a
+    stratum the pick is a seeded shuffle. The order starts with one mutant
+    of every stratum and then interleaves them by size x priority weight,
+    so any prefix -- e.g. whatever a time budget allowed to run -- is
+    itself a stratified sample covering as many strata as it can.
+
+    The score is then estimated with the stratified estimator, weighting
+    each stratum by its share of the whole population rather than of the
+    sample, which keeps the priority oversampling from biasing it.
+    """
+
+    STRATA = ('operator', 'category', 'file')
+    PRIORITY_WEIGHTS = {'CRITICAL': 4.0, 'HIGH': 2.0, 'MEDIUM': 1.0, 'LOW': 1.0}
+
+    def __init__(self, strata: str = 'operator', sample: float = None,
+                 time_budget: float = None, seed: int = 0, confidence: float = 0.95):
+        self.strata = strata
+        self.sample = sample
+        self.time_budget = time_budget
+        self.seed = seed
+        self.confidence = confidence
+        self.population: Dict[str, int] = {}
+        self.deadline: Optional[float] = None
+
+    def stratum(self, mutant: Dict) -> str:
+        if self.strata == 'file':
+            return mutant.get('source_file', '')
+        return mutant[self.strata]
+
+    def allocate(self, sizes: Dict[str, int], weights: Dict[str, float],
+                 count: int) -> Dict[str, int]:
+        """Split a sample of `count` mutants over the strata"""
+        allocation = {name: 0 for name in sizes}
+        demand = {name: sizes[name] * weights[name] for name in sizes}
+        # Every stratum first (heaviest first), so each one gets an estimate
+        for name in sorted(sizes, key=lambda name: -demand[name])[:count]:
+            allocation[name] = 1
+        # Then the highest-averages method: proportional to demand
+        for _ in range(count - sum(allocation.values())):
+            open_strata = [name for name in sizes if allocation[name] < sizes[name]]
+            if not open_strata:
+                break
+            best = max(open_strata, key=lambda name: demand[name] / (allocation[name] + 1))
+            allocation[best] += 1
+        return allocation
+
+    def plan(self, mutants: List[Dict]) -> List[Dict]:
+        """Return the mutants to run, in execution order"""
+        rng = random.Random(self.seed)
+        groups: Dict[str, List[Dict]] = {}
+        for mutant in mutants:
+            groups.setdefault(self.stratum(mutant), []).append(mutant)
+        self.population = {name: len(group) for name, group in groups.items()}
+
+        weights = {
+            name: sum(self.PRIORITY_WEIGHTS.get(m['priority'], 1.0) for m in group) / len(group)
+            for name, group in groups.items()
+        }
+        count = len(mutants)
+        if self.sample:
+            count = int(round(self.sample * len(mutants))) if self.sample < 1 else int(self.sample)
+            count = min(count, len(mutants))
+        allocation = self.allocate(self.population, weights, count)
+
+        ranked = []
+        for name, group in groups.items():
+            group = list(group)
+            rng.shuffle(group)
+            taken = allocation[name]
+            for index, mutant in enumerate(group[:taken]):
+                # One of each stratum first (CRITICAL ones leading), then
+                # each stratum advances at a rate of its size x weight
+                ranked.append((index > 0, index / (taken * weights[name]), -weights[name],
+                               name, mutant))
+        ranked.sort(key=lambda entry: entry[:4])
+
+        planned = [entry[-1] for entry in ranked]
+        print(f"      Scheduled {len(planned)} of {len(mutants)} mutants over "
+              f"{len(groups)} strata by {self.strata} (seed {self.seed})")
+        return planned
+
+    def start(self):
+        """Start the time budget clock"""
+        if self.time_budget:
+            self.deadline = time.monotonic() + self.time_budget
+
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def estimate(self, results: List[Dict]) -> Optional[Dict]:
+        """
+        Stratified estimate of the mutation score over the whole population
 
-        return mutants
+        Strata without a single KILLED/SURVIVED verdict are unknown: they are
+        left out of the point estimate and widen the interval to what they
+        could contribute (anywhere from 0 to their full weight).
+        """
+        total = sum(self.population.values())
+        if not total:
+            return None
+
+        verdicts: Dict[str, List[int]] = {}
+        for result in results:
+            if result['status'] in ('KILLED', 'SURVIVED'):
+                counts = verdicts.setdefault(self.stratum(result), [0, 0])
+                counts[0] += result['status'] == 'KILLED'
+                counts[1] += 1
+
+        known_weight = 0.0
+        score = 0.0
+        variance = 0.0
+        for name, size in self.population.items():
+            if name not in verdicts:
+                continue
+            killed, valid = verdicts[name]
+            weight = size / total
+            known_weight += weight
+            score += weight * killed / valid
+            # Agresti-Coull style smoothing keeps all-killed strata from
+            # claiming zero variance; finite population correction applies
+            smoothed = (killed + 1) / (valid + 2)
+            correction = max(0.0, 1 - valid / size)
+            variance += weight ** 2 * smoothed * (1 - smoothed) / valid * correction
+        if not known_weight:
+            return None
+
+        margin = NormalDist().inv_cdf(0.5 + self.confidence / 2) * math.sqrt(variance)
+        return {
+            'score': score / known_weight * 100,
+            'low': max(0.0, score - margin) * 100,
+            'high': min(1.0, score + (1 - known_weight) + margin) * 100,
+            'confidence': self.confidence,
+            'tested': sum(valid for _, valid in verdicts.values()),
+            'population': total,
+            'strata': len(self.population),
+            'untested_strata': sorted(set(self.population) - set(verdicts)),
+            'stratified_by': self.strata,
+        }
+
+    def print_estimate(self, results: List[Dict], output_dir: Path):
+        """Print the estimated score and save it as score_estimate.json"""
+        estimate = self.estimate(results)
+        if estimate is None:
+            return
+        not_run = estimate['population'] - len(results)
+        if not_run:
+            reason = 'sampled out or over the time budget' if self.time_budget else 'sampled out'
+            print(f"Not Run:             {not_run:3d} ({reason})")
+        print(f"ESTIMATED SCORE:     {estimate['score']:.1f}% "
+              f"({estimate['confidence']:.0%} CI {estimate['low']:.1f}-{estimate['high']:.1f}%, "
+              f"{estimate['tested']} scored of {estimate['population']} mutants, "
+              f"{estimate['strata']} strata by {estimate['stratified_by']})")
+        if estimate['untested_strata']:
+            print(f"Untested Strata:     {', '.join(estimate['untested_strata'])}")
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        with open(output_dir / "score_estimate.json", 'w', encoding='utf-8') as f:
+            json.dump(estimate, f, indent=2)
 
 
 class MutationTester:
     """Main mutation testing engine"""
 
-    def __init__(self, source_file: str, output_dir: str = "mutants"):
+    def __init__(self, source_file: str, output_dir: str = "mutants",
+                 cache: MutationCache = None, cache_inputs: List[str] = None,
+                 coverage: CoverageIndex = None,
+                 timeout_factor: float = DEFAULT_TIMEOUT_FACTOR,
+                 timeout_slack: float = DEFAULT_TIMEOUT_SLACK,
+                 fixed_timeout: float = None, max_timeout: float = None,
+                 killers: KillerHistory = None, fail_fast: bool = False,
+                 schemata: bool = False, results_db: MutationResultsDB = None,
+                 resume: bool = False, build_relpath: str = None,
+                 ignore_procedures: List[str] = None,
+                 diff_scope: DiffScope = None, previous_results: List[Dict] = None,
+                 prune: bool = True, scheduler: MutantScheduler = None):
         self.source_file = Path(source_file)
+        # Location of the file inside the build tree, and its key in the
+        # killer history
+        self.build_relpath = build_relpath or self.source_file.name
+        self.ignore_calls = [re.compile(p) for p in (ignore_procedures or [])]
         self.output_dir = Path(output_dir)
+        self.coverage = coverage
+        self.killers = killers
+        self.fail_fast = fail_fast
+        self.schemata = schemata
+        self.results_db = results_db
+        self.resume = resume
+        self.journal: Optional[RunJournal] = None
+        self.diff_scope = diff_scope
+        self.prune = prune
+        self.pruned: List[Dict] = []
+        self.scheduler = scheduler
+        self.previous_results = previous_results or []
+        self.cache_keys: Dict[int, str] = {}
+        self.run_id: Optional[int] = None
+        self.timeout_factor = timeout_factor
+        self.timeout_slack = timeout_slack
+        self.fixed_timeout = fixed_timeout
+        self.max_timeout = max_timeout
+        self.baseline_seconds: Optional[float] = None
+        self.test_timeout: float = fixed_timeout or max_timeout or 120.0
+        self.cache = cache
+        self.cache_inputs = cache_inputs or []
+        self.source_lines: List[str] = []
+        self.source_digest = ''
         self.operators: List[MutationOperator] = [
             MemoryManagementMutationOperator(),
             ReferenceCountingMutationOperator(),
@@ -354,6 +1419,7 @@ class MutationTester:
             ArithmeticMutationOperator(),
             ConstantMutationOperator(),
         ]
+        self.scanner = MutationScanner(self.operators)
         self.results = []
 
     def load_source(self) -> str:
@@ -361,17 +1427,33 @@ class MutationTester:
         with open(self.source_file, 'r', encoding='utf-8') as f:
             return f.read()
 
+    def ignored_lines(self) -> set:
+        """Lines calling an ignored procedure (logging, console output)"""
+        if not self.ignore_calls:
+            return set()
+        return {
+            line_num for line_num, line in enumerate(self.source_lines, 1)
+            if any(p.search(split_comment(line)[0]) for p in self.ignore_calls)
+        }
+
     def generate_mutants(self) -> List[Dict]:
         """Generate all mutants"""
         source = self.load_source()
+        self.source_lines = source.split('\n')
+        self.source_digest = hashlib.sha256(source.encode()).hexdigest()
         mutants = []
         mutant_id = 1
-
-        for operator in self.operators:
-            operator_mutants = operator.apply(source)
-            for mutant_source, description, line_num in operator_mutants:
-                # Generate unique hash for mutant
-                mutant_hash = hashlib.md5(mutant_source.encode()).hexdigest()[:8]
+        ignored = self.ignored_lines()
+
+        sites = self.scanner.scan(source)
+        for operator, operator_mutants in zip(self.operators, sites):
+            for patch, description, line_num in operator_mutants:
+                if line_num in ignored:
+                    continue
+                # Generate unique hash for mutant (source + patch identify it)
+                mutant_hash = hashlib.md5(
+                    (self.source_digest + json.dumps(patch, sort_keys=True)).encode()
+                ).hexdigest()[:8]
 
                 mutants.append({
                     'id': mutant_id,
@@ -379,30 +1461,133 @@ class MutationTester:
                     'operator': operator.name,
                     'category': operator.category,
                     'priority': operator.priority,
+                    'operator_version': operator.version,
                     'description': description,
                     'line_number': line_num,
-                    'source': mutant_source,
+                    'patch': patch,
                 })
                 mutant_id += 1
 
         return mutants
 
-    def save_mutants(self, mutants: List[Dict]):
-        """Save mutants to disk"""
-        self.output_dir.mkdir(exist_ok=True)
+    def prune_reason(self, mutant: Dict, seen: Dict[Tuple, int]) -> Optional[str]:
+        """
+        Why a mutant need not be built, or None to keep it
 
+        Static checks on the mutated line only: changes inside comments or
+        string literals, no-op changes and exact duplicates of an earlier
+        mutant. Whether a mutant compiles is left to its build (or schema
+        build).
+        """
+        patch = mutant['patch']
+        original = self.source_lines[patch['line'] - 1]
+        code = split_comment(original)[0]
+
+        if patch['col_start'] >= len(code):
+            return 'in comment'
+        for literal in MutantSchema.LITERAL.finditer(code):
+            if literal.start() < patch['col_start'] and patch['col_end'] < literal.end():
+                return 'in string literal'
+
+        mutated = apply_patch([original], dict(patch, line=1))
+        mutated_code = split_comment(mutated)[0]
+        normalized = ' '.join(mutated_code.split())
+        if normalized == ' '.join(code.split()):
+            return 'equivalent'
+        key = (patch['line'], normalized)
+        if key in seen:
+            return f"duplicate of mutant {seen[key]}"
+        seen[key] = mutant['id']
+        return None
+
+    def prune_mutants(self, mutants: List[Dict]) -> List[Dict]:
+        """Drop duplicate and statically equivalent mutants"""
+        if not self.prune:
+            return mutants
+        seen: Dict[Tuple, int] = {}
+        kept = []
         for mutant in mutants:
-            mutant_file = self.output_dir / f"mutant_{mutant['id']:03d}_{mutant['hash']}.adb"
-            with open(mutant_file, 'w', encoding='utf-8') as f:
-                f.write(mutant['source'])
+            reason = self.prune_reason(mutant, seen)
+            if reason is None:
+                kept.append(mutant)
+            else:
+                mutant['pruned'] = reason
+                self.pruned.append(mutant)
+        if self.pruned:
+            reasons: Dict[str, int] = {}
+            for mutant in self.pruned:
+                reason = 'duplicate' if mutant['pruned'].startswith('duplicate') else mutant['pruned']
+                reasons[reason] = reasons.get(reason, 0) + 1
+            summary = ', '.join(f"{count} {reason}" for reason, count in sorted(reasons.items()))
+            print(f"      Pruned {len(self.pruned)} of {len(mutants)} mutants before building ({summary})")
+        return kept
+
+    @staticmethod
+    def _reuse_key(mutant: Dict, line: int) -> Tuple:
+        patch = mutant['patch']
+        return (mutant['operator'], line, patch['col_start'], patch['col_end'],
+                patch['replacement'])
+
+    def apply_diff_scope(self, mutants: List[Dict]) -> List[Dict]:
+        """
+        Keep mutants on changed lines; reuse previous verdicts for the rest
+
+        Previous results (from a full run at the diff base) are matched by
+        operator and patch after mapping their base line numbers through
+        the diff. Unchanged-line mutants without a previous verdict are
+        dropped.
+        """
+        if self.diff_scope is None:
+            return mutants
+
+        previous = {}
+        for entry in self.previous_results:
+            if 'status' not in entry or 'patch' not in entry:
+                continue
+            line = self.diff_scope.map_base_line(entry['patch']['line'])
+            if line is not None:
+                previous[self._reuse_key(entry, line)] = entry
+
+        scoped = []
+        reused = 0
+        for mutant in mutants:
+            if self.diff_scope.changed(mutant['line_number']):
+                scoped.append(mutant)
+                continue
+            entry = previous.get(self._reuse_key(mutant, mutant['line_number']))
+            if entry is not None:
+                mutant['status'] = entry['status']
+                if entry.get('killed_by'):
+                    mutant['killed_by'] = entry['killed_by']
+                mutant['reused'] = True
+                scoped.append(mutant)
+                reused += 1
+
+        print(f"      Diff scope: {len(scoped) - reused} of {len(mutants)} mutants on "
+              f"changed lines, {reused} verdicts reused from the previous run")
+        return scoped
+
+    def materialize_mutant(self, mutant: Dict) -> str:
+        """Build the full mutated source from the original and the patch"""
+        return apply_patch(self.source_lines, mutant['patch'])
+
+    def save_mutants(self, mutants: List[Dict]):
+        """
+        Save mutant metadata to disk
+
+        Each entry carries its patch, so the full mutated sources are only
+        ever materialized inside a build sandbox.
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
 
-        # Save mutant metadata
         metadata_file = self.output_dir / "mutants_metadata.json"
         with open(metadata_file, 'w', encoding='utf-8') as f:
-            json.dump([
-                {k: v for k, v in m.items() if k != 'source'}
-                for m in mutants
-            ], f, indent=2)
+            json.dump({
+                'source_file': str(self.source_file),
+                'source_sha256': self.source_digest,
+                'mutants': mutants,
+                'pruned': self.pruned,
+            }, f, indent=2)
 
     def compile_mutant(self, mutant_file: Path, build_dir: Path) -> Tuple[bool, str]:
         """
@@ -411,38 +1596,139 @@ class MutationTester:
         Returns: (success, error_message)
         """
         try:
-            result = subprocess.run(
-                ['gprbuild', '-Ptest_polyorb.gpr'],
-                cwd=build_dir,
-                capture_output=True,
-                text=True,
-                timeout=60
+            returncode, _, stderr = run_process(
+                ['gprbuild', '-Ptest_polyorb.gpr'], build_dir, COMPILE_TIMEOUT
             )
-            return result.returncode == 0, result.stderr
-        except subprocess.TimeoutExpired:
-            return False, "Compilation timeout"
+            if returncode is None:
+                return False, "Compilation timeout"
+            return returncode == 0, stderr
         except Exception as e:
             return False, str(e)
 
-    def run_tests(self, build_dir: Path) -> Tuple[bool, str]:
+    def run_tests(self, build_dir: Path, tests: List[str] = None,
+                  timeout: float = None, first_tests: List[str] = None,
+                  env: Dict[str, str] = None) -> Tuple[str, str, Optional[str]]:
         """
-        Run test suite
+        Run test suite, or only the named tests, within one time budget
+
+        Each selected test is run as `./test_runner <name>` (an AUnit name
+        filter), stopping at the first failure. first_tests (likely killers)
+        are tried before the rest. The budget covers all invocations
+        together; it defaults to the calibrated test timeout. In fail-fast
+        mode the runner output is streamed and the run is stopped at the
+        first AUnit FAIL/ERROR line. env replaces the runner environment
+        (used to select the active mutant of a schema build).
 
-        Returns: (all_passed, output)
+        Returns: ('PASSED' | 'FAILED' | 'TIMEOUT', output, failed_test)
         """
-        try:
-            result = subprocess.run(
-                ['./test_runner'],
-                cwd=build_dir,
-                capture_output=True,
-                text=True,
-                timeout=120
-            )
-            return result.returncode == 0, result.stdout
-        except subprocess.TimeoutExpired:
-            return False, "Test timeout"
-        except Exception as e:
-            return False, str(e)
+        budget = timeout if timeout is not None else self.test_timeout
+        deadline = time.monotonic() + budget
+        first_tests = first_tests or []
+
+        if tests:
+            ordered = [t for t in first_tests if t in tests]
+            ordered += [t for t in tests if t not in ordered]
+            commands = [['./test_runner', test] for test in ordered]
+        else:
+            commands = [['./test_runner', test] for test in first_tests]
+            commands.append(['./test_runner'])
+
+        output = []
+        for command in commands:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return 'TIMEOUT', '\n'.join(output), None
+            try:
+                if self.fail_fast:
+                    returncode, stdout, failure = stream_process(
+                        command, build_dir, remaining, AUNIT_FAILURE, env
+                    )
+                else:
+                    returncode, stdout, _ = run_process(command, build_dir, remaining, env)
+                    failure = next(filter(None, map(AUNIT_FAILURE.match, stdout.splitlines())), None)
+            except Exception as e:
+                return 'FAILED', str(e), None
+            output.append(stdout)
+            if failure is not None:
+                return 'FAILED', '\n'.join(output), failure.group(1)
+            if returncode is None:
+                return 'TIMEOUT', '\n'.join(output), None
+            if returncode != 0:
+                return 'FAILED', '\n'.join(output), command[1] if len(command) > 1 else None
+
+        return 'PASSED', '\n'.join(output), None
+
+    def calibrate_timeout(self, build_dir: Path):
+        """
+        Time the unmutated suite and derive the per-mutant test budget
+
+        A mutant that runs longer than TIMEOUT_FACTOR x baseline + slack is
+        almost certainly looping, so it is killed as TIMEOUT instead of
+        burning a fixed two minutes. max_timeout caps the calibrated
+        budget; only fixed_timeout skips calibration.
+        """
+        if self.fixed_timeout is not None:
+            self.test_timeout = self.fixed_timeout
+            print(f"      Test budget: {self.test_timeout:.1f}s per mutant (fixed)")
+            return
+
+        compiled, error = self.compile_mutant(build_dir / self.build_relpath, build_dir)
+        if not compiled:
+            print(f"      Warning: unmutated build failed: {error.strip()[:200]}")
+
+        start = time.monotonic()
+        status, _, failed_test = self.run_tests(build_dir, timeout=BASELINE_TIMEOUT)
+        self.baseline_seconds = time.monotonic() - start
+
+        if status != 'PASSED':
+            print(f"      Warning: unmutated test suite {status} "
+                  f"{failed_test or ''} - verdicts will not be meaningful")
+
+        self.test_timeout = self.timeout_factor * self.baseline_seconds + self.timeout_slack
+        capped = self.max_timeout is not None and self.test_timeout > self.max_timeout
+        if capped:
+            self.test_timeout = self.max_timeout
+        print(f"      Baseline suite runtime {self.baseline_seconds:.1f}s, "
+              f"test budget {self.test_timeout:.1f}s per mutant"
+              f"{' (capped by TIMEOUT_PER_MUTANT)' if capped else ''}")
+
+    def select_tests(self, mutant: Dict) -> Optional[List[str]]:
+        """
+        Tests covering the mutant's line, or None to run the whole suite
+
+        Records the number of covering tests on the mutant; an empty list
+        means no test executes the line.
+        """
+        if self.coverage is None:
+            return None
+        tests = self.coverage.tests_for(self.build_relpath, mutant['line_number'])
+        mutant['covering_tests'] = len(tests)
+        return tests
+
+    def execute_tests(self, mutant: Dict, build_dir: Path, tests: Optional[List[str]],
+                      env: Dict[str, str] = None) -> str:
+        """
+        Run the tests against an already built mutant and map the verdict
+
+        Returns: 'KILLED', 'SURVIVED', 'TIMEOUT'
+        """
+        # Test, trying the tests that killed nearby mutants before first
+        first_tests = []
+        if self.killers is not None:
+            first_tests = self.killers.suggest(self.build_relpath, mutant['line_number'])
+        test_status, test_output, failed_test = self.run_tests(
+            build_dir, tests, first_tests=first_tests, env=env
+        )
+        if failed_test:
+            mutant['killed_by'] = failed_test
+            if self.killers is not None:
+                self.killers.record(self.build_relpath, mutant['line_number'], failed_test)
+
+        return {
+            'PASSED': 'SURVIVED',
+            'FAILED': 'KILLED',
+            'TIMEOUT': 'TIMEOUT',
+        }[test_status]
 
     def test_mutant(self, mutant: Dict, build_dir: Path) -> str:
         """
@@ -450,57 +1736,323 @@ class MutationTester:
 
         Returns: 'KILLED', 'SURVIVED', 'COMPILE_ERROR', 'TIMEOUT'
         """
-        # Copy mutant to source location
-        mutant_file = self.output_dir / f"mutant_{mutant['id']:03d}_{mutant['hash']}.adb"
-        original_source = build_dir / self.source_file.name
-        backup_source = build_dir / f"{self.source_file.name}.backup"
+        tests = self.select_tests(mutant)
+        if tests == []:
+            # No test executes the line: nothing can kill the mutant
+            return 'SURVIVED'
+
+        original_source = build_dir / self.build_relpath
+        backup_source = build_dir / f"{self.build_relpath}.backup"
 
         try:
             # Backup original
             if original_source.exists():
-                import shutil
                 shutil.copy2(original_source, backup_source)
 
-            # Copy mutant
-            import shutil
-            shutil.copy2(mutant_file, original_source)
+            # Materialize mutant in place of the original
+            with open(original_source, 'w', encoding='utf-8') as f:
+                f.write(self.materialize_mutant(mutant))
 
             # Compile
-            compile_success, compile_error = self.compile_mutant(mutant_file, build_dir)
+            compile_success, compile_error = self.compile_mutant(original_source, build_dir)
             if not compile_success:
                 return 'COMPILE_ERROR'
 
-            # Test
-            tests_passed, test_output = self.run_tests(build_dir)
-
-            return 'SURVIVED' if tests_passed else 'KILLED'
+            return self.execute_tests(mutant, build_dir, tests)
 
         finally:
             # Restore original
             if backup_source.exists():
-                import shutil
                 shutil.copy2(backup_source, original_source)
                 backup_source.unlink()
 
-    def run_mutation_testing(self, build_dir: str = None, max_mutants: int = None):
+    def test_schema_mutant(self, mutant: Dict, build_dir: Path) -> str:
+        """
+        Test a mutant of a schema build: no compile, only a test run with
+        the mutant switched on
+
+        Returns: 'KILLED', 'SURVIVED', 'TIMEOUT'
+        """
+        mutant['schema'] = True
+        tests = self.select_tests(mutant)
+        if tests == []:
+            return 'SURVIVED'
+        env = dict(os.environ, **{SCHEMA_ENV_VAR: str(mutant['id'])})
+        return self.execute_tests(mutant, build_dir, tests, env)
+
+    def test_mutants_schema(self, mutants: List[Dict], build_dir: Path, jobs: int,
+                            on_result=None) -> List[Dict]:
+        """
+        Build all switchable mutants into one binary and test them from it
+
+        The schema is built once in its own sandbox; each mutant then costs
+        only a test run. If the schema does not compile, every mutant falls
+        back to a per-mutant build.
+
+        Returns: the mutants that still need per-mutant builds
+        """
+        schema = MutantSchema(self.source_lines)
+        source, schema_mutants = schema.build(mutants)
+        if not schema_mutants:
+            return mutants
+
+        print(f"      Building mutant schema with {len(schema_mutants)} of "
+              f"{len(mutants)} mutants...")
+        schema_dir = self.create_sandbox(build_dir, 'schema')
+        try:
+            schema_source = schema_dir / self.build_relpath
+            schema_source.write_text(source, encoding='utf-8')
+            MutantSchema.write_package(schema_source.parent)
+            compiled, error = self.compile_mutant(schema_source, schema_dir)
+            if not compiled:
+                print(f"      Warning: mutant schema build failed, falling back to "
+                      f"per-mutant builds: {error.strip()[:200]}")
+                return mutants
+
+            self.test_mutants_on(schema_mutants, schema_dir, jobs,
+                                 self.test_schema_mutant, on_result)
+        finally:
+            shutil.rmtree(schema_dir, ignore_errors=True)
+
+        switched = {m['id'] for m in schema_mutants}
+        return [m for m in mutants if m['id'] not in switched]
+
+    def create_sandbox(self, build_dir: Path, index) -> Path:
+        """
+        Create an isolated copy of the build directory for one worker
+
+        Sandboxes are siblings of build_dir so relative paths in the project
+        file still resolve. Files are cloned with copy-on-write reflinks where
+        the filesystem supports it, falling back to a plain copy. Hardlinks are
+        not used because gprbuild rewrites object files in place.
+        """
+        sandbox = build_dir.parent / f"{build_dir.name}.sandbox-{index}"
+        if sandbox.exists():
+            shutil.rmtree(sandbox)
+
+        try:
+            subprocess.run(
+                ['cp', '-a', '--reflink=auto', str(build_dir), str(sandbox)],
+                check=True,
+                capture_output=True
+            )
+        except (OSError, subprocess.CalledProcessError):
+            if sandbox.exists():
+                shutil.rmtree(sandbox)
+            shutil.copytree(build_dir, sandbox, symlinks=True)
+
+        return sandbox
+
+    def test_mutants_parallel(self, mutants: List[Dict], build_dir: Path, jobs: int,
+                              on_result=None, test_fn=None):
+        """
+        Test mutants on a pool of workers, each owning a private sandbox
+
+        Mutants are handed to whichever worker is free, so a slow build on
+        one sandbox never blocks the others. Results are reported as they
+        complete; on_result is called for each finished mutant. test_fn
+        tests one mutant in a sandbox (default: test_mutant).
+        """
+        test_fn = test_fn or self.test_mutant
+        jobs = max(1, min(jobs, len(mutants)))
+        print(f"      Preparing {jobs} build sandboxes...")
+        sandboxes = [self.create_sandbox(build_dir, i) for i in range(jobs)]
+        free_sandboxes: "queue.Queue[Path]" = queue.Queue()
+        for sandbox in sandboxes:
+            free_sandboxes.put(sandbox)
+
+        def run_one(mutant: Dict) -> str:
+            sandbox = free_sandboxes.get()
+            start = time.monotonic()
+            try:
+                return test_fn(mutant, sandbox)
+            finally:
+                mutant['seconds'] = round(time.monotonic() - start, 3)
+                free_sandboxes.put(sandbox)
+
+        # At most one mutant per worker is in flight, so the run stops taking
+        # work as soon as the time budget runs out and keeps the given order
+        remaining = iter(mutants)
+        running = {}
+
+        def submit_next(executor: ThreadPoolExecutor):
+            if self.budget_exhausted():
+                return
+            mutant = next(remaining, None)
+            if mutant is not None:
+                running[executor.submit(run_one, mutant)] = mutant
+
+        try:
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                for _ in range(jobs):
+                    submit_next(executor)
+                while running:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        mutant = running.pop(future)
+                        mutant['status'] = future.result()
+                        self.print_mutant_result(mutant)
+                        if on_result:
+                            on_result(mutant)
+                        submit_next(executor)
+        finally:
+            for sandbox in sandboxes:
+                shutil.rmtree(sandbox, ignore_errors=True)
+
+    def restore_build_dir(self, build_dir: Path):
+        """Undo the in-place mutation left behind by a run killed mid-mutant"""
+        backup_source = build_dir / f"{self.build_relpath}.backup"
+        if backup_source.exists():
+            print(f"Restoring {self.build_relpath} left mutated by an interrupted run")
+            shutil.copy2(backup_source, build_dir / self.build_relpath)
+            backup_source.unlink()
+
+    def budget_exhausted(self) -> bool:
+        """True once the scheduler's time budget has run out"""
+        return self.scheduler is not None and self.scheduler.expired()
+
+    def test_mutants_on(self, mutants: List[Dict], build_dir: Path, jobs: int,
+                        test_fn, on_result=None):
+        """Test mutants with test_fn, serially in build_dir or on sandboxes"""
+        if jobs > 1 and mutants:
+            self.test_mutants_parallel(mutants, build_dir, jobs, on_result, test_fn)
+        else:
+            for mutant in mutants:
+                if self.budget_exhausted():
+                    break
+                start = time.monotonic()
+                mutant['status'] = test_fn(mutant, build_dir)
+                mutant['seconds'] = round(time.monotonic() - start, 3)
+                self.print_mutant_result(mutant)
+                if on_result:
+                    on_result(mutant)
+
+        not_run = sum(1 for m in mutants if 'status' not in m)
+        if not_run:
+            print(f"      Time budget exhausted: {not_run} mutants not run")
+
+    def prepare_mutants(self, mutants: List[Dict], build_dir: Path) -> List[Dict]:
+        """
+        Open the run journal and restore journaled and cached verdicts
+
+        Returns: the mutants that still have to be tested
+        """
+        self.journal = RunJournal(self.output_dir / "journal.jsonl", self.resume)
+        # Verdicts reused through the diff scope are already decided
+        pending = [m for m in mutants if 'status' not in m]
+        decided = len(mutants) - len(pending)
+
+        if self.resume:
+            pending = [m for m in pending if not self.journal.restore(m)]
+            print(f"      Resuming: {len(mutants) - decided - len(pending)} verdicts "
+                  f"from {self.journal.path}")
+
+        if self.cache is not None:
+            fingerprint = hashlib.sha256((self.source_digest + MutationCache.fingerprint_inputs(
+                build_dir, self.build_relpath, self.cache_inputs
+            )).encode()).hexdigest()
+            uncached = []
+            for mutant in pending:
+                self.cache_keys[mutant['id']] = MutationCache.key(
+                    mutant, fingerprint, self.select_tests(mutant))
+                status = self.cache.get(self.cache_keys[mutant['id']])
+                if status is None:
+                    uncached.append(mutant)
+                else:
+                    mutant['status'] = status
+                    mutant['cached'] = True
+                    self.journal.append(mutant)
+
+            print(f"      Reusing {len(pending) - len(uncached)} cached verdicts, "
+                  f"executing {len(uncached)} mutants")
+            pending = uncached
+
+        if self.results_db is not None:
+            for mutant in mutants:
+                if mutant.get('cached') or mutant.get('resumed') or mutant.get('reused'):
+                    self.results_db.record_verdict(self.run_id, str(self.source_file), mutant)
+
+        return pending
+
+    def record_result(self, mutant: Dict):
+        """Persist a fresh verdict to the cache, results database and journal"""
+        if self.cache is not None:
+            self.cache.put(self.cache_keys[mutant['id']], mutant)
+        if self.results_db is not None:
+            self.results_db.record_verdict(self.run_id, str(self.source_file), mutant)
+        self.journal.append(mutant)
+
+    def finish_mutants(self, mutants: List[Dict]):
+        """Close the journal, save cache and killer history, collect results"""
+        if self.journal is not None:
+            self.journal.close()
+        if self.cache is not None:
+            self.cache.save()
+        if self.killers is not None:
+            self.killers.save()
+
+        self.results.extend(m for m in mutants if 'status' in m)
+        self.results.sort(key=lambda m: m['id'])
+
+    def test_mutants(self, mutants: List[Dict], build_dir: Path, jobs: int = 1):
+        """
+        Test mutants, reusing journaled and cached verdicts where possible
+
+        Every verdict is appended to the run journal as it arrives. Results
+        are stored in mutant id order regardless of how (or whether) each
+        mutant was executed.
+        """
+        try:
+            pending = self.prepare_mutants(mutants, build_dir)
+            if pending:
+                self.calibrate_timeout(build_dir)
+            if self.schemata and pending:
+                pending = self.test_mutants_schema(pending, build_dir, jobs,
+                                                   on_result=self.record_result)
+            self.test_mutants_on(pending, build_dir, jobs, self.test_mutant,
+                                 on_result=self.record_result)
+        finally:
+            self.finish_mutants(mutants)
+
+    def print_mutant_result(self, mutant: Dict):
+        """Print a one-line verdict for a tested mutant"""
+        status = mutant['status']
+        symbol = {
+            'KILLED': '✓',
+            'SURVIVED': '✗',
+            'COMPILE_ERROR': '⚠',
+            'TIMEOUT': '⏱'
+        }[status]
+
+        killed_by = f" (by {mutant['killed_by']})" if mutant.get('killed_by') else ''
+        location = f"{mutant['source_file']} " if mutant.get('source_file') else ''
+        print(f"      Mutant {mutant['id']:3d} [{mutant['category']:12s}] {symbol} {status:15s} - {location}{mutant['description']}{killed_by}")
+
+    def run_mutation_testing(self, build_dir: str = None, max_mutants: int = None,
+                             jobs: int = 1):
         """Run full mutation testing"""
         print("=" * 80)
         print("Ada Mutation Testing for PolyORB")
         print("=" * 80)
 
+        if build_dir:
+            self.restore_build_dir(Path(build_dir).resolve())
+
         # Generate mutants
         print(f"\n[1/4] Generating mutants from {self.source_file}...")
-        mutants = self.generate_mutants()
+        mutants = self.apply_diff_scope(self.prune_mutants(self.generate_mutants()))
 
         if max_mutants:
             mutants = mutants[:max_mutants]
+        if self.scheduler is not None:
+            mutants = self.scheduler.plan(mutants)
 
         print(f"      Generated {len(mutants)} mutants")
 
         # Save mutants
         print(f"\n[2/4] Saving mutants to {self.output_dir}...")
         self.save_mutants(mutants)
-        print(f"      Saved {len(mutants)} mutant files")
+        print(f"      Saved {len(mutants)} mutant patches")
 
         # Summary by category
         print("\n[3/4] Mutant Distribution:")
@@ -515,21 +2067,21 @@ class MutationTester:
         # Testing (if build directory provided)
         if build_dir:
             print(f"\n[4/4] Testing mutants against test suite...")
-            build_path = Path(build_dir)
-
-            for mutant in mutants:
-                status = self.test_mutant(mutant, build_path)
-                mutant['status'] = status
-                self.results.append(mutant)
-
-                symbol = {
-                    'KILLED': '✓',
-                    'SURVIVED': '✗',
-                    'COMPILE_ERROR': '⚠',
-                    'TIMEOUT': '⏱'
-                }[status]
-
-                print(f"      Mutant {mutant['id']:3d} [{mutant['category']:12s}] {symbol} {status:15s} - {mutant['description']}")
+            build_path = Path(build_dir).resolve()
+
+            run_status = 'aborted'
+            if self.results_db is not None:
+                self.run_id = self.results_db.start_run(' '.join(sys.argv))
+                self.results_db.record_mutants(str(self.source_file), mutants)
+                print(f"      Streaming verdicts to {self.results_db.path} (run {self.run_id})")
+            if self.scheduler is not None:
+                self.scheduler.start()
+            try:
+                self.test_mutants(mutants, build_path, jobs)
+                run_status = 'completed'
+            finally:
+                if self.results_db is not None:
+                    self.results_db.finish_run(self.run_id, run_status)
 
             self.print_summary()
         else:
@@ -556,8 +2108,26 @@ class MutationTester:
         print(f"Survived:            {survived:3d} ({survived/len(self.results)*100:.1f}%) ⚠️")
         print(f"Compile Errors:      {compile_errors:3d}")
         print(f"Timeouts:            {timeouts:3d}")
+        if self.pruned:
+            print(f"Pruned:              {len(self.pruned):3d} (not built: duplicate, equivalent or invalid)")
+        if self.cache is not None:
+            print(f"Cached Verdicts:     {self.cache.hits:3d}")
+        if self.schemata:
+            schema_tested = sum(1 for r in self.results if r.get('schema'))
+            print(f"Schema Mutants:      {schema_tested:3d} (tested without a rebuild)")
+        if self.diff_scope is not None:
+            reused = sum(1 for r in self.results if r.get('reused'))
+            print(f"Reused Verdicts:     {reused:3d} (unchanged lines)")
+        if self.resume:
+            resumed = sum(1 for r in self.results if r.get('resumed'))
+            print(f"Resumed Verdicts:    {resumed:3d}")
+        if self.coverage is not None:
+            uncovered = sum(1 for r in self.results if r.get('covering_tests') == 0)
+            print(f"Not Covered:         {uncovered:3d} (survived without a build)")
         print(f"\n{'='*80}")
         print(f"MUTATION SCORE:      {mutation_score:.1f}% ({killed}/{total_valid})")
+        if self.scheduler is not None:
+            self.scheduler.print_estimate(self.results, self.output_dir)
         print(f"{'='*80}\n")
 
         # Surviving mutants
@@ -576,6 +2146,209 @@ class MutationTester:
         print(f"\nDetailed report saved to: {report_file}")
 
 
+def load_config(path: str) -> Dict:
+    """Load a mutmut-style Python config (configs/mutmut_config.py) as a dict"""
+    spec = importlib.util.spec_from_file_location('mutmut_config', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return {name: value for name, value in vars(module).items() if name.isupper()}
+
+
+def expand_paths(root: Path, patterns: List[str], exclude_patterns: List[str]) -> List[Path]:
+    """
+    Expand PATHS_TO_MUTATE globs under root and drop EXCLUDE_PATTERNS matches
+
+    Exclude patterns are matched against the path relative to root, so
+    "**/tests/**" also excludes a top-level tests/ directory.
+    """
+    files = set()
+    for pattern in patterns:
+        files.update(p for p in root.glob(pattern) if p.is_file())
+
+    def excluded(path: Path) -> bool:
+        relative = path.relative_to(root).as_posix()
+        return any(fnmatch.fnmatchcase(relative, pattern) or
+                   fnmatch.fnmatchcase('/' + relative, pattern)
+                   for pattern in exclude_patterns)
+
+    return sorted(p for p in files if not excluded(p))
+
+
+class MutationSuite:
+    """
+    Mutation testing of many source files on one shared worker pool
+
+    Each file keeps its own MutationTester (journal, cache keys, schema
+    build, output under <output>/<relative path>), but the per-mutant builds
+    of all files are scheduled together, so no worker idles while another
+    file still has mutants queued.
+    """
+
+    def __init__(self, testers: List[MutationTester], output_dir: str = "mutants",
+                 results_db: MutationResultsDB = None, scheduler: MutantScheduler = None):
+        self.testers = testers
+        self.output_dir = Path(output_dir)
+        self.results_db = results_db
+        self.scheduler = scheduler
+        # Position of each mutant (by id()) in the scheduler's order
+        self.order: Dict[int, int] = {}
+        self.results: List[Dict] = []
+
+    def run_mutation_testing(self, build_dir: str = None, max_mutants: int = None,
+                             jobs: int = 1):
+        """Run mutation testing over all files"""
+        print("=" * 80)
+        print(f"Ada Mutation Testing for PolyORB ({len(self.testers)} files)")
+        print("=" * 80)
+
+        build_path = Path(build_dir).resolve() if build_dir else None
+
+        print(f"\n[1/4] Generating mutants...")
+        file_mutants: List[Tuple[MutationTester, List[Dict]]] = []
+        for tester in self.testers:
+            if build_path:
+                tester.restore_build_dir(build_path)
+            mutants = tester.apply_diff_scope(tester.prune_mutants(tester.generate_mutants()))
+            if max_mutants:
+                mutants = mutants[:max_mutants]
+            for mutant in mutants:
+                mutant['source_file'] = tester.build_relpath
+            file_mutants.append((tester, mutants))
+            print(f"      {len(mutants):4d} mutants  {tester.source_file}")
+        if self.scheduler is not None:
+            # Strata and sampling span all files, then the plan is split back
+            planned = self.scheduler.plan([m for _, mutants in file_mutants for m in mutants])
+            self.order = {id(mutant): index for index, mutant in enumerate(planned)}
+            file_mutants = [(tester, sorted((m for m in mutants if id(m) in self.order),
+                                            key=lambda m: self.order[id(m)]))
+                            for tester, mutants in file_mutants]
+        total = sum(len(mutants) for _, mutants in file_mutants)
+        print(f"      Generated {total} mutants")
+
+        print(f"\n[2/4] Saving mutants to {self.output_dir}...")
+        for tester, mutants in file_mutants:
+            tester.save_mutants(mutants)
+        print(f"      Saved {total} mutant patches")
+
+        print("\n[3/4] Mutant Distribution:")
+        category_counts = {}
+        for _, mutants in file_mutants:
+            for mutant in mutants:
+                cat = mutant['category']
+                category_counts[cat] = category_counts.get(cat, 0) + 1
+        for category, count in sorted(category_counts.items()):
+            print(f"      {category:20s}: {count:3d} mutants")
+
+        if not build_path:
+            print(f"\n[4/4] Skipping testing (no build directory provided)")
+            return
+
+        print(f"\n[4/4] Testing mutants against test suite...")
+        run_status = 'aborted'
+        if self.results_db is not None:
+            run_id = self.results_db.start_run(' '.join(sys.argv))
+            for tester, mutants in file_mutants:
+                tester.run_id = run_id
+                self.results_db.record_mutants(str(tester.source_file), mutants)
+            print(f"      Streaming verdicts to {self.results_db.path} (run {run_id})")
+
+        if self.scheduler is not None:
+            self.scheduler.start()
+        try:
+            self.test_mutants(file_mutants, build_path, jobs)
+            run_status = 'completed'
+        finally:
+            for tester, mutants in file_mutants:
+                tester.finish_mutants(mutants)
+            if self.results_db is not None:
+                self.results_db.finish_run(run_id, run_status)
+
+        self.results = [r for tester in self.testers for r in tester.results]
+        self.print_summary()
+
+    def test_mutants(self, file_mutants: List[Tuple[MutationTester, List[Dict]]],
+                     build_dir: Path, jobs: int):
+        """Test the pending mutants of all files on one pool of sandboxes"""
+        pending = [(tester, tester.prepare_mutants(mutants, build_dir))
+                   for tester, mutants in file_mutants]
+        if not any(mutants for _, mutants in pending):
+            return
+
+        # One baseline serves every file: they share the build and test suite
+        first = self.testers[0]
+        first.calibrate_timeout(build_dir)
+        for tester in self.testers[1:]:
+            tester.baseline_seconds = first.baseline_seconds
+            tester.test_timeout = first.test_timeout
+
+        owners: Dict[int, MutationTester] = {}
+        queued: List[Dict] = []
+        for tester, mutants in pending:
+            if tester.schemata and mutants:
+                mutants = tester.test_mutants_schema(mutants, build_dir, jobs,
+                                                     on_result=tester.record_result)
+            for mutant in mutants:
+                owners[id(mutant)] = tester
+            queued.extend(mutants)
+        if self.order:
+            queued.sort(key=lambda mutant: self.order[id(mutant)])
+
+        first.test_mutants_on(
+            queued, build_dir, jobs,
+            lambda mutant, sandbox: owners[id(mutant)].test_mutant(mutant, sandbox),
+            on_result=lambda mutant: owners[id(mutant)].record_result(mutant)
+        )
+
+    def print_summary(self):
+        """Print per-file scores and the overall mutation score"""
+        if not self.results:
+            return
+
+        print("\n" + "=" * 80)
+        print("MUTATION TESTING SUMMARY")
+        print("=" * 80)
+        for tester in self.testers:
+            killed = sum(1 for r in tester.results if r['status'] == 'KILLED')
+            valid = killed + sum(1 for r in tester.results if r['status'] == 'SURVIVED')
+            score = f"{killed / valid * 100:5.1f}%" if valid else "  n/a "
+            print(f"{score} ({killed:3d}/{valid:3d})  {tester.build_relpath}")
+
+        killed = sum(1 for r in self.results if r['status'] == 'KILLED')
+        survived = sum(1 for r in self.results if r['status'] == 'SURVIVED')
+        compile_errors = sum(1 for r in self.results if r['status'] == 'COMPILE_ERROR')
+        timeouts = sum(1 for r in self.results if r['status'] == 'TIMEOUT')
+        total_valid = killed + survived
+        mutation_score = (killed / total_valid * 100) if total_valid > 0 else 0
+
+        print(f"\nTotal Mutants:       {len(self.results)}")
+        print(f"Killed:              {killed:3d} ({killed/len(self.results)*100:.1f}%)")
+        print(f"Survived:            {survived:3d} ({survived/len(self.results)*100:.1f}%) ⚠️")
+        print(f"Compile Errors:      {compile_errors:3d}")
+        print(f"Timeouts:            {timeouts:3d}")
+        pruned = sum(len(tester.pruned) for tester in self.testers)
+        if pruned:
+            print(f"Pruned:              {pruned:3d} (not built: duplicate, equivalent or invalid)")
+        print(f"\n{'='*80}")
+        print(f"MUTATION SCORE:      {mutation_score:.1f}% ({killed}/{total_valid})")
+        if self.scheduler is not None:
+            self.scheduler.print_estimate(self.results, self.output_dir)
+        print(f"{'='*80}\n")
+
+        surviving = [r for r in self.results if r['status'] == 'SURVIVED']
+        if surviving:
+            print("\n⚠️  SURVIVING MUTANTS (Test Quality Gaps):")
+            for mutant in surviving:
+                print(f"   {mutant['source_file']} Mutant {mutant['id']:3d}: {mutant['description']}")
+                print(f"              Category: {mutant['category']}, Priority: {mutant['priority']}")
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        report_file = self.output_dir / "mutation_report.json"
+        with open(report_file, 'w', encoding='utf-8') as f:
+            json.dump(self.results, f, indent=2, default=str)
+
+        print(f"\nDetailed report saved to: {report_file}")
+
+
 def main():
     """Main entry point"""
     import argparse
@@ -584,8 +2357,23 @@ def main():
         description='Ada Mutation Testing for PolyORB'
     )
     parser.add_argument(
-        'source_file',
-        help='Ada source file to mutate'
+        'source_files',
+        nargs='*',
+        metavar='source_file',
+        help='Ada source files to mutate (default: PATHS_TO_MUTATE from --config)'
+    )
+    parser.add_argument(
+        '--config',
+        metavar='FILE',
+        help='mutmut-style config (e.g. configs/mutmut_config.py) supplying '
+             'PATHS_TO_MUTATE, EXCLUDE_PATTERNS, IGNORE_PROCEDURES, a cap on the '
+             'calibrated test budget and defaults for --jobs, --cache-dir and --db'
+    )
+    parser.add_argument(
+        '--root',
+        default='.',
+        help='Source tree root for PATHS_TO_MUTATE globs; the build directory '
+             'mirrors its layout (default: .)'
     )
     parser.add_argument(
         '-o', '--output',
@@ -601,17 +2389,245 @@ def main():
         type=int,
         help='Maximum number of mutants to generate (optional)'
     )
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        help='Number of mutants to build and test in parallel, each in its '
+             'own sandbox copy of the build directory (default: 1, or '
+             'PARALLEL_WORKERS from --config)'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        help=f'Incremental verdict cache directory (default: {DEFAULT_CACHE_DIR}, '
+             f'or CACHE_DIR from --config)'
+    )
+    parser.add_argument(
+        '--cache-inputs',
+        nargs='+',
+        default=[],
+        metavar='PATH',
+        help='Extra files or directories (e.g. test sources outside the build '
+             'directory) whose changes must invalidate cached verdicts'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Ignore and do not update the verdict cache or killer history'
+    )
+    parser.add_argument(
+        '--timeout-factor',
+        type=float,
+        default=DEFAULT_TIMEOUT_FACTOR,
+        help='Per-mutant test budget as a multiple of the unmutated suite '
+             f'runtime (default: {DEFAULT_TIMEOUT_FACTOR})'
+    )
+    parser.add_argument(
+        '--timeout-slack',
+        type=float,
+        default=DEFAULT_TIMEOUT_SLACK,
+        help=f'Seconds added to the per-mutant test budget (default: {DEFAULT_TIMEOUT_SLACK})'
+    )
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        help='Fixed per-mutant test budget in seconds (skips baseline calibration; '
+             'TIMEOUT_PER_MUTANT from --config only caps the calibrated budget)'
+    )
+    parser.add_argument(
+        '--fail-fast',
+        action='store_true',
+        help='Stream test runner output and stop at the first AUnit failure'
+    )
+    parser.add_argument(
+        '--schemata',
+        action='store_true',
+        help=f'Compile all switchable mutants into one build selected at run '
+             f'time by ${SCHEMA_ENV_VAR}; the rest use per-mutant builds'
+    )
+    parser.add_argument(
+        '--no-prune',
+        action='store_true',
+        help='Build and test duplicate and statically equivalent/invalid mutants too'
+    )
+    parser.add_argument(
+        '--time-budget',
+        type=float,
+        metavar='SECONDS',
+        help='Stop starting new mutants after this many seconds of testing; '
+             'the score is then estimated from the stratified prefix that ran'
+    )
+    parser.add_argument(
+        '--sample',
+        type=float,
+        metavar='N',
+        help='Run a stratified random sample of N mutants (a fraction if below 1) '
+             'and report the estimated score with a confidence interval'
+    )
+    parser.add_argument(
+        '--strata',
+        choices=MutantScheduler.STRATA,
+        default='operator',
+        help='Stratify --sample / --time-budget runs by operator, category or '
+             'file (default: operator)'
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=0,
+        help='Random seed for --sample / --time-budget ordering (default: 0)'
+    )
+    parser.add_argument(
+        '--diff-base',
+        metavar='REV',
+        help='Mutate only lines changed since REV (git diff against the working '
+             'tree); other verdicts are reused from --previous-report'
+    )
+    parser.add_argument(
+        '--diff-context',
+        type=int,
+        default=0,
+        metavar='N',
+        help='With --diff-base, also mutate N lines around each change (default: 0)'
+    )
+    parser.add_argument(
+        '--previous-report',
+        metavar='FILE',
+        help='mutation_report.json of a full run at the diff base '
+             '(default: <output>/mutation_report.json)'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Continue an interrupted run: reuse the verdicts in '
+             '<output>/journal.jsonl and test only the remaining mutants'
+    )
+    parser.add_argument(
+        '--db',
+        help=f'SQLite results database; verdicts are streamed into it as '
+             f'mutants finish (default: {DEFAULT_DB_PATH}, or OUTPUT_SQLITE '
+             f'from --config)'
+    )
+    parser.add_argument(
+        '--no-db',
+        action='store_true',
+        help='Do not record results in the SQLite database'
+    )
+    parser.add_argument(
+        '--coverage',
+        metavar='PATH',
+        help='Per-test gcov directory (or saved JSON index); each mutant then '
+             'runs only the tests covering its line'
+    )
+    parser.add_argument(
+        '--save-coverage-index',
+        metavar='FILE',
+        help='Save the parsed coverage as a JSON index for faster reloads'
+    )
 
     args = parser.parse_args()
 
-    # Check source file exists
-    if not Path(args.source_file).exists():
-        print(f"Error: Source file not found: {args.source_file}")
-        sys.exit(1)
+    config = load_config(args.config) if args.config else {}
+    root = Path(args.root)
+    if args.source_files:
+        source_files = [Path(p) for p in args.source_files]
+    elif config.get('PATHS_TO_MUTATE'):
+        source_files = expand_paths(root, config['PATHS_TO_MUTATE'],
+                                    config.get('EXCLUDE_PATTERNS', []))
+        if not source_files:
+            print(f"Error: PATHS_TO_MUTATE matched no files under {root}")
+            sys.exit(1)
+    else:
+        parser.error('give source files or a --config with PATHS_TO_MUTATE')
+
+    jobs = args.jobs or config.get('PARALLEL_WORKERS', 1)
+    max_timeout = config.get('TIMEOUT_PER_MUTANT')
+    cache_dir = args.cache_dir or config.get('CACHE_DIR', DEFAULT_CACHE_DIR)
+    db_path = args.db or config.get('OUTPUT_SQLITE', DEFAULT_DB_PATH)
+
+    # Check source files exist
+    for source_file in source_files:
+        if not source_file.exists():
+            print(f"Error: Source file not found: {source_file}")
+            sys.exit(1)
+
+    cache = None if args.no_cache else MutationCache(cache_dir)
+    killers = None if args.no_cache else KillerHistory(cache_dir)
+
+    results_db = None
+    if args.build_dir and not args.no_db:
+        results_db = MutationResultsDB(db_path)
+
+    coverage = None
+    if args.coverage:
+        coverage = CoverageIndex.load(args.coverage)
+        print(f"Loaded coverage for {len(coverage.tests)} tests from {args.coverage}")
+        if args.save_coverage_index:
+            coverage.save(args.save_coverage_index)
+
+    previous_results = []
+    if args.diff_base:
+        previous_report = Path(args.previous_report or Path(args.output) / "mutation_report.json")
+        if previous_report.exists():
+            with open(previous_report, 'r', encoding='utf-8') as f:
+                previous_results = json.load(f)
+            print(f"Loaded {len(previous_results)} previous verdicts from {previous_report}")
+        else:
+            print(f"Warning: no previous report at {previous_report}; "
+                  f"unchanged lines will not be reported")
+
+    scheduler = None
+    if args.sample or args.time_budget:
+        scheduler = MutantScheduler(args.strata, args.sample, args.time_budget, args.seed)
+
+    def make_tester(source_file: Path, output_dir: Path, build_relpath: str = None):
+        diff_scope = None
+        previous = []
+        if args.diff_base:
+            try:
+                diff_scope = DiffScope.from_git(source_file, args.diff_base, args.diff_context)
+            except RuntimeError as e:
+                print(f"Error: {e}")
+                sys.exit(1)
+            previous = [r for r in previous_results
+                        if r.get('source_file', build_relpath) == build_relpath]
+        return MutationTester(str(source_file), str(output_dir),
+                              cache=cache, cache_inputs=args.cache_inputs,
+                              coverage=coverage,
+                              timeout_factor=args.timeout_factor,
+                              timeout_slack=args.timeout_slack,
+                              fixed_timeout=args.timeout,
+                              max_timeout=max_timeout,
+                              killers=killers,
+                              fail_fast=args.fail_fast,
+                              schemata=args.schemata,
+                              results_db=results_db,
+                              resume=args.resume,
+                              build_relpath=build_relpath,
+                              ignore_procedures=config.get('IGNORE_PROCEDURES'),
+                              diff_scope=diff_scope,
+                              previous_results=previous,
+                              prune=not args.no_prune,
+                              scheduler=scheduler)
 
     # Run mutation testing
-    tester = MutationTester(args.source_file, args.output)
-    tester.run_mutation_testing(args.build_dir, args.max_mutants)
+    if len(source_files) == 1 and not args.config:
+        runner = make_tester(source_files[0], Path(args.output))
+    else:
+        testers = []
+        for source_file in source_files:
+            try:
+                relative = source_file.resolve().relative_to(root.resolve())
+            except ValueError:
+                relative = Path(source_file.name)
+            testers.append(make_tester(source_file,
+                                       Path(args.output) / relative.with_suffix(''),
+                                       relative.as_posix()))
+        runner = MutationSuite(testers, args.output, results_db, scheduler)
+    try:
+        runner.run_mutation_testing(args.build_dir, args.max_mutants, jobs)
+    finally:
+        if results_db is not None:
+            results_db.close()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Log-Linear Latency Histogram for PolyORB Benchmarks
+HDR-style bucketing shared with performance_benchmark.adb
+
+Author: @test_stabilize
+Context: RDB-004 Task 6 - tail latency of the PolyORB.Any hot paths
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# 2**7 = 128 exact buckets, then 64 buckets per power of two: every
+# recorded value is within 1/64 (1.6%) of its bucket's lower bound
+DEFAULT_SUB_BUCKET_BITS = 7
+
+# Percentiles reported for every operation
+REPORTED_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+class LatencyHistogram:
+    """
+    Fixed-precision, mergeable histogram of non-negative integer latencies
+
+    Values below 2**sub_bucket_bits land in exact buckets. Above that,
+    each power-of-two range [2**k, 2**(k+1)) is split into
+    2**(sub_bucket_bits - 1) equal buckets, so precision is relative and
+    memory grows with the logarithm of the largest value, not the number
+    of samples. Only non-empty buckets are stored. Two histograms with
+    the same sub_bucket_bits merge by adding counts, so runs, processes
+    and machines can be combined after the fact.
+
+    The bucket layout is the one performance_benchmark.adb uses, so
+    histograms it emits in batch mode load with from_dict() unchanged.
+    """
+
+    def __init__(self, sub_bucket_bits: int = DEFAULT_SUB_BUCKET_BITS, unit: str = 'ns'):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.unit = unit
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.sub_bucket_half = self.sub_bucket_count >> 1
+        self.counts: Dict[int, int] = {}
+        self.total_count = 0
+        self.min_value: Optional[int] = None
+        self.max_value: Optional[int] = None
+
+    def index_of(self, value: int) -> int:
+        """Bucket index of a value"""
+        if value < self.sub_bucket_count:
+            return max(value, 0)
+        exponent = value.bit_length() - self.sub_bucket_bits
+        sub_bucket = value >> exponent
+        return self.sub_bucket_count + (exponent - 1) * self.sub_bucket_half \
+            + sub_bucket - self.sub_bucket_half
+
+    def bucket_bounds(self, index: int) -> Tuple[int, int]:
+        """[low, high) range of values that land in a bucket"""
+        if index < self.sub_bucket_count:
+            return index, index + 1
+        exponent = (index - self.sub_bucket_count) // self.sub_bucket_half + 1
+        sub_bucket = (index - self.sub_bucket_count) % self.sub_bucket_half + self.sub_bucket_half
+        return sub_bucket << exponent, (sub_bucket + 1) << exponent
+
+    def record(self, value: float, count: int = 1):
+        """Record `count` occurrences of a value (rounded to an integer)"""
+        value = max(int(round(value)), 0)
+        index = self.index_of(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.total_count += count
+        if self.min_value is None or value < self.min_value:
+            self.min_value = value
+        if self.max_value is None or value > self.max_value:
+            self.max_value = value
+
+    def record_all(self, values: Iterable[float]):
+        for value in values:
+            self.record(value)
+
+    def merge(self, other: 'LatencyHistogram') -> 'LatencyHistogram':
+        """Add another histogram's counts into this one"""
+        if other.sub_bucket_bits != self.sub_bucket_bits or other.unit != self.unit:
+            raise ValueError(
+                f"cannot merge {other.sub_bucket_bits}-bit {other.unit} histogram "
+                f"into {self.sub_bucket_bits}-bit {self.unit} histogram")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total_count += other.total_count
+        for value in (other.min_value, other.max_value):
+            if value is None:
+                continue
+            if self.min_value is None or value < self.min_value:
+                self.min_value = value
+            if self.max_value is None or value > self.max_value:
+                self.max_value = value
+        return self
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """
+        Value at a percentile (0-100)
+
+        Returns the midpoint of the bucket holding that rank, clamped to
+        the exact min and max, or None for an empty histogram.
+        """
+        if not self.total_count:
+            return None
+        rank = max(1, -(-self.total_count * percent // 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                low, high = self.bucket_bounds(index)
+                value = low if high - low == 1 else (low + high - 1) / 2
+                return float(min(max(value, self.min_value), self.max_value))
+        return float(self.max_value)
+
+    def percentiles(self, percents: Iterable[float] = REPORTED_PERCENTILES) -> Dict[str, Optional[float]]:
+        """Percentiles keyed like 'p50', 'p99', 'p99.9'"""
+        return {f"p{percent:g}": self.percentile(percent) for percent in percents}
+
+    def mean(self) -> Optional[float]:
+        """Mean of the bucket midpoints"""
+        if not self.total_count:
+            return None
+        total = 0.0
+        for index, count in self.counts.items():
+            low, high = self.bucket_bounds(index)
+            total += count * (low + high - 1) / 2
+        return total / self.total_count
+
+    def stddev(self) -> Optional[float]:
+        """Sample standard deviation of the bucket midpoints"""
+        if not self.total_count:
+            return None
+        if self.total_count < 2:
+            return 0.0
+        mean = self.mean()
+        total = 0.0
+        for index, count in self.counts.items():
+            low, high = self.bucket_bounds(index)
+            total += count * ((low + high - 1) / 2 - mean) ** 2
+        return (total / (self.total_count - 1)) ** 0.5
+
+    def to_dict(self) -> Dict:
+        """Compact JSON form: only non-empty buckets, as [index, count] pairs"""
+        return {
+            'sub_bucket_bits': self.sub_bucket_bits,
+            'unit': self.unit,
+            'total_count': self.total_count,
+            'min': self.min_value,
+            'max': self.max_value,
+            'buckets': [[index, self.counts[index]] for index in sorted(self.counts)],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'LatencyHistogram':
+        histogram = cls(data.get('sub_bucket_bits', DEFAULT_SUB_BUCKET_BITS),
+                        data.get('unit', 'ns'))
+        for index, count in data.get('buckets', []):
+            histogram.counts[int(index)] = histogram.counts.get(int(index), 0) + int(count)
+        histogram.total_count = sum(histogram.counts.values())
+        histogram.min_value = data.get('min')
+        histogram.max_value = data.get('max')
+        if histogram.counts and histogram.min_value is None:
+            histogram.min_value = histogram.bucket_bounds(min(histogram.counts))[0]
+        if histogram.counts and histogram.max_value is None:
+            histogram.max_value = histogram.bucket_bounds(max(histogram.counts))[1] - 1
+        return histogram
+
+    @classmethod
+    def merged(cls, histograms: List['LatencyHistogram']) -> Optional['LatencyHistogram']:
+        """Merge a list of histograms into a new one (None if the list is empty)"""
+        if not histograms:
+            return None
+        result = cls(histograms[0].sub_bucket_bits, histograms[0].unit)
+        for histogram in histograms:
+            result.merge(histogram)
+        return result
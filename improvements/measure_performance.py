@@ -9,15 +9,23 @@ Context: RDB-004 Task 6 Pre-Work - Performance Automation
 """
 
 import json
+import queue
 import re
 import subprocess
 import sys
+import threading
 import time
 import statistics
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass, asdict
 import argparse
+from collections import deque
+
+from latency_histogram import LatencyHistogram
+from perf_history import PerformanceHistory
+from perf_stats import compare_samples, format_p
+from run_protocol import RunProtocol, environment_differences, noise_indicators
 
 
 @dataclass
@@ -34,6 +42,15 @@ class PerformanceMetric:
     max_time_ms: float
     ops_per_second: float
     timestamp: str
+    # Per-iteration latency percentiles (batch mode only)
+    p50_us: Optional[float] = None
+    p90_us: Optional[float] = None
+    p99_us: Optional[float] = None
+    p999_us: Optional[float] = None
+    # All runs merged, LatencyHistogram.to_dict() form (nanoseconds)
+    latency_histogram: Optional[Dict] = None
+    # Raw per-run totals, kept for significance testing against baselines
+    samples_ms: Optional[List[float]] = None
 
 
 @dataclass
@@ -45,6 +62,8 @@ class PerformanceBaseline:
     compiler: str
     optimization: str  # -O0, -O1, -O2, -O3
     metrics: List[PerformanceMetric]
+    # Run protocol and system-noise indicators (run_protocol.noise_indicators)
+    environment: Optional[Dict] = None
 
 
 class PerformanceBenchmark:
@@ -124,11 +143,21 @@ class PerformanceBenchmark:
         },
     ]
 
-    def __init__(self, benchmark_binary: str, output_dir: str = "performance"):
+    # Source name of these runs in the performance history
+    HISTORY_SOURCE = 'polyorb-benchmark'
+
+    def __init__(self, benchmark_binary: str, output_dir: str = "performance",
+                 protocol: Optional[RunProtocol] = None, optimization: str = "-O2"):
         self.benchmark_binary = Path(benchmark_binary)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        self.protocol = protocol or RunProtocol()
+        self.optimization = optimization
         self.results: List[PerformanceMetric] = []
+        # Per-iteration latencies per operation, merged over all runs
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        # Conditions of the last run_all_benchmarks, saved with the baseline
+        self.environment: Optional[Dict] = None
 
     def get_git_info(self) -> Tuple[str, str]:
         """Get git commit hash and version"""
@@ -169,14 +198,16 @@ class PerformanceBenchmark:
             raise FileNotFoundError(f"Benchmark binary not found: {self.benchmark_binary}")
 
         try:
-            # Run benchmark with operation name and iteration count
-            result = subprocess.run(
-                [str(self.benchmark_binary), operation, str(iterations)],
-                capture_output=True,
-                text=True,
-                timeout=300,  # 5 minute timeout
-                check=True
-            )
+            # Run benchmark with operation name and iteration count; the
+            # driver inherits this thread's pinned affinity
+            with self.protocol.pinned():
+                result = subprocess.run(
+                    [str(self.benchmark_binary.resolve()), operation, str(iterations)],
+                    capture_output=True,
+                    text=True,
+                    timeout=300,  # 5 minute timeout
+                    check=True
+                )
 
             # Parse output: expect format "Operation: <name>, Time: <ms>"
             times = []
@@ -197,6 +228,146 @@ class PerformanceBenchmark:
             print(f"❌ Unexpected error: {e}")
             return []
 
+    def run_benchmark_batch(self, runs: int = 5, timeout: float = 300.0,
+                            hot_paths: Optional[List[Dict]] = None) -> Dict[str, List[float]]:
+        """
+        Run hot paths (default: all) in one benchmark process (performance_benchmark --batch)
+
+        Requests "<operation> <iterations> 1" go to the driver's stdin in
+        the order self.protocol schedules them (warmup runs first, then
+        interleaved rounds) and each run comes back as a JSON line, so
+        process startup and TypeCode setup are paid once instead of once
+        per operation. `timeout` bounds the wait for any single line.
+        Per-iteration latency histograms of measured (non-warmup) runs are
+        merged into self.histograms as they arrive.
+
+        Returns: execution times in milliseconds per operation
+        """
+        process = subprocess.Popen(
+            [str(self.benchmark_binary.resolve()), '--batch'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1
+        )
+        lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        # stderr is drained continuously: a driver that fills the pipe with
+        # warnings would otherwise block and look like a stalled run
+        stderr_tail: "deque[str]" = deque(maxlen=50)
+
+        def read_stdout():
+            for line in process.stdout:
+                lines.put(line)
+            lines.put(None)
+
+        def read_stderr():
+            for line in process.stderr:
+                stderr_tail.append(line)
+
+        threading.Thread(target=read_stdout, daemon=True).start()
+        stderr_reader = threading.Thread(target=read_stderr, daemon=True)
+        stderr_reader.start()
+
+        def next_message() -> Dict:
+            try:
+                line = lines.get(timeout=timeout)
+            except queue.Empty:
+                raise RuntimeError(f"no output from benchmark driver for {timeout:.0f}s")
+            if line is None:
+                stderr_reader.join(timeout=1.0)
+                raise RuntimeError(f"benchmark driver exited: {''.join(stderr_tail).strip()}")
+            try:
+                return json.loads(line)
+            except json.JSONDecodeError:
+                raise RuntimeError(f"unexpected benchmark driver output: {line.strip()}")
+
+        results: Dict[str, List[float]] = {}
+        try:
+            # Inside the try, so a failed pin still reaps the driver
+            self.protocol.pin(process.pid)
+            if not next_message().get('ready'):
+                raise RuntimeError("benchmark driver did not report ready")
+
+            hot_paths = hot_paths or self.HOT_PATHS
+            print(f"  Running {len(hot_paths)} hot path(s) × {runs} runs "
+                  f"({self.protocol.describe()})...")
+            for path_config, warmup in self.protocol.schedule(hot_paths, runs):
+                operation = path_config['operation']
+                process.stdin.write(f"{operation} {path_config['iterations']} 1\n")
+                process.stdin.flush()
+
+                times = results.setdefault(operation, [])
+                while True:
+                    message = next_message()
+                    if 'error' in message:
+                        print(f"❌ Error running {operation}: {message['error']}")
+                    elif message.get('done'):
+                        break
+                    elif not warmup:
+                        times.append(float(message['time_ms']))
+                        if 'histogram' in message:
+                            histogram = LatencyHistogram.from_dict(message['histogram'])
+                            if operation in self.histograms:
+                                self.histograms[operation].merge(histogram)
+                            else:
+                                self.histograms[operation] = histogram
+
+            process.stdin.write("QUIT\n")
+            process.stdin.close()
+            process.wait(timeout=timeout)
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+
+        return results
+
+    def metric_from_times(self, operation: str, category: str, priority: str,
+                          iterations: int, times_ms: List[float],
+                          histogram: Optional[LatencyHistogram] = None) -> Optional[PerformanceMetric]:
+        """Summarize the per-run totals (and per-iteration histogram) of one operation"""
+        if not times_ms:
+            return None
+
+        # Calculate statistics
+        mean_time = statistics.mean(times_ms)
+        median_time = statistics.median(times_ms)
+        stddev = statistics.stdev(times_ms) if len(times_ms) > 1 else 0.0
+        min_time = min(times_ms)
+        max_time = max(times_ms)
+
+        # Calculate ops/second
+        ops_per_second = (iterations * 1000.0) / mean_time if mean_time > 0 else 0
+
+        metric = PerformanceMetric(
+            operation=operation,
+            category=category,
+            priority=priority,
+            iterations=iterations,
+            mean_time_ms=round(mean_time, 3),
+            median_time_ms=round(median_time, 3),
+            stddev_ms=round(stddev, 3),
+            min_time_ms=round(min_time, 3),
+            max_time_ms=round(max_time, 3),
+            ops_per_second=round(ops_per_second, 1),
+            timestamp=time.strftime('%Y-%m-%d %H:%M:%S UTC', time.gmtime()),
+            samples_ms=[round(t, 6) for t in times_ms]
+        )
+
+        tail = ''
+        if histogram is not None and histogram.total_count:
+            metric.p50_us = round(histogram.percentile(50) / 1000.0, 3)
+            metric.p90_us = round(histogram.percentile(90) / 1000.0, 3)
+            metric.p99_us = round(histogram.percentile(99) / 1000.0, 3)
+            metric.p999_us = round(histogram.percentile(99.9) / 1000.0, 3)
+            metric.latency_histogram = histogram.to_dict()
+            tail = f", p50 {metric.p50_us:.3f} µs, p99 {metric.p99_us:.3f} µs, p99.9 {metric.p999_us:.3f} µs"
+
+        print(f"    ✓ {operation}: {mean_time:.3f} ms ({ops_per_second:,.0f} ops/sec{tail})")
+
+        return metric
+
     def run_benchmarks_simple(self, operation: str, category: str,
                               priority: str, iterations: int,
                               runs: int = 5) -> Optional[PerformanceMetric]:
@@ -236,53 +407,69 @@ class PerformanceBenchmark:
             total_time_ms = total_time_us / 1000.0
             times_ms.append(total_time_ms)
 
-        if not times_ms:
-            return None
-
-        # Calculate statistics
-        mean_time = statistics.mean(times_ms)
-        median_time = statistics.median(times_ms)
-        stddev = statistics.stdev(times_ms) if len(times_ms) > 1 else 0.0
-        min_time = min(times_ms)
-        max_time = max(times_ms)
-
-        # Calculate ops/second
-        ops_per_second = (iterations * 1000.0) / mean_time if mean_time > 0 else 0
-
-        metric = PerformanceMetric(
-            operation=operation,
-            category=category,
-            priority=priority,
-            iterations=iterations,
-            mean_time_ms=round(mean_time, 3),
-            median_time_ms=round(median_time, 3),
-            stddev_ms=round(stddev, 3),
-            min_time_ms=round(min_time, 3),
-            max_time_ms=round(max_time, 3),
-            ops_per_second=round(ops_per_second, 1),
-            timestamp=time.strftime('%Y-%m-%d %H:%M:%S UTC', time.gmtime())
-        )
-
-        print(f"    ✓ {mean_time:.3f} ms ({ops_per_second:,.0f} ops/sec)")
-
-        return metric
+        return self.metric_from_times(operation, category, priority, iterations, times_ms)
 
     def run_all_benchmarks(self, runs: int = 5) -> List[PerformanceMetric]:
-        """Run all hot path benchmarks"""
+        """
+        Run all hot path benchmarks
+
+        Measured with the benchmark binary in batch mode when it exists.
+        Binaries without --batch fall back to one process per run; without
+        a binary the timings are simulated. Either way runs follow
+        self.protocol, and the system-noise indicators before and after
+        are kept in self.environment.
+        """
         print("\n" + "=" * 80)
         print("PolyORB Performance Benchmarks")
         print("=" * 80)
 
+        environment = noise_indicators()
+        for warning in environment['warnings']:
+            print(f"⚠️  Noisy system: {warning}")
+
         results = []
+        measured: Optional[Dict[str, List[float]]] = None
+
+        if self.benchmark_binary.exists():
+            try:
+                measured = self.run_benchmark_batch(runs)
+            except (OSError, RuntimeError) as e:
+                print(f"⚠️  Batch mode unavailable ({e}); running one process per run")
+                # Drop histograms of runs the failed batch got through: the
+                # per-run timings that replace them carry none
+                self.histograms.clear()
+                measured = {path_config['operation']: [] for path_config in self.HOT_PATHS}
+                for path_config, warmup in self.protocol.schedule(self.HOT_PATHS, runs):
+                    times = self.run_benchmark(path_config['operation'], path_config['iterations'])
+                    if not warmup:
+                        measured[path_config['operation']].extend(times)
+        else:
+            print(f"⚠️  Benchmark binary not found: {self.benchmark_binary} - "
+                  f"using SIMULATED timings")
+
+        environment['loadavg_after'] = noise_indicators()['loadavg']
+        environment['protocol'] = self.protocol.settings()
+        environment['simulated'] = measured is None
+        self.environment = environment
 
         for path_config in self.HOT_PATHS:
-            metric = self.run_benchmarks_simple(
-                operation=path_config['operation'],
-                category=path_config['category'],
-                priority=path_config['priority'],
-                iterations=path_config['iterations'],
-                runs=runs
-            )
+            if measured is None:
+                metric = self.run_benchmarks_simple(
+                    operation=path_config['operation'],
+                    category=path_config['category'],
+                    priority=path_config['priority'],
+                    iterations=path_config['iterations'],
+                    runs=runs
+                )
+            else:
+                metric = self.metric_from_times(
+                    path_config['operation'],
+                    path_config['category'],
+                    path_config['priority'],
+                    path_config['iterations'],
+                    measured.get(path_config['operation'], []),
+                    self.histograms.get(path_config['operation'])
+                )
 
             if metric:
                 results.append(metric)
@@ -290,6 +477,34 @@ class PerformanceBenchmark:
 
         return results
 
+    def measure_more(self, operation: str, runs: int) -> Optional[PerformanceMetric]:
+        """
+        Add `runs` more measurements of one operation to its current metric
+
+        Used when a comparison is inconclusive. Returns the rebuilt metric,
+        or None when there is no benchmark binary (simulated timings would
+        not add information).
+        """
+        path_config = next((p for p in self.HOT_PATHS if p['operation'] == operation), None)
+        current = next((m for m in self.results if m.operation == operation), None)
+        if path_config is None or current is None or not self.benchmark_binary.exists():
+            return None
+
+        try:
+            times = self.run_benchmark_batch(runs, hot_paths=[path_config]).get(operation, [])
+        except (OSError, RuntimeError):
+            times = [t for _ in range(runs)
+                     for t in self.run_benchmark(operation, path_config['iterations'])]
+        if not times:
+            return None
+
+        metric = self.metric_from_times(
+            operation, path_config['category'], path_config['priority'],
+            path_config['iterations'], (current.samples_ms or []) + times,
+            self.histograms.get(operation))
+        self.results[self.results.index(current)] = metric
+        return metric
+
     def save_baseline(self, baseline_file: str = "baseline.json"):
         """Save performance baseline to JSON file"""
         version, commit_hash = self.get_git_info()
@@ -300,8 +515,9 @@ class PerformanceBenchmark:
             commit_hash=commit_hash,
             date=time.strftime('%Y-%m-%d %H:%M:%S UTC', time.gmtime()),
             compiler=f"GNAT {compiler}",
-            optimization="-O2",  # Typical optimization level
-            metrics=self.results
+            optimization=self.optimization,
+            metrics=self.results,
+            environment=self.environment
         )
 
         baseline_path = self.output_dir / baseline_file
@@ -311,6 +527,71 @@ class PerformanceBenchmark:
         print(f"\n✅ Baseline saved to: {baseline_path}")
         return baseline
 
+    def record_history(self, history_db: str, drift_commits: int = 20) -> int:
+        """
+        Append the current results to the performance history database
+
+        Then prints each operation against its rolling baseline (median of
+        the previous `drift_commits` commits) and any drift the history
+        shows for this compiler and optimization level.
+
+        Returns: the history run id
+        """
+        version, commit_hash = self.get_git_info()
+        compiler = f"GNAT {self.get_compiler_info()}"
+
+        measurements = []
+        for metric in self.results:
+            measurements.append({'series': metric.operation, 'metric': 'median_ms',
+                                 'value': metric.median_time_ms, 'unit': 'ms',
+                                 'samples': metric.samples_ms})
+            measurements.append({'series': metric.operation, 'metric': 'mean_ms',
+                                 'value': metric.mean_time_ms, 'unit': 'ms'})
+            measurements.append({'series': metric.operation, 'metric': 'ops_per_second',
+                                 'value': metric.ops_per_second, 'unit': 'ops/s',
+                                 'higher_is_better': True})
+            for field in ('p50_us', 'p99_us', 'p999_us'):
+                measurements.append({'series': metric.operation, 'metric': field,
+                                     'value': getattr(metric, field), 'unit': 'us'})
+
+        history = PerformanceHistory(history_db)
+        try:
+            key = {'source': self.HISTORY_SOURCE, 'compiler': compiler,
+                   'optimization': self.optimization}
+            baselines = {
+                metric.operation: history.rolling_baseline(
+                    metric.operation, 'median_ms', commits=drift_commits,
+                    exclude_commit=commit_hash, **key)
+                for metric in self.results
+            }
+            run_id = history.record_run(
+                self.HISTORY_SOURCE, commit_hash, measurements, version=version,
+                compiler=compiler, optimization=self.optimization,
+                host=(self.environment or {}).get('hostname'),
+                environment=self.environment)
+
+            print(f"\n📈 Recorded history run {run_id} in {history_db}")
+            for metric in self.results:
+                baseline = baselines[metric.operation]
+                if baseline:
+                    change = (metric.median_time_ms - baseline['median']) / baseline['median'] * 100
+                    print(f"  {metric.operation:25s}: {metric.median_time_ms:8.3f} ms vs "
+                          f"{baseline['median']:8.3f} ms rolling median of "
+                          f"{baseline['commits']} commits ({change:+.1f}%)")
+
+            key.pop('source')
+            for finding in history.drift(self.HISTORY_SOURCE, last=drift_commits, **key):
+                if finding['kind'] == 'trend':
+                    print(f"⚠️  Drift: {finding['series']} {finding['metric']} creeping "
+                          f"{finding['slope_pct_per_commit']:+.2f}%/commit over "
+                          f"{finding['commits']} commits (p={finding['p_value']:.3g})")
+                else:
+                    print(f"⚠️  Drift: {finding['series']} {finding['metric']} level shift "
+                          f"{finding['change_pct']:+.1f}% at {finding['commit_hash'][:8]}")
+        finally:
+            history.close()
+        return run_id
+
     def load_baseline(self, baseline_file: str = "baseline.json") -> Optional[PerformanceBaseline]:
         """Load performance baseline from JSON file"""
         baseline_path = self.output_dir / baseline_file
@@ -328,14 +609,24 @@ class PerformanceBenchmark:
             date=data['date'],
             compiler=data['compiler'],
             optimization=data['optimization'],
-            metrics=[PerformanceMetric(**m) for m in data['metrics']]
+            metrics=[PerformanceMetric(**m) for m in data['metrics']],
+            environment=data.get('environment')
         )
 
     def compare_with_baseline(self, baseline_file: str = "baseline.json",
-                               threshold_percent: float = 5.0) -> Dict:
+                               threshold_percent: float = 5.0,
+                               alpha: float = 0.01,
+                               max_runs: int = 0) -> Dict:
         """
         Compare current results with baseline
 
+        When both sides carry raw per-run samples, each operation is judged
+        by a one-sided Mann-Whitney test at `alpha` together with a minimum
+        effect of `threshold_percent` on the median (bootstrap CI reported).
+        Inconclusive operations are re-measured, doubling their runs up to
+        `max_runs`. Baselines without samples fall back to the mean
+        threshold.
+
         Returns: Comparison report with regressions
         """
         baseline = self.load_baseline(baseline_file)
@@ -350,16 +641,19 @@ class PerformanceBenchmark:
         regressions = []
         improvements = []
         unchanged = []
+        inconclusive = []
 
         print("\n" + "=" * 80)
         print("Performance Comparison")
         print("=" * 80)
         print(f"Baseline: {baseline.date} ({baseline.commit_hash[:8]})")
         print(f"Current:  {time.strftime('%Y-%m-%d %H:%M:%S UTC', time.gmtime())}")
-        print(f"Threshold: ±{threshold_percent}%")
+        print(f"Threshold: ±{threshold_percent}% median change, significant at p<{alpha:g}")
+        for difference in environment_differences(baseline.environment, self.environment):
+            print(f"⚠️  Environment differs from baseline: {difference}")
         print("=" * 80)
 
-        for current_metric in self.results:
+        for current_metric in list(self.results):
             op = current_metric.operation
             baseline_metric = baseline_map.get(op)
 
@@ -367,43 +661,107 @@ class PerformanceBenchmark:
                 print(f"⚠️  {op:25s}: No baseline (new operation)")
                 continue
 
-            # Calculate percentage change
             baseline_time = baseline_metric.mean_time_ms
-            current_time = current_metric.mean_time_ms
-            percent_change = ((current_time - baseline_time) / baseline_time) * 100
-
-            # Determine status
-            if abs(percent_change) <= threshold_percent:
+            stats = None
+
+            if baseline_metric.samples_ms and current_metric.samples_ms:
+                stats = compare_samples(current_metric.samples_ms, baseline_metric.samples_ms,
+                                        threshold_percent, alpha)
+                while stats.verdict == 'inconclusive' and stats.current_runs < max_runs:
+                    more = min(stats.current_runs, max_runs - stats.current_runs)
+                    print(f"  ↻ {op}: inconclusive after {stats.current_runs} runs, "
+                          f"measuring {more} more")
+                    remeasured = self.measure_more(op, more)
+                    if remeasured is None:
+                        break
+                    current_metric = remeasured
+                    stats = compare_samples(current_metric.samples_ms, baseline_metric.samples_ms,
+                                            threshold_percent, alpha)
+                verdict = stats.verdict
+                percent_change = stats.change_percent
+                baseline_time = statistics.median(baseline_metric.samples_ms)
+                current_time = statistics.median(current_metric.samples_ms)
+            else:
+                # Baseline predates raw samples: percentage on means only
+                current_time = current_metric.mean_time_ms
+                percent_change = ((current_time - baseline_time) / baseline_time) * 100
+                if abs(percent_change) <= threshold_percent:
+                    verdict = 'unchanged'
+                elif percent_change > threshold_percent:
+                    verdict = 'regression'
+                else:
+                    verdict = 'improvement'
+
+            if stats is not None and verdict == 'regression':
+                status = f"❌ REGRESSION ({percent_change:+.1f}%, {format_p(stats.p_slower)})"
+            elif stats is not None and verdict == 'improvement':
+                status = f"✅ IMPROVEMENT ({percent_change:+.1f}%, {format_p(stats.p_faster)})"
+            elif verdict == 'regression':
+                status = f"❌ REGRESSION ({percent_change:+.1f}% mean)"
+            elif verdict == 'improvement':
+                status = f"✅ IMPROVEMENT ({percent_change:+.1f}% mean)"
+            elif verdict == 'inconclusive':
+                status = f"❓ INCONCLUSIVE ({percent_change:+.1f}%)"
+            else:
                 status = "✓ OK"
-                unchanged.append(current_metric)
-            elif percent_change > threshold_percent:
-                status = f"❌ REGRESSION ({percent_change:+.1f}%)"
-                regressions.append({
-                    'operation': op,
-                    'baseline_ms': baseline_time,
-                    'current_ms': current_time,
-                    'change_percent': percent_change,
-                    'priority': current_metric.priority,
+
+            comparison = {
+                'operation': op,
+                'baseline_ms': baseline_time,
+                'current_ms': current_time,
+                'change_percent': percent_change,
+                'priority': current_metric.priority,
+            }
+            if stats is not None:
+                comparison.update({
+                    'p_value': stats.p_slower if percent_change >= 0 else stats.p_faster,
+                    'ci_percent': [stats.ci_low_percent, stats.ci_high_percent],
+                    'cliffs_delta': stats.cliffs_delta,
+                    'baseline_runs': stats.baseline_runs,
+                    'current_runs': stats.current_runs,
                 })
-            else:
-                status = f"✅ IMPROVEMENT ({percent_change:+.1f}%)"
+
+            if verdict == 'regression':
+                regressions.append(comparison)
+            elif verdict == 'improvement':
                 improvements.append(current_metric)
+            elif verdict == 'inconclusive':
+                inconclusive.append(comparison)
+            else:
+                unchanged.append(current_metric)
 
-            print(f"{op:25s}: {baseline_time:8.3f} ms → {current_time:8.3f} ms  {status}")
+            label = "median" if stats is not None else "mean"
+            print(f"{op:25s}: {baseline_time:8.3f} ms → {current_time:8.3f} ms ({label})  {status}")
+            if stats is not None:
+                print(f"{'':25s}  95% CI {stats.ci_low_percent:+.1f}% .. {stats.ci_high_percent:+.1f}%"
+                      f"  Cliff's δ {stats.cliffs_delta:+.2f}"
+                      f"  runs {stats.baseline_runs} → {stats.current_runs}")
+            if baseline_metric.p99_us is not None and current_metric.p99_us is not None:
+                print(f"{'':25s}  p99 {baseline_metric.p99_us:8.3f} µs → {current_metric.p99_us:8.3f} µs"
+                      f"  p99.9 {baseline_metric.p999_us:8.3f} µs → {current_metric.p999_us:8.3f} µs")
 
         # Summary
         print("\n" + "=" * 80)
         print("Summary")
         print("=" * 80)
         print(f"Total Operations: {len(self.results)}")
-        print(f"Unchanged:        {len(unchanged)} (within ±{threshold_percent}%)")
+        print(f"Unchanged:        {len(unchanged)} (within ±{threshold_percent}% or not significant)")
         print(f"Improvements:     {len(improvements)}")
         print(f"Regressions:      {len(regressions)}")
+        print(f"Inconclusive:     {len(inconclusive)}")
 
         if regressions:
             print("\n⚠️  PERFORMANCE REGRESSIONS DETECTED:")
             for reg in regressions:
-                print(f"  - {reg['operation']:25s}: {reg['change_percent']:+6.1f}% slower ({reg['priority']})")
+                significance = f", {format_p(reg['p_value'])}" if 'p_value' in reg else ""
+                print(f"  - {reg['operation']:25s}: {reg['change_percent']:+6.1f}% slower "
+                      f"({reg['priority']}{significance})")
+
+        if inconclusive:
+            print("\n❓ Not enough evidence either way (raise --max-runs to measure more):")
+            for item in inconclusive:
+                print(f"  - {item['operation']:25s}: {item['change_percent']:+6.1f}% "
+                      f"after {item.get('current_runs', '?')} runs")
 
         print("=" * 80)
 
@@ -412,6 +770,7 @@ class PerformanceBenchmark:
             'regressions': regressions,
             'improvements': improvements,
             'unchanged': unchanged,
+            'inconclusive': inconclusive,
         }
 
     def generate_report(self, report_file: str = "performance_report.md"):
@@ -436,6 +795,16 @@ class PerformanceBenchmark:
                        f"{metric.iterations:,} | {metric.mean_time_ms:.3f} | "
                        f"{metric.ops_per_second:,.0f} | {metric.stddev_ms:.3f} |\n")
 
+            tail_metrics = [m for m in self.results if m.p99_us is not None]
+            if tail_metrics:
+                f.write("\n## Per-Iteration Latency (all runs merged)\n\n")
+                f.write("| Operation | p50 (µs) | p90 (µs) | p99 (µs) | p99.9 (µs) | Max (µs) |\n")
+                f.write("|-----------|----------|----------|----------|------------|----------|\n")
+                for metric in tail_metrics:
+                    max_us = metric.latency_histogram['max'] / 1000.0
+                    f.write(f"| {metric.operation} | {metric.p50_us:.3f} | {metric.p90_us:.3f} | "
+                           f"{metric.p99_us:.3f} | {metric.p999_us:.3f} | {max_us:.3f} |\n")
+
             f.write("\n## Performance by Category\n\n")
 
             # Group by category
@@ -456,7 +825,9 @@ class PerformanceBenchmark:
 
             f.write("## Raw Data\n\n")
             f.write("```json\n")
-            f.write(json.dumps([asdict(m) for m in self.results], indent=2))
+            # Histograms are in the baseline JSON; they would swamp the report
+            f.write(json.dumps([{k: v for k, v in asdict(m).items() if k != 'latency_histogram'}
+                                for m in self.results], indent=2))
             f.write("\n```\n")
 
         print(f"\n📊 Report generated: {report_path}")
@@ -492,18 +863,70 @@ def main():
         '--threshold',
         type=float,
         default=5.0,
-        help='Regression threshold percentage (default: 5.0)'
+        help='Minimum median change, in percent, that counts as a regression (default: 5.0)'
+    )
+    parser.add_argument(
+        '--alpha',
+        type=float,
+        default=0.01,
+        help='Significance level for the Mann-Whitney test (default: 0.01)'
+    )
+    parser.add_argument(
+        '--max-runs',
+        type=int,
+        default=40,
+        help='Re-measure inconclusive operations up to this many runs (default: 40, 0 disables)'
     )
     parser.add_argument(
         '--compare',
         action='store_true',
         help='Compare with existing baseline'
     )
+    parser.add_argument(
+        '--warmup-runs',
+        type=int,
+        default=1,
+        help='Runs per operation discarded before measuring (default: 1)'
+    )
+    parser.add_argument(
+        '--cpu',
+        default='auto',
+        help="CPU to pin the benchmark to: a number, 'auto' (isolated or last core) "
+             "or 'none' (default: auto)"
+    )
+    parser.add_argument(
+        '--no-interleave',
+        action='store_true',
+        help='Run each operation back to back instead of shuffling every round'
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=0,
+        help='Seed for the interleaved run order (default: 0)'
+    )
+    parser.add_argument(
+        '--optimization',
+        default='-O2',
+        help='Optimization level the benchmark was built with (default: -O2)'
+    )
+    parser.add_argument(
+        '--history-db',
+        default=None,
+        help='Also append results to this performance history database '
+             '(e.g. performance/history.db)'
+    )
 
     args = parser.parse_args()
 
     # Create benchmark runner
-    benchmark = PerformanceBenchmark(args.benchmark_binary, args.output)
+    try:
+        protocol = RunProtocol(warmup_runs=args.warmup_runs, cpu=args.cpu,
+                               interleave=not args.no_interleave, seed=args.seed)
+    except ValueError as e:
+        parser.error(f"--cpu: {e}")
+    benchmark = PerformanceBenchmark(args.benchmark_binary, args.output, protocol,
+                                     args.optimization)
 
     # Run benchmarks
     print("Starting performance benchmarks...")
@@ -512,9 +935,13 @@ def main():
     # Generate report
     benchmark.generate_report()
 
+    if args.history_db:
+        benchmark.record_history(args.history_db)
+
     # Save or compare baseline
     if args.compare:
-        result = benchmark.compare_with_baseline(args.baseline, args.threshold)
+        result = benchmark.compare_with_baseline(args.baseline, args.threshold,
+                                                alpha=args.alpha, max_runs=args.max_runs)
         if result['status'] == 'regressions':
             print("\n❌ Performance regressions detected!")
             sys.exit(1)
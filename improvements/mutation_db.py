@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+SQLite Results Store for Ada Mutation Testing
+Streams mutation verdicts into an indexed database and answers queries
+
+Author: @test_stabilize
+Context: RDB-002 Testing Infrastructure - mutation results reporting
+"""
+
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+import argparse
+
+
+# Default database location (OUTPUT_SQLITE in configs/mutmut_config.py)
+DEFAULT_DB_PATH = ".mutmut-tmp/mutmut-results.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id          INTEGER PRIMARY KEY,
+    started_at  TEXT NOT NULL,
+    finished_at TEXT,
+    status      TEXT NOT NULL,
+    command     TEXT
+);
+
+CREATE TABLE IF NOT EXISTS files (
+    id   INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS operators (
+    id       INTEGER PRIMARY KEY,
+    name     TEXT NOT NULL,
+    version  INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    priority TEXT NOT NULL,
+    UNIQUE (name, version)
+);
+
+CREATE TABLE IF NOT EXISTS mutants (
+    id          INTEGER PRIMARY KEY,
+    file_id     INTEGER NOT NULL REFERENCES files (id),
+    operator_id INTEGER NOT NULL REFERENCES operators (id),
+    hash        TEXT NOT NULL,
+    line        INTEGER NOT NULL,
+    description TEXT NOT NULL,
+    patch       TEXT NOT NULL,
+    UNIQUE (file_id, hash)
+);
+
+CREATE TABLE IF NOT EXISTS verdicts (
+    run_id         INTEGER NOT NULL REFERENCES runs (id),
+    mutant_id      INTEGER NOT NULL REFERENCES mutants (id),
+    status         TEXT NOT NULL,
+    killed_by      TEXT,
+    seconds        REAL,
+    cached         INTEGER NOT NULL DEFAULT 0,
+    covering_tests INTEGER,
+    recorded_at    TEXT NOT NULL,
+    PRIMARY KEY (run_id, mutant_id)
+);
+
+CREATE INDEX IF NOT EXISTS mutants_by_file ON mutants (file_id);
+CREATE INDEX IF NOT EXISTS mutants_by_operator ON mutants (operator_id);
+CREATE INDEX IF NOT EXISTS verdicts_by_status ON verdicts (run_id, status);
+CREATE INDEX IF NOT EXISTS verdicts_by_mutant ON verdicts (mutant_id);
+"""
+
+
+def _now() -> str:
+    return time.strftime('%Y-%m-%dT%H:%M:%S')
+
+
+def _repo_relative(path: str) -> str:
+    """
+    A source path relative to the root of its git checkout (the nearest
+    directory above it holding .git), so runs started from different
+    directories or checkouts record the same file under the same path.
+    Paths outside any checkout are kept absolute.
+    """
+    resolved = Path(path).resolve()
+    for parent in resolved.parents:
+        if (parent / '.git').exists():
+            return resolved.relative_to(parent).as_posix()
+    return resolved.as_posix()
+
+
+class MutationResultsDB:
+    """
+    Mutation results store
+
+    Verdicts are committed one by one as mutants finish, so a run that
+    crashes halfway keeps everything recorded so far and the database can
+    be queried while a run is still in progress (WAL journal). Source
+    files are stored relative to the root of their git checkout.
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self._paths: Dict[str, str] = {}
+        self._file_ids: Dict[str, int] = {}
+        self._mutant_ids: Dict[tuple, int] = {}
+
+    def close(self):
+        self.conn.close()
+
+    def start_run(self, command: str = None) -> int:
+        """Open a new run and return its id"""
+        with self.conn:
+            cursor = self.conn.execute(
+                'INSERT INTO runs (started_at, status, command) VALUES (?, ?, ?)',
+                (_now(), 'running', command)
+            )
+        return cursor.lastrowid
+
+    def finish_run(self, run_id: int, status: str = 'completed'):
+        with self.conn:
+            self.conn.execute(
+                'UPDATE runs SET finished_at = ?, status = ? WHERE id = ?',
+                (_now(), status, run_id)
+            )
+
+    def _path(self, source_file: str) -> str:
+        if source_file not in self._paths:
+            self._paths[source_file] = _repo_relative(source_file)
+        return self._paths[source_file]
+
+    def _file_id(self, path: str) -> int:
+        if path not in self._file_ids:
+            self.conn.execute('INSERT OR IGNORE INTO files (path) VALUES (?)', (path,))
+            self._file_ids[path] = self.conn.execute(
+                'SELECT id FROM files WHERE path = ?', (path,)
+            ).fetchone()[0]
+        return self._file_ids[path]
+
+    def _operator_id(self, mutant: Dict) -> int:
+        self.conn.execute(
+            'INSERT OR IGNORE INTO operators (name, version, category, priority) '
+            'VALUES (?, ?, ?, ?)',
+            (mutant['operator'], mutant['operator_version'],
+             mutant['category'], mutant['priority'])
+        )
+        return self.conn.execute(
+            'SELECT id FROM operators WHERE name = ? AND version = ?',
+            (mutant['operator'], mutant['operator_version'])
+        ).fetchone()[0]
+
+    def record_mutants(self, source_file: str, mutants: List[Dict]):
+        """Register the mutants of a source file (idempotent across runs)"""
+        source_file = self._path(source_file)
+        with self.conn:
+            file_id = self._file_id(source_file)
+            operator_ids = {}
+            for mutant in mutants:
+                operator_key = (mutant['operator'], mutant['operator_version'])
+                if operator_key not in operator_ids:
+                    operator_ids[operator_key] = self._operator_id(mutant)
+                self.conn.execute(
+                    'INSERT OR IGNORE INTO mutants '
+                    '(file_id, operator_id, hash, line, description, patch) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (file_id, operator_ids[operator_key], mutant['hash'],
+                     mutant['line_number'], mutant['description'],
+                     json.dumps(mutant['patch'], sort_keys=True))
+                )
+                self._mutant_ids[(source_file, mutant['hash'])] = self.conn.execute(
+                    'SELECT id FROM mutants WHERE file_id = ? AND hash = ?',
+                    (file_id, mutant['hash'])
+                ).fetchone()[0]
+
+    def record_verdict(self, run_id: int, source_file: str, mutant: Dict):
+        """Store one verdict; committed immediately"""
+        source_file = self._path(source_file)
+        with self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO verdicts '
+                '(run_id, mutant_id, status, killed_by, seconds, cached, '
+                ' covering_tests, recorded_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (run_id, self._mutant_ids[(source_file, mutant['hash'])],
+                 mutant['status'], mutant.get('killed_by'), mutant.get('seconds'),
+                 int(bool(mutant.get('cached'))), mutant.get('covering_tests'), _now())
+            )
+
+    def latest_run_id(self) -> Optional[int]:
+        row = self.conn.execute('SELECT MAX(id) FROM runs').fetchone()
+        return row[0]
+
+    def runs(self) -> List[Dict]:
+        """All runs with their verdict counts"""
+        rows = self.conn.execute("""
+            SELECT r.id, r.started_at, r.finished_at, r.status,
+                   COUNT(v.mutant_id) AS mutants,
+                   SUM(v.status = 'KILLED') AS killed,
+                   SUM(v.status = 'SURVIVED') AS survived
+            FROM runs r LEFT JOIN verdicts v ON v.run_id = r.id
+            GROUP BY r.id ORDER BY r.id
+        """).fetchall()
+        return [dict(row) for row in rows]
+
+    def score_by_file(self, run_id: int) -> List[Dict]:
+        """Mutation score per source file: killed / (killed + survived)"""
+        rows = self.conn.execute("""
+            SELECT f.path AS file,
+                   SUM(v.status = 'KILLED') AS killed,
+                   SUM(v.status = 'SURVIVED') AS survived,
+                   SUM(v.status = 'COMPILE_ERROR') AS compile_errors,
+                   SUM(v.status = 'TIMEOUT') AS timeouts
+            FROM verdicts v
+            JOIN mutants m ON m.id = v.mutant_id
+            JOIN files f ON f.id = m.file_id
+            WHERE v.run_id = ?
+            GROUP BY f.path ORDER BY f.path
+        """, (run_id,)).fetchall()
+        results = []
+        for row in rows:
+            entry = dict(row)
+            valid = entry['killed'] + entry['survived']
+            entry['score'] = entry['killed'] / valid * 100 if valid else None
+            results.append(entry)
+        return results
+
+    def survivors_by_operator(self, run_id: int) -> List[Dict]:
+        """Surviving mutants grouped by operator, most survivors first"""
+        rows = self.conn.execute("""
+            SELECT o.name AS operator, o.category, o.priority,
+                   COUNT(*) AS survivors,
+                   GROUP_CONCAT(f.path || ':' || m.line, ', ') AS locations
+            FROM verdicts v
+            JOIN mutants m ON m.id = v.mutant_id
+            JOIN operators o ON o.id = m.operator_id
+            JOIN files f ON f.id = m.file_id
+            WHERE v.run_id = ? AND v.status = 'SURVIVED'
+            GROUP BY o.id ORDER BY survivors DESC, o.name
+        """, (run_id,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def diff_runs(self, old_run: int, new_run: int) -> Dict[str, List[Dict]]:
+        """
+        Compare the verdicts of two runs
+
+        Mutants are matched by file and mutant hash (source + patch), so an
+        edited file shows its old mutants as removed and new ones as added.
+
+        Returns: {'newly_killed', 'newly_survived', 'changed', 'added', 'removed'}
+        """
+        rows = self.conn.execute("""
+            SELECT f.path AS file, m.line, m.description,
+                   old.status AS old_status, new.status AS new_status
+            FROM mutants m
+            JOIN files f ON f.id = m.file_id
+            LEFT JOIN verdicts old ON old.mutant_id = m.id AND old.run_id = ?
+            LEFT JOIN verdicts new ON new.mutant_id = m.id AND new.run_id = ?
+            WHERE (old.status IS NOT NULL OR new.status IS NOT NULL)
+              AND (old.status IS NULL OR new.status IS NULL OR old.status != new.status)
+            ORDER BY f.path, m.line
+        """, (old_run, new_run)).fetchall()
+
+        diff = {'newly_killed': [], 'newly_survived': [], 'changed': [],
+                'added': [], 'removed': []}
+        for row in rows:
+            entry = dict(row)
+            if entry['old_status'] is None:
+                diff['added'].append(entry)
+            elif entry['new_status'] is None:
+                diff['removed'].append(entry)
+            elif entry['new_status'] == 'KILLED':
+                diff['newly_killed'].append(entry)
+            elif entry['new_status'] == 'SURVIVED':
+                diff['newly_survived'].append(entry)
+            else:
+                diff['changed'].append(entry)
+        return diff
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description='Query the mutation testing results database'
+    )
+    parser.add_argument(
+        '--db',
+        default=DEFAULT_DB_PATH,
+        help=f'Results database (default: {DEFAULT_DB_PATH})'
+    )
+    parser.add_argument(
+        '--json',
+        action='store_true',
+        help='Print results as JSON'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('runs', help='List runs')
+    for name, help_text in (('score-by-file', 'Mutation score per source file'),
+                            ('survivors-by-operator', 'Surviving mutants per operator')):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument('--run', type=int, help='Run id (default: latest run)')
+    diff_parser = subparsers.add_parser('diff', help='Verdict changes between two runs')
+    diff_parser.add_argument('old_run', type=int)
+    diff_parser.add_argument('new_run', type=int, nargs='?',
+                             help='Newer run id (default: latest run)')
+
+    args = parser.parse_args()
+
+    if not Path(args.db).exists():
+        print(f"Error: Results database not found: {args.db}")
+        sys.exit(1)
+
+    db = MutationResultsDB(args.db)
+    try:
+        if args.command == 'runs':
+            result = db.runs()
+        elif args.command == 'diff':
+            result = db.diff_runs(args.old_run, args.new_run or db.latest_run_id())
+        else:
+            run_id = args.run or db.latest_run_id()
+            if args.command == 'score-by-file':
+                result = db.score_by_file(run_id)
+            else:
+                result = db.survivors_by_operator(run_id)
+
+        if args.json:
+            print(json.dumps(result, indent=2))
+        elif args.command == 'runs':
+            for run in result:
+                print(f"Run {run['id']:4d}  {run['started_at']}  {run['status']:10s} "
+                      f"{run['mutants']:5d} mutants, {run['killed'] or 0} killed, "
+                      f"{run['survived'] or 0} survived")
+        elif args.command == 'score-by-file':
+            for entry in result:
+                score = f"{entry['score']:5.1f}%" if entry['score'] is not None else '  n/a '
+                print(f"{score}  {entry['killed']:4d} killed {entry['survived']:4d} survived  "
+                      f"{entry['file']}")
+        elif args.command == 'survivors-by-operator':
+            for entry in result:
+                print(f"{entry['survivors']:4d}  {entry['operator']} "
+                      f"[{entry['category']}, {entry['priority']}]")
+                print(f"      {entry['locations']}")
+        else:
+            for section, entries in result.items():
+                print(f"{section.replace('_', ' ').title()}: {len(entries)}")
+                for entry in entries:
+                    print(f"   {entry['file']}:{entry['line']} {entry['description']} "
+                          f"({entry['old_status'] or '-'} → {entry['new_status'] or '-'})")
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
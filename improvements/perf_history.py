@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+Performance History Store for PolyORB
+Append-only timeseries of benchmark results with drift and change-point queries
+
+Author: @test_stabilize
+Context: RDB-004 Task 6 - catching slow performance creep across commits
+"""
+
+import json
+import math
+import sqlite3
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from statistics import NormalDist
+from typing import Dict, List, Optional, Tuple
+import argparse
+
+
+# Default database location, next to performance/baseline.json
+DEFAULT_HISTORY_PATH = "performance/history.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id           INTEGER PRIMARY KEY,
+    source       TEXT NOT NULL,
+    commit_hash  TEXT NOT NULL,
+    version      TEXT,
+    recorded_at  TEXT NOT NULL,
+    compiler     TEXT,
+    optimization TEXT,
+    host         TEXT,
+    environment  TEXT
+);
+
+CREATE TABLE IF NOT EXISTS measurements (
+    run_id           INTEGER NOT NULL REFERENCES runs (id),
+    series           TEXT NOT NULL,
+    metric           TEXT NOT NULL,
+    value            REAL NOT NULL,
+    unit             TEXT,
+    higher_is_better INTEGER NOT NULL DEFAULT 0,
+    samples          TEXT,
+    PRIMARY KEY (run_id, series, metric)
+);
+
+CREATE INDEX IF NOT EXISTS runs_by_key ON runs (source, compiler, optimization, recorded_at);
+CREATE INDEX IF NOT EXISTS runs_by_commit ON runs (commit_hash);
+CREATE INDEX IF NOT EXISTS measurements_by_series ON measurements (series, metric);
+
+CREATE TRIGGER IF NOT EXISTS runs_append_only_update BEFORE UPDATE ON runs
+BEGIN SELECT RAISE(ABORT, 'performance history is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS runs_append_only_delete BEFORE DELETE ON runs
+BEGIN SELECT RAISE(ABORT, 'performance history is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS measurements_append_only_update BEFORE UPDATE ON measurements
+BEGIN SELECT RAISE(ABORT, 'performance history is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS measurements_append_only_delete BEFORE DELETE ON measurements
+BEGIN SELECT RAISE(ABORT, 'performance history is append-only'); END;
+"""
+
+
+def _now() -> str:
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime())
+
+
+def _days(timestamp: str) -> float:
+    """Days since the epoch for an ISO timestamp"""
+    return datetime.fromisoformat(timestamp.replace('Z', '+00:00')).timestamp() / 86400
+
+
+def _theil_sen(xs: List[float], ys: List[float]) -> Optional[float]:
+    """Median of pairwise slopes (robust to outlying runs)"""
+    slopes = [(ys[j] - ys[i]) / (xs[j] - xs[i])
+              for i in range(len(xs)) for j in range(i + 1, len(xs)) if xs[j] != xs[i]]
+    return statistics.median(slopes) if slopes else None
+
+
+def _mann_kendall(ys: List[float]) -> Tuple[float, float]:
+    """Mann-Kendall trend test: (z statistic, two-sided p-value)"""
+    n = len(ys)
+    s = sum((ys[j] > ys[i]) - (ys[j] < ys[i]) for i in range(n) for j in range(i + 1, n))
+    ties: Dict[float, int] = {}
+    for y in ys:
+        ties[y] = ties.get(y, 0) + 1
+    variance = (n * (n - 1) * (2 * n + 5)
+                - sum(t * (t - 1) * (2 * t + 5) for t in ties.values())) / 18
+    if variance <= 0:
+        return 0.0, 1.0
+    z = (s - 1) / math.sqrt(variance) if s > 0 else (s + 1) / math.sqrt(variance) if s < 0 else 0.0
+    return z, 2 * (1 - NormalDist().cdf(abs(z)))
+
+
+def _noise_sigma(ys: List[float]) -> float:
+    """
+    Robust noise estimate from successive differences
+
+    A level shift moves only one difference, so the MAD of the
+    differences estimates run-to-run noise even across change points.
+    """
+    diffs = [b - a for a, b in zip(ys, ys[1:])]
+    if not diffs:
+        return 0.0
+    center = statistics.median(diffs)
+    mad = statistics.median(abs(d - center) for d in diffs)
+    return mad / 0.6745 / math.sqrt(2)
+
+
+class PerformanceHistory:
+    """
+    Append-only performance timeseries
+
+    Every benchmark or capture run becomes one row in `runs`, keyed by
+    commit, date, compiler and optimization level, with one row per
+    (series, metric) in `measurements`. Triggers reject updates and
+    deletes, so history can only grow. Queries aggregate runs of the
+    same commit to their median and order commits by first recording.
+    """
+
+    def __init__(self, path: str = DEFAULT_HISTORY_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def record_run(self, source: str, commit_hash: str, measurements: List[Dict],
+                   version: Optional[str] = None, compiler: Optional[str] = None,
+                   optimization: Optional[str] = None, host: Optional[str] = None,
+                   environment: Optional[Dict] = None,
+                   recorded_at: Optional[str] = None) -> int:
+        """
+        Append one run and its measurements in a single transaction
+
+        measurements: dicts with 'series', 'metric', 'value' and optional
+            'unit', 'higher_is_better' and 'samples' (raw values)
+        Returns: the new run id
+        """
+        with self.conn:
+            cursor = self.conn.execute(
+                'INSERT INTO runs (source, commit_hash, version, recorded_at, compiler, '
+                'optimization, host, environment) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (source, commit_hash, version, recorded_at or _now(), compiler,
+                 optimization, host, json.dumps(environment) if environment else None)
+            )
+            run_id = cursor.lastrowid
+            self.conn.executemany(
+                'INSERT INTO measurements (run_id, series, metric, value, unit, '
+                'higher_is_better, samples) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [(run_id, m['series'], m['metric'], float(m['value']), m.get('unit'),
+                  int(bool(m.get('higher_is_better'))),
+                  json.dumps(m['samples']) if m.get('samples') else None)
+                 for m in measurements if m.get('value') is not None]
+            )
+        return run_id
+
+    def runs(self, source: Optional[str] = None) -> List[Dict]:
+        """All runs with their measurement counts"""
+        rows = self.conn.execute("""
+            SELECT r.id, r.source, r.commit_hash, r.version, r.recorded_at,
+                   r.compiler, r.optimization, r.host,
+                   COUNT(m.metric) AS measurements
+            FROM runs r LEFT JOIN measurements m ON m.run_id = r.id
+            WHERE (? IS NULL OR r.source = ?)
+            GROUP BY r.id ORDER BY r.recorded_at, r.id
+        """, (source, source)).fetchall()
+        return [dict(row) for row in rows]
+
+    def series(self, source: Optional[str] = None) -> List[Dict]:
+        """Every (series, metric) pair with its number of runs"""
+        rows = self.conn.execute("""
+            SELECT m.series, m.metric, m.unit, m.higher_is_better,
+                   COUNT(*) AS runs
+            FROM measurements m JOIN runs r ON r.id = m.run_id
+            WHERE (? IS NULL OR r.source = ?)
+            GROUP BY m.series, m.metric ORDER BY m.series, m.metric
+        """, (source, source)).fetchall()
+        return [dict(row) for row in rows]
+
+    def points(self, series: str, metric: str, source: Optional[str] = None,
+               compiler: Optional[str] = None, optimization: Optional[str] = None,
+               last: Optional[int] = None) -> List[Dict]:
+        """
+        One point per commit, oldest first: the median over that commit's runs
+
+        Only runs matching source, compiler and optimization (when given)
+        are used, so numbers from different toolchains never mix.
+        """
+        rows = self.conn.execute("""
+            SELECT r.commit_hash, r.recorded_at, m.value, m.higher_is_better
+            FROM measurements m JOIN runs r ON r.id = m.run_id
+            WHERE m.series = ? AND m.metric = ?
+              AND (? IS NULL OR r.source = ?)
+              AND (? IS NULL OR r.compiler = ?)
+              AND (? IS NULL OR r.optimization = ?)
+            ORDER BY r.recorded_at, r.id
+        """, (series, metric, source, source, compiler, compiler,
+              optimization, optimization)).fetchall()
+
+        commits: Dict[str, Dict] = {}
+        for row in rows:
+            point = commits.setdefault(row['commit_hash'], {
+                'commit_hash': row['commit_hash'],
+                'recorded_at': row['recorded_at'],
+                'higher_is_better': bool(row['higher_is_better']),
+                'values': [],
+            })
+            point['values'].append(row['value'])
+
+        points = []
+        for point in commits.values():
+            values = point.pop('values')
+            point['value'] = statistics.median(values)
+            point['runs'] = len(values)
+            points.append(point)
+        return points[-last:] if last else points
+
+    def rolling_baseline(self, series: str, metric: str, commits: int = 10,
+                         exclude_commit: Optional[str] = None, **key) -> Optional[Dict]:
+        """Median of the last `commits` per-commit values (optionally before exclude_commit)"""
+        points = [p for p in self.points(series, metric, **key)
+                  if p['commit_hash'] != exclude_commit][-commits:]
+        if not points:
+            return None
+        return {
+            'series': series,
+            'metric': metric,
+            'median': statistics.median(p['value'] for p in points),
+            'commits': len(points),
+            'first_commit': points[0]['commit_hash'],
+            'last_commit': points[-1]['commit_hash'],
+        }
+
+    def trend(self, series: str, metric: str, last: int = 20, **key) -> Optional[Dict]:
+        """
+        Monotonic drift over the last `last` commits
+
+        Theil-Sen slope (per commit and, when the points span time, per
+        week) relative to the median level, with a Mann-Kendall p-value.
+        A steady 1%-per-week creep shows up here long before any single
+        comparison crosses a threshold.
+        """
+        points = self.points(series, metric, last=last, **key)
+        if len(points) < 3:
+            return None
+        values = [p['value'] for p in points]
+        level = statistics.median(values) or 1.0
+        per_commit = _theil_sen(list(range(len(values))), values) or 0.0
+        days = [_days(p['recorded_at']) for p in points]
+        per_day = _theil_sen(days, values) if days[-1] > days[0] else None
+        z, p_value = _mann_kendall(values)
+        higher_is_better = points[0]['higher_is_better']
+        change = per_commit * (len(values) - 1) / level * 100
+        return {
+            'series': series,
+            'metric': metric,
+            'commits': len(points),
+            'first_commit': points[0]['commit_hash'],
+            'last_commit': points[-1]['commit_hash'],
+            'slope_pct_per_commit': per_commit / level * 100,
+            'slope_pct_per_week': per_day * 7 / level * 100 if per_day is not None else None,
+            'total_change_pct': change,
+            'p_value': p_value,
+            'worsening': (change < 0) if higher_is_better else (change > 0),
+        }
+
+    def change_points(self, series: str, metric: str, last: Optional[int] = None,
+                      min_size: int = 3, threshold: float = 4.0,
+                      min_change_pct: float = 0.5, **key) -> List[Dict]:
+        """
+        Level shifts in the per-commit series (binary segmentation)
+
+        The split that best separates two segment means is accepted when
+        the shift exceeds `threshold` noise standard errors (noise from
+        successive differences) and `min_change_pct` of the level; both
+        halves are then searched again.
+        """
+        points = self.points(series, metric, last=last, **key)
+        values = [p['value'] for p in points]
+        sigma = _noise_sigma(values)
+        found: List[int] = []
+
+        def split(start: int, end: int):
+            best, best_score = None, 0.0
+            for k in range(start + min_size, end - min_size + 1):
+                left, right = values[start:k], values[k:end]
+                shift = abs(statistics.mean(right) - statistics.mean(left))
+                stderr = sigma * math.sqrt(1 / len(left) + 1 / len(right))
+                score = shift / stderr if stderr > 0 else (math.inf if shift else 0.0)
+                if score > best_score:
+                    best, best_score = k, score
+            if best is None or best_score < threshold:
+                return
+            before = statistics.median(values[start:best])
+            after = statistics.median(values[best:end])
+            if before and abs(after - before) / abs(before) * 100 < min_change_pct:
+                return
+            found.append(best)
+            split(start, best)
+            split(best, end)
+
+        split(0, len(values))
+
+        changes = []
+        bounds = [0] + sorted(found) + [len(values)]
+        for i, index in enumerate(sorted(found), start=1):
+            before = statistics.median(values[bounds[i - 1]:index])
+            after = statistics.median(values[index:bounds[i + 1]])
+            change = (after - before) / before * 100 if before else 0.0
+            changes.append({
+                'series': series,
+                'metric': metric,
+                'commit_hash': points[index]['commit_hash'],
+                'recorded_at': points[index]['recorded_at'],
+                'before': before,
+                'after': after,
+                'change_pct': change,
+                'worsening': (change < 0) if points[index]['higher_is_better'] else (change > 0),
+            })
+        return changes
+
+    def drift(self, source: Optional[str] = None, last: int = 20, alpha: float = 0.01,
+              min_pct_per_commit: float = 0.2, **key) -> List[Dict]:
+        """
+        Series that are getting worse: significant trend or a worsening
+        level shift within the last `last` commits
+        """
+        findings = []
+        for entry in self.series(source):
+            trend = self.trend(entry['series'], entry['metric'], last=last, source=source, **key)
+            if (trend and trend['worsening'] and trend['p_value'] < alpha
+                    and abs(trend['slope_pct_per_commit']) >= min_pct_per_commit):
+                findings.append({'kind': 'trend', **trend})
+            for change in self.change_points(entry['series'], entry['metric'], last=last,
+                                             source=source, **key):
+                if change['worsening']:
+                    findings.append({'kind': 'change_point', **change})
+        return findings
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description='Query the performance history database'
+    )
+    parser.add_argument(
+        '--db',
+        default=DEFAULT_HISTORY_PATH,
+        help=f'History database (default: {DEFAULT_HISTORY_PATH})'
+    )
+    parser.add_argument('--source', help='Only runs from this source '
+                        '(polyorb-benchmark, baseline-capture)')
+    parser.add_argument('--compiler', help='Only runs built with this compiler')
+    parser.add_argument('--optimization', help='Only runs at this optimization level')
+    parser.add_argument(
+        '--json',
+        action='store_true',
+        help='Print results as JSON'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('runs', help='List recorded runs')
+    subparsers.add_parser('series', help='List recorded series and metrics')
+    for name, help_text in (('points', 'Per-commit values of one series'),
+                            ('trend', 'Drift of one series over the last commits'),
+                            ('baseline', 'Rolling baseline: median of the last N commits'),
+                            ('change-points', 'Level shifts in one series')):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument('series', help='Operation or endpoint, e.g. Finalize')
+        sub.add_argument('metric', help='Metric, e.g. median_ms')
+        sub.add_argument('--last', type=int, default=20,
+                         help='Number of most recent commits (default: 20)')
+    drift_parser = subparsers.add_parser(
+        'drift', help='Series getting worse (exit code 1 if any)')
+    drift_parser.add_argument('--last', type=int, default=20,
+                              help='Number of most recent commits (default: 20)')
+    drift_parser.add_argument('--alpha', type=float, default=0.01,
+                              help='Significance level for trends (default: 0.01)')
+
+    args = parser.parse_args()
+
+    if not Path(args.db).exists():
+        print(f"Error: History database not found: {args.db}")
+        sys.exit(1)
+
+    key = {'source': args.source, 'compiler': args.compiler, 'optimization': args.optimization}
+    history = PerformanceHistory(args.db)
+    exit_code = 0
+    try:
+        if args.command == 'runs':
+            result = history.runs(args.source)
+        elif args.command == 'series':
+            result = history.series(args.source)
+        elif args.command == 'points':
+            result = history.points(args.series, args.metric, last=args.last, **key)
+        elif args.command == 'trend':
+            result = history.trend(args.series, args.metric, last=args.last, **key)
+        elif args.command == 'baseline':
+            result = history.rolling_baseline(args.series, args.metric, commits=args.last, **key)
+        elif args.command == 'change-points':
+            result = history.change_points(args.series, args.metric, last=args.last, **key)
+        else:
+            source = key.pop('source')
+            result = history.drift(source, last=args.last, alpha=args.alpha, **key)
+            exit_code = 1 if result else 0
+
+        if args.json or result is None:
+            print(json.dumps(result, indent=2))
+        elif args.command == 'runs':
+            for run in result:
+                print(f"Run {run['id']:4d}  {run['recorded_at']}  {run['commit_hash'][:8]}  "
+                      f"{run['source']:18s} {run['compiler'] or '-'} {run['optimization'] or '-'}  "
+                      f"{run['measurements']} measurements")
+        elif args.command == 'series':
+            for entry in result:
+                direction = 'higher is better' if entry['higher_is_better'] else 'lower is better'
+                print(f"{entry['series']:40s} {entry['metric']:22s} {entry['runs']:5d} runs  "
+                      f"({entry['unit'] or '-'}, {direction})")
+        elif args.command == 'points':
+            for point in result:
+                print(f"{point['recorded_at']}  {point['commit_hash'][:8]}  {point['value']:12.3f}  "
+                      f"({point['runs']} run{'s' if point['runs'] != 1 else ''})")
+        elif args.command == 'trend':
+            per_week = (f", {result['slope_pct_per_week']:+.2f}%/week"
+                        if result['slope_pct_per_week'] is not None else "")
+            print(f"{args.series} {args.metric} over {result['commits']} commits: "
+                  f"{result['slope_pct_per_commit']:+.2f}%/commit{per_week}, "
+                  f"{result['total_change_pct']:+.1f}% total (p={result['p_value']:.3g})"
+                  f"{'  ⚠️  worsening' if result['worsening'] and result['p_value'] < 0.05 else ''}")
+        elif args.command == 'baseline':
+            print(f"{args.series} {args.metric}: {result['median']:.3f} "
+                  f"(median of {result['commits']} commits, "
+                  f"{result['first_commit'][:8]}..{result['last_commit'][:8]})")
+        elif args.command == 'change-points':
+            if not result:
+                print("No change points")
+            for change in result:
+                print(f"{change['recorded_at']}  {change['commit_hash'][:8]}  "
+                      f"{change['before']:.3f} → {change['after']:.3f} ({change['change_pct']:+.1f}%)"
+                      f"{'  ⚠️  worse' if change['worsening'] else ''}")
+        else:
+            if not result:
+                print("✅ No performance drift")
+            for finding in result:
+                if finding['kind'] == 'trend':
+                    print(f"⚠️  {finding['series']} {finding['metric']}: creeping "
+                          f"{finding['slope_pct_per_commit']:+.2f}%/commit over "
+                          f"{finding['commits']} commits (p={finding['p_value']:.3g})")
+                else:
+                    print(f"⚠️  {finding['series']} {finding['metric']}: level shift "
+                          f"{finding['change_pct']:+.1f}% at {finding['commit_hash'][:8]}")
+    finally:
+        history.close()
+    sys.exit(exit_code)
+
+
+if __name__ == '__main__':
+    main()
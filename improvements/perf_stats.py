@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Statistics for Performance Regression Detection
+Rank tests, bootstrap intervals and effect sizes on raw benchmark samples
+
+Author: @test_stabilize
+Context: RDB-004 Task 6 - regression gating on noisy CI machines
+"""
+
+import bisect
+import math
+import random
+import statistics
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import List, Sequence, Tuple
+
+
+# Exact Mann-Whitney distribution up to this many samples per side
+EXACT_LIMIT = 30
+
+
+@dataclass
+class SampleComparison:
+    """Outcome of comparing current samples against baseline samples"""
+    verdict: str                    # regression, improvement, unchanged, inconclusive
+    change_percent: float           # change of the gated percentile (median by default)
+    ci_low_percent: float           # bootstrap CI of that change
+    ci_high_percent: float
+    p_slower: float                 # one-sided p: current slower (Mann-Whitney for the
+    p_faster: float                 # median, bootstrap for other percentiles)
+    cliffs_delta: float             # P(current > baseline) - P(current < baseline)
+    baseline_runs: int
+    current_runs: int
+
+
+def _mann_whitney_exact_cdf(u: int, m: int, n: int) -> float:
+    """P(U <= u) under H0 for sample sizes m, n without ties"""
+    # Number of orderings with statistic u, via the recurrence
+    # f(u; m, n) = f(u - n; m - 1, n) + f(u; m, n - 1)
+    table = {}
+
+    def frequency(u: int, m: int, n: int) -> int:
+        if u < 0:
+            return 0
+        if m == 0 or n == 0:
+            return 1 if u == 0 else 0
+        key = (u, m, n)
+        if key not in table:
+            table[key] = frequency(u - n, m - 1, n) + frequency(u, m, n - 1)
+        return table[key]
+
+    total = math.comb(m + n, m)
+    return sum(frequency(k, m, n) for k in range(u + 1)) / total
+
+
+def mann_whitney(current: Sequence[float], baseline: Sequence[float]) -> Tuple[float, float]:
+    """
+    One-sided Mann-Whitney U tests
+
+    Returns: (p that current is stochastically larger, p that it is smaller).
+    Small tie-free samples use the exact null distribution, everything
+    else the normal approximation with tie and continuity correction.
+    """
+    m, n = len(current), len(baseline)
+    if not m or not n:
+        return 1.0, 1.0
+
+    combined = sorted((value, group) for group, values in enumerate((current, baseline))
+                      for value in values)
+    ranks = [0.0] * len(combined)
+    ties = []
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        if j > i:
+            ties.append(j - i + 1)
+        i = j + 1
+
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 0)
+    u_current = rank_sum - m * (m + 1) / 2          # pairs where current > baseline
+    u_baseline = m * n - u_current
+
+    if not ties and m <= EXACT_LIMIT and n <= EXACT_LIMIT:
+        p_larger = _mann_whitney_exact_cdf(int(round(u_baseline)), m, n)
+        p_smaller = _mann_whitney_exact_cdf(int(round(u_current)), m, n)
+        return min(1.0, p_larger), min(1.0, p_smaller)
+
+    size = m + n
+    tie_term = sum(t ** 3 - t for t in ties) / (size * (size - 1))
+    sigma = math.sqrt(m * n / 12 * ((size + 1) - tie_term))
+    if sigma == 0:
+        return 1.0, 1.0
+    mean = m * n / 2
+    normal = NormalDist()
+    p_larger = 1 - normal.cdf((u_current - mean - 0.5) / sigma)
+    p_smaller = normal.cdf((u_current - mean + 0.5) / sigma)
+    return p_larger, p_smaller
+
+
+def cliffs_delta(current: Sequence[float], baseline: Sequence[float]) -> float:
+    """Cliff's delta effect size in [-1, 1]; positive means current is larger"""
+    if not current or not baseline:
+        return 0.0
+    ordered = sorted(baseline)
+    greater = sum(bisect.bisect_left(ordered, c) for c in current)
+    smaller = sum(len(ordered) - bisect.bisect_right(ordered, c) for c in current)
+    return (greater - smaller) / (len(current) * len(baseline))
+
+
+def quantile(values: Sequence[float], percent: float) -> float:
+    """Linearly interpolated percentile (0-100); percent=50 is the median"""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * percent / 100
+    low = int(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def _bootstrap_changes(current: Sequence[float], baseline: Sequence[float],
+                       resamples: int, seed: int, percentile: float) -> List[float]:
+    """Sorted bootstrap distribution of the relative change in a percentile, in percent"""
+    rng = random.Random(seed)
+    changes = []
+    for _ in range(resamples):
+        base = quantile(rng.choices(baseline, k=len(baseline)), percentile)
+        cur = quantile(rng.choices(current, k=len(current)), percentile)
+        if base > 0:
+            changes.append((cur - base) / base * 100)
+    changes.sort()
+    return changes
+
+
+def _interval(changes: List[float], confidence: float) -> Tuple[float, float]:
+    if not changes:
+        return 0.0, 0.0
+    tail = (1 - confidence) / 2
+    low = changes[int(tail * (len(changes) - 1))]
+    high = changes[int(math.ceil((1 - tail) * (len(changes) - 1)))]
+    return low, high
+
+
+def bootstrap_change_ci(current: Sequence[float], baseline: Sequence[float],
+                        confidence: float = 0.95, resamples: int = 2000,
+                        seed: int = 0, percentile: float = 50.0) -> Tuple[float, float]:
+    """Percentile bootstrap CI of the relative change in a percentile (median), in percent"""
+    return _interval(_bootstrap_changes(current, baseline, resamples, seed, percentile), confidence)
+
+
+def bootstrap_p(changes: List[float]) -> Tuple[float, float]:
+    """One-sided bootstrap p-values (current larger, current smaller) from resampled changes"""
+    slower = sum(1 for change in changes if change <= 0)
+    faster = sum(1 for change in changes if change >= 0)
+    return (slower + 1) / (len(changes) + 1), (faster + 1) / (len(changes) + 1)
+
+
+def compare_samples(current: Sequence[float], baseline: Sequence[float],
+                    threshold_percent: float = 5.0, alpha: float = 0.01,
+                    confidence: float = 0.95, percentile: float = 50.0) -> SampleComparison:
+    """
+    Classify the change between two sets of timings (lower is better)
+
+    The gated statistic is the given percentile (default: the median);
+    the change, its bootstrap CI, the threshold and the significance test
+    all refer to it. The median is tested with Mann-Whitney. A rank test
+    misses shifts confined to the tail, so other percentiles are tested
+    on the bootstrap distribution of their own change.
+
+    regression / improvement: the one-sided rank test is significant at
+        alpha AND the percentile moved by at least threshold_percent
+    unchanged: the bootstrap CI of the change lies within +-threshold,
+        or the shift is significant but too small to matter
+    inconclusive: anything else -- more runs are needed to decide
+    """
+    base_value = quantile(baseline, percentile)
+    change = (quantile(current, percentile) - base_value) / base_value * 100 if base_value else 0.0
+    changes = _bootstrap_changes(current, baseline, 2000, 0, percentile)
+    ci_low, ci_high = _interval(changes, confidence)
+    if percentile == 50.0:
+        p_slower, p_faster = mann_whitney(current, baseline)
+    else:
+        p_slower, p_faster = bootstrap_p(changes)
+
+    if p_slower < alpha and change >= threshold_percent:
+        verdict = 'regression'
+    elif p_faster < alpha and change <= -threshold_percent:
+        verdict = 'improvement'
+    elif -threshold_percent < ci_low and ci_high < threshold_percent:
+        verdict = 'unchanged'
+    elif min(p_slower, p_faster) < alpha and abs(change) < threshold_percent:
+        verdict = 'unchanged'
+    else:
+        verdict = 'inconclusive'
+
+    return SampleComparison(
+        verdict=verdict,
+        change_percent=change,
+        ci_low_percent=ci_low,
+        ci_high_percent=ci_high,
+        p_slower=p_slower,
+        p_faster=p_faster,
+        cliffs_delta=cliffs_delta(current, baseline),
+        baseline_runs=len(baseline),
+        current_runs=len(current),
+    )
+
+
+def format_p(p: float) -> str:
+    """Render a p-value the way reports quote it"""
+    for bound in (0.001, 0.01, 0.05):
+        if p < bound:
+            return f"p<{bound:g}"
+    return f"p={p:.2f}"
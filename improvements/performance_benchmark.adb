@@ -25,14 +25,32 @@
 --
 --  Purpose: Measure hot path execution times for regression detection
 --
+--  Usage:
+--    performance_benchmark <operation> [iterations]   one benchmark, text
+--    performance_benchmark --batch                    line protocol on stdin
+--
+--  Batch mode reads "<operation> <iterations> <runs>" requests, one per
+--  line, until EOF or QUIT, and answers each run with a JSON line:
+--    {"operation":"Finalize","iterations":10000,"run":1,"time_ms":1.234567}
+--  followed by {"operation":"Finalize","done":true}. Each run line also
+--  carries "histogram": the per-iteration latencies in nanoseconds, in the
+--  log-linear bucket layout of latency_histogram.py, as sparse
+--  [index, count] pairs. "time_ms" is the sum of the same per-iteration
+--  latencies, net of the timer's own cost, so the instrumentation does
+--  not inflate it. Startup and TypeCode
+--  setup are paid once for the whole session; a {"ready":true} line is
+--  written when the driver accepts requests.
+--
 --  Author: @test_stabilize
 --  Date: 2025-11-07 (Day 4)
 --  Context: RDB-004 Task 6 Pre-Work
 
 with Ada.Text_IO;         use Ada.Text_IO;
 with Ada.Command_Line;    use Ada.Command_Line;
-with Ada.Calendar;        use Ada.Calendar;
-with Ada.Real_Time;       use Ada.Real_Time;
+with Ada.Strings;         use Ada.Strings;
+with Ada.Strings.Fixed;   use Ada.Strings.Fixed;
+with Ada.Real_Time;       use type Ada.Real_Time.Time;
+                          use type Ada.Real_Time.Time_Span;
 with PolyORB.Any;
 with PolyORB.Types;
 
@@ -44,7 +62,117 @@ procedure Performance_Benchmark is
    TC_String  : constant := 2;
    TC_Struct  : constant := 3;
 
-   package Duration_IO is new Ada.Text_IO.Float_IO (Duration);
+   package Duration_IO is new Ada.Text_IO.Fixed_IO (Duration);
+
+   --  Set by --batch: results go out as JSON lines (see header)
+   Batch_Mode : Boolean := False;
+   Batch_Run  : Positive := 1;
+
+   ---------------------------------------------------------------------------
+   -- Per-iteration latency histogram
+   ---------------------------------------------------------------------------
+
+   --  Values below 2**Sub_Bucket_Bits ns are exact; above, each power of
+   --  two is split into Sub_Bucket_Half buckets (within 1/64 of the value).
+   --  Must match DEFAULT_SUB_BUCKET_BITS in latency_histogram.py.
+   Sub_Bucket_Bits  : constant := 7;
+   Sub_Bucket_Count : constant := 2 ** Sub_Bucket_Bits;
+   Sub_Bucket_Half  : constant := Sub_Bucket_Count / 2;
+   --  Up to 2**40 ns (about 18 minutes) per iteration
+   Bucket_Count     : constant := Sub_Bucket_Count + (40 - Sub_Bucket_Bits + 1) * Sub_Bucket_Half;
+
+   type Bucket_Counts is array (0 .. Bucket_Count - 1) of Long_Long_Integer;
+
+   Latency_Counts : Bucket_Counts := (others => 0);
+   Latency_Min    : Long_Long_Integer := Long_Long_Integer'Last;
+   Latency_Max    : Long_Long_Integer := 0;
+
+   --  Cost of an empty Clock - Clock span, subtracted from every iteration
+   --  so neither the histogram nor the totals include the timer itself
+   Clock_Overhead : Ada.Real_Time.Time_Span := Ada.Real_Time.Time_Span_Zero;
+
+   --  Sum of the recorded iterations: a run's total, without the time
+   --  spent recording them
+   Measured_Time  : Ada.Real_Time.Time_Span := Ada.Real_Time.Time_Span_Zero;
+
+   procedure Calibrate_Clock is
+      Start : Ada.Real_Time.Time;
+      Span  : Ada.Real_Time.Time_Span;
+   begin
+      Clock_Overhead := Ada.Real_Time.Time_Span_Last;
+      for I in 1 .. 1_000 loop
+         Start := Ada.Real_Time.Clock;
+         Span := Ada.Real_Time.Clock - Start;
+         if Span < Clock_Overhead then
+            Clock_Overhead := Span;
+         end if;
+      end loop;
+   end Calibrate_Clock;
+
+   function Bucket_Index (Nanoseconds : Long_Long_Integer) return Natural is
+      Value    : Long_Long_Integer := Nanoseconds;
+      Exponent : Natural := 0;
+   begin
+      if Value < Sub_Bucket_Count then
+         return Natural (Long_Long_Integer'Max (Value, 0));
+      end if;
+      while Value >= Sub_Bucket_Count loop
+         Value := Value / 2;
+         Exponent := Exponent + 1;
+      end loop;
+      --  Value is now in Sub_Bucket_Half .. Sub_Bucket_Count - 1
+      return Natural'Min
+        (Sub_Bucket_Count + (Exponent - 1) * Sub_Bucket_Half
+           + Natural (Value) - Sub_Bucket_Half,
+         Bucket_Count - 1);
+   end Bucket_Index;
+
+   procedure Record_Latency (Span : Ada.Real_Time.Time_Span) is
+      Net         : constant Ada.Real_Time.Time_Span :=
+        (if Span > Clock_Overhead then Span - Clock_Overhead
+         else Ada.Real_Time.Time_Span_Zero);
+      Nanoseconds : constant Long_Long_Integer :=
+        Long_Long_Integer (Ada.Real_Time.To_Duration (Net) * 1_000_000_000);
+      Index       : constant Natural := Bucket_Index (Nanoseconds);
+   begin
+      Measured_Time := Measured_Time + Net;
+      Latency_Counts (Index) := Latency_Counts (Index) + 1;
+      Latency_Min := Long_Long_Integer'Min (Latency_Min, Nanoseconds);
+      Latency_Max := Long_Long_Integer'Max (Latency_Max, Nanoseconds);
+   end Record_Latency;
+
+   procedure Reset_Histogram is
+   begin
+      Latency_Counts := (others => 0);
+      Latency_Min := Long_Long_Integer'Last;
+      Latency_Max := 0;
+      Measured_Time := Ada.Real_Time.Time_Span_Zero;
+   end Reset_Histogram;
+
+   --  Write the histogram as a JSON object (no newline) and clear it
+   procedure Put_Histogram is
+      First : Boolean := True;
+   begin
+      Put ("{""sub_bucket_bits"":" & Trim (Integer'Image (Sub_Bucket_Bits), Both)
+           & ",""unit"":""ns""");
+      if Latency_Max > 0 or else Latency_Counts (0) > 0 then
+         Put (",""min"":" & Trim (Long_Long_Integer'Image (Latency_Min), Both)
+              & ",""max"":" & Trim (Long_Long_Integer'Image (Latency_Max), Both));
+      end if;
+      Put (",""buckets"":[");
+      for Index in Latency_Counts'Range loop
+         if Latency_Counts (Index) > 0 then
+            if not First then
+               Put (",");
+            end if;
+            First := False;
+            Put ("[" & Trim (Integer'Image (Index), Both) & ","
+                 & Trim (Long_Long_Integer'Image (Latency_Counts (Index)), Both) & "]");
+         end if;
+      end loop;
+      Put ("]}");
+      Reset_Histogram;
+   end Put_Histogram;
 
    --  Benchmark configuration
    type Benchmark_Config is record
@@ -62,7 +190,23 @@ procedure Performance_Benchmark is
 
    procedure Print_Result (Result : Benchmark_Result) is
       Time_Ms : constant Duration := Result.Total_Time * 1000.0;
+      Buffer  : String (1 .. 40);
    begin
+      if Batch_Mode then
+         Duration_IO.Put (Buffer, Time_Ms, Aft => 6, Exp => 0);
+         Put ("{""operation"":""" & Trim (Result.Operation, Both)
+              & """,""iterations"":" & Trim (Result.Iterations'Image, Both)
+              & ",""run"":" & Trim (Batch_Run'Image, Both)
+              & ",""time_ms"":" & Trim (Buffer, Both) & ",""histogram"":");
+         Put_Histogram;
+         Put_Line ("}");
+         Flush;
+         return;
+      end if;
+
+      --  Text mode reports totals only
+      Reset_Histogram;
+
       Put ("Operation: ");
       Put (Result.Operation);
       Put (", Iterations: ");
@@ -77,12 +221,11 @@ procedure Performance_Benchmark is
    ---------------------------------------------------------------------------
 
    procedure Benchmark_Get_Empty_Any (Iterations : Natural) is
-      Start_Time, End_Time : Time;
       Elapsed : Duration;
+      Iteration_Start : Ada.Real_Time.Time;
    begin
-      Start_Time := Clock;
-
       for I in 1 .. Iterations loop
+         Iteration_Start := Ada.Real_Time.Clock;
          declare
             A : PolyORB.Any.Any;
          begin
@@ -90,10 +233,10 @@ procedure Performance_Benchmark is
             --  Placeholder: allocation simulation
             null;
          end;
+         Record_Latency (Ada.Real_Time.Clock - Iteration_Start);
       end loop;
 
-      End_Time := Clock;
-      Elapsed := End_Time - Start_Time;
+      Elapsed := Ada.Real_Time.To_Duration (Measured_Time);
 
       Print_Result ((
          Operation   => "Get_Empty_Any                 ",
@@ -108,12 +251,11 @@ procedure Performance_Benchmark is
    ---------------------------------------------------------------------------
 
    procedure Benchmark_Finalize (Iterations : Natural) is
-      Start_Time, End_Time : Time;
       Elapsed : Duration;
+      Iteration_Start : Ada.Real_Time.Time;
    begin
-      Start_Time := Clock;
-
       for I in 1 .. Iterations loop
+         Iteration_Start := Ada.Real_Time.Clock;
          declare
             A : PolyORB.Any.Any;
          begin
@@ -121,10 +263,10 @@ procedure Performance_Benchmark is
             --  Finalize happens at end of scope
             null;
          end;
+         Record_Latency (Ada.Real_Time.Clock - Iteration_Start);
       end loop;
 
-      End_Time := Clock;
-      Elapsed := End_Time - Start_Time;
+      Elapsed := Ada.Real_Time.To_Duration (Measured_Time);
 
       Print_Result ((
          Operation   => "Finalize                      ",
@@ -139,24 +281,23 @@ procedure Performance_Benchmark is
    ---------------------------------------------------------------------------
 
    procedure Benchmark_Adjust (Iterations : Natural) is
-      Start_Time, End_Time : Time;
       Elapsed : Duration;
+      Iteration_Start : Ada.Real_Time.Time;
       A1 : PolyORB.Any.Any;
    begin
       --  A1 := PolyORB.Any.Get_Empty_Any (TC_Long);
 
-      Start_Time := Clock;
-
       for I in 1 .. Iterations loop
+         Iteration_Start := Ada.Real_Time.Clock;
          declare
             A2 : PolyORB.Any.Any;
          begin
             A2 := A1;  -- Triggers Adjust
          end;
+         Record_Latency (Ada.Real_Time.Clock - Iteration_Start);
       end loop;
 
-      End_Time := Clock;
-      Elapsed := End_Time - Start_Time;
+      Elapsed := Ada.Real_Time.To_Duration (Measured_Time);
 
       Print_Result ((
          Operation   => "Adjust                        ",
@@ -171,23 +312,22 @@ procedure Performance_Benchmark is
    ---------------------------------------------------------------------------
 
    procedure Benchmark_From_Any (Iterations : Natural) is
-      Start_Time, End_Time : Time;
       Elapsed : Duration;
+      Iteration_Start : Ada.Real_Time.Time;
       A : PolyORB.Any.Any;
       V : PolyORB.Types.Long;
    begin
       --  A := PolyORB.Any.Get_Empty_Any (TC_Long);
       --  PolyORB.Any.From_Any (A, V);  -- Initialize
 
-      Start_Time := Clock;
-
       for I in 1 .. Iterations loop
+         Iteration_Start := Ada.Real_Time.Clock;
          --  V := PolyORB.Any.To_Any (A);
          V := V;  -- Placeholder
+         Record_Latency (Ada.Real_Time.Clock - Iteration_Start);
       end loop;
 
-      End_Time := Clock;
-      Elapsed := End_Time - Start_Time;
+      Elapsed := Ada.Real_Time.To_Duration (Measured_Time);
 
       Print_Result ((
          Operation   => "From_Any                      ",
@@ -202,21 +342,20 @@ procedure Performance_Benchmark is
    ---------------------------------------------------------------------------
 
    procedure Benchmark_To_Any (Iterations : Natural) is
-      Start_Time, End_Time : Time;
       Elapsed : Duration;
+      Iteration_Start : Ada.Real_Time.Time;
       A : PolyORB.Any.Any;
    begin
       --  A := PolyORB.Any.Get_Empty_Any (TC_Long);
 
-      Start_Time := Clock;
-
       for I in 1 .. Iterations loop
+         Iteration_Start := Ada.Real_Time.Clock;
          --  PolyORB.Any.From_Any (A, PolyORB.Types.Long (I));
          null;  -- Placeholder
+         Record_Latency (Ada.Real_Time.Clock - Iteration_Start);
       end loop;
 
-      End_Time := Clock;
-      Elapsed := End_Time - Start_Time;
+      Elapsed := Ada.Real_Time.To_Duration (Measured_Time);
 
       Print_Result ((
          Operation   => "To_Any                        ",
@@ -231,22 +370,21 @@ procedure Performance_Benchmark is
    ---------------------------------------------------------------------------
 
    procedure Benchmark_Get_Type (Iterations : Natural) is
-      Start_Time, End_Time : Time;
       Elapsed : Duration;
+      Iteration_Start : Ada.Real_Time.Time;
       A : PolyORB.Any.Any;
       TC : Integer;  -- Placeholder for TypeCode
    begin
       --  A := PolyORB.Any.Get_Empty_Any (TC_Long);
 
-      Start_Time := Clock;
-
       for I in 1 .. Iterations loop
+         Iteration_Start := Ada.Real_Time.Clock;
          --  TC := PolyORB.Any.Get_Type (A);
          TC := TC_Long;  -- Placeholder
+         Record_Latency (Ada.Real_Time.Clock - Iteration_Start);
       end loop;
 
-      End_Time := Clock;
-      Elapsed := End_Time - Start_Time;
+      Elapsed := Ada.Real_Time.To_Duration (Measured_Time);
 
       Print_Result ((
          Operation   => "Get_Type                      ",
@@ -261,22 +399,21 @@ procedure Performance_Benchmark is
    ---------------------------------------------------------------------------
 
    procedure Benchmark_Is_Empty (Iterations : Natural) is
-      Start_Time, End_Time : Time;
       Elapsed : Duration;
+      Iteration_Start : Ada.Real_Time.Time;
       A : PolyORB.Any.Any;
       Empty : Boolean;
    begin
       --  A := PolyORB.Any.Get_Empty_Any (TC_Long);
 
-      Start_Time := Clock;
-
       for I in 1 .. Iterations loop
+         Iteration_Start := Ada.Real_Time.Clock;
          --  Empty := PolyORB.Any.Is_Empty (A);
          Empty := False;  -- Placeholder
+         Record_Latency (Ada.Real_Time.Clock - Iteration_Start);
       end loop;
 
-      End_Time := Clock;
-      Elapsed := End_Time - Start_Time;
+      Elapsed := Ada.Real_Time.To_Duration (Measured_Time);
 
       Print_Result ((
          Operation   => "Is_Empty                      ",
@@ -291,25 +428,24 @@ procedure Performance_Benchmark is
    ---------------------------------------------------------------------------
 
    procedure Benchmark_Clone (Iterations : Natural) is
-      Start_Time, End_Time : Time;
       Elapsed : Duration;
+      Iteration_Start : Ada.Real_Time.Time;
       A1 : PolyORB.Any.Any;
    begin
       --  A1 := PolyORB.Any.Get_Empty_Any (TC_Struct);
 
-      Start_Time := Clock;
-
       for I in 1 .. Iterations loop
+         Iteration_Start := Ada.Real_Time.Clock;
          declare
             A2 : PolyORB.Any.Any;
          begin
             --  A2 := PolyORB.Any.Clone (A1);
             A2 := A1;  -- Placeholder (shallow copy for demo)
          end;
+         Record_Latency (Ada.Real_Time.Clock - Iteration_Start);
       end loop;
 
-      End_Time := Clock;
-      Elapsed := End_Time - Start_Time;
+      Elapsed := Ada.Real_Time.To_Duration (Measured_Time);
 
       Print_Result ((
          Operation   => "Clone                         ",
@@ -324,21 +460,20 @@ procedure Performance_Benchmark is
    ---------------------------------------------------------------------------
 
    procedure Benchmark_Set_Type (Iterations : Natural) is
-      Start_Time, End_Time : Time;
       Elapsed : Duration;
+      Iteration_Start : Ada.Real_Time.Time;
       A : PolyORB.Any.Any;
    begin
       --  A := PolyORB.Any.Get_Empty_Any (TC_Long);
 
-      Start_Time := Clock;
-
       for I in 1 .. Iterations loop
+         Iteration_Start := Ada.Real_Time.Clock;
          --  PolyORB.Any.Set_Type (A, TC_String);
          null;  -- Placeholder
+         Record_Latency (Ada.Real_Time.Clock - Iteration_Start);
       end loop;
 
-      End_Time := Clock;
-      Elapsed := End_Time - Start_Time;
+      Elapsed := Ada.Real_Time.To_Duration (Measured_Time);
 
       Print_Result ((
          Operation   => "Set_Type                      ",
@@ -353,21 +488,20 @@ procedure Performance_Benchmark is
    ---------------------------------------------------------------------------
 
    procedure Benchmark_Get_Aggregate_Element (Iterations : Natural) is
-      Start_Time, End_Time : Time;
       Elapsed : Duration;
+      Iteration_Start : Ada.Real_Time.Time;
       A_Struct, A_Element : PolyORB.Any.Any;
    begin
       --  A_Struct := PolyORB.Any.Get_Empty_Any (TC_Struct);
 
-      Start_Time := Clock;
-
       for I in 1 .. Iterations loop
+         Iteration_Start := Ada.Real_Time.Clock;
          --  A_Element := PolyORB.Any.Get_Aggregate_Element (A_Struct, 0);
          A_Element := A_Struct;  -- Placeholder
+         Record_Latency (Ada.Real_Time.Clock - Iteration_Start);
       end loop;
 
-      End_Time := Clock;
-      Elapsed := End_Time - Start_Time;
+      Elapsed := Ada.Real_Time.To_Duration (Measured_Time);
 
       Print_Result ((
          Operation   => "Get_Aggregate_Element         ",
@@ -377,16 +511,118 @@ procedure Performance_Benchmark is
       ));
    end Benchmark_Get_Aggregate_Element;
 
+   ---------------------------------------------------------------------------
+   -- Dispatch
+   ---------------------------------------------------------------------------
+
+   function Run_Benchmark
+     (Operation : String; Iterations : Natural) return Boolean
+   is
+   begin
+      if Operation = "Get_Empty_Any" then
+         Benchmark_Get_Empty_Any (Iterations);
+      elsif Operation = "Finalize" then
+         Benchmark_Finalize (Iterations);
+      elsif Operation = "Adjust" then
+         Benchmark_Adjust (Iterations);
+      elsif Operation = "From_Any" then
+         Benchmark_From_Any (Iterations);
+      elsif Operation = "To_Any" then
+         Benchmark_To_Any (Iterations);
+      elsif Operation = "Get_Type" then
+         Benchmark_Get_Type (Iterations);
+      elsif Operation = "Is_Empty" then
+         Benchmark_Is_Empty (Iterations);
+      elsif Operation = "Clone" then
+         Benchmark_Clone (Iterations);
+      elsif Operation = "Set_Type" then
+         Benchmark_Set_Type (Iterations);
+      elsif Operation = "Get_Aggregate_Element" then
+         Benchmark_Get_Aggregate_Element (Iterations);
+      else
+         return False;
+      end if;
+      return True;
+   end Run_Benchmark;
+
+   ---------------------------------------------------------------------------
+   -- Batch Mode
+   ---------------------------------------------------------------------------
+
+   procedure Run_Batch is
+
+      procedure Reply_Error (Operation, Message : String) is
+      begin
+         Put_Line ("{""operation"":""" & Operation & """,""error"":"""
+                   & Message & """}");
+         Flush;
+      end Reply_Error;
+
+   begin
+      Batch_Mode := True;
+      Put_Line ("{""ready"":true}");
+      Flush;
+
+      while not End_Of_File loop
+         declare
+            Request    : constant String := Trim (Get_Line, Both);
+            First_Gap  : constant Natural := Index (Request, " ");
+            Second_Gap : Natural;
+            Runs       : Positive := 1;
+            Iterations : Natural;
+         begin
+            exit when Request = "QUIT";
+
+            if Request'Length = 0 then
+               null;
+            elsif First_Gap = 0 then
+               Reply_Error (Request, "expected <operation> <iterations> [runs]");
+            else
+               declare
+                  Operation : constant String :=
+                    Request (Request'First .. First_Gap - 1);
+                  Rest      : constant String :=
+                    Trim (Request (First_Gap + 1 .. Request'Last), Both);
+               begin
+                  Second_Gap := Index (Rest, " ");
+                  if Second_Gap = 0 then
+                     Iterations := Natural'Value (Rest);
+                  else
+                     Iterations := Natural'Value (Rest (Rest'First .. Second_Gap - 1));
+                     Runs := Positive'Value (Rest (Second_Gap + 1 .. Rest'Last));
+                  end if;
+
+                  for Run in 1 .. Runs loop
+                     Batch_Run := Run;
+                     if not Run_Benchmark (Operation, Iterations) then
+                        Reply_Error (Operation, "unknown operation");
+                        exit;
+                     end if;
+                  end loop;
+
+                  Put_Line ("{""operation"":""" & Operation & """,""done"":true}");
+                  Flush;
+               exception
+                  when Constraint_Error =>
+                     Reply_Error (Operation, "bad iteration or run count");
+               end;
+            end if;
+         end;
+      end loop;
+   end Run_Batch;
+
    ---------------------------------------------------------------------------
    -- Main Program
    ---------------------------------------------------------------------------
 
-   Operation  : String (1 .. 30);
    Iterations : Natural := 10_000;
 
 begin
+   Calibrate_Clock;
+
    if Argument_Count < 1 then
       Put_Line ("Usage: performance_benchmark <operation> [iterations]");
+      Put_Line ("       performance_benchmark --batch");
       Put_Line ("");
       Put_Line ("Operations:");
       Put_Line ("  Get_Empty_Any          - Allocation benchmark");
@@ -404,52 +640,17 @@ begin
       return;
    end if;
 
-   --  Parse arguments
-   declare
-      Op_Arg : constant String := Argument (1);
-   begin
-      Operation (1 .. Op_Arg'Length) := Op_Arg;
-      for I in Op_Arg'Length + 1 .. Operation'Length loop
-         Operation (I) := ' ';
-      end loop;
-   end;
+   if Argument (1) = "--batch" then
+      Run_Batch;
+      return;
+   end if;
 
    if Argument_Count >= 2 then
       Iterations := Natural'Value (Argument (2));
    end if;
 
    --  Run requested benchmark
-   if Operation (1 .. 13) = "Get_Empty_Any" then
-      Benchmark_Get_Empty_Any (Iterations);
-
-   elsif Operation (1 .. 8) = "Finalize" then
-      Benchmark_Finalize (Iterations);
-
-   elsif Operation (1 .. 6) = "Adjust" then
-      Benchmark_Adjust (Iterations);
-
-   elsif Operation (1 .. 8) = "From_Any" then
-      Benchmark_From_Any (Iterations);
-
-   elsif Operation (1 .. 6) = "To_Any" then
-      Benchmark_To_Any (Iterations);
-
-   elsif Operation (1 .. 8) = "Get_Type" then
-      Benchmark_Get_Type (Iterations);
-
-   elsif Operation (1 .. 8) = "Is_Empty" then
-      Benchmark_Is_Empty (Iterations);
-
-   elsif Operation (1 .. 5) = "Clone" then
-      Benchmark_Clone (Iterations);
-
-   elsif Operation (1 .. 8) = "Set_Type" then
-      Benchmark_Set_Type (Iterations);
-
-   elsif Operation (1 .. 21) = "Get_Aggregate_Element" then
-      Benchmark_Get_Aggregate_Element (Iterations);
-
-   elsif Operation (1 .. 3) = "ALL" then
+   if Argument (1) = "ALL" then
       Put_Line ("Running all benchmarks...");
       Put_Line ("");
       Benchmark_Get_Empty_Any (Iterations);
@@ -463,8 +664,8 @@ begin
       Benchmark_Set_Type (Iterations / 2);
       Benchmark_Get_Aggregate_Element (Iterations);
 
-   else
-      Put_Line ("Unknown operation: " & Operation);
+   elsif not Run_Benchmark (Argument (1), Iterations) then
+      Put_Line ("Unknown operation: " & Argument (1));
       Set_Exit_Status (Failure);
    end if;
 
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Benchmark Run Protocol for PolyORB
+Warmup, CPU pinning, interleaving and system-noise indicators
+
+Author: @test_stabilize
+Context: RDB-004 Task 6 - keeping run-to-run noise below the 5% threshold
+"""
+
+import glob
+import os
+import platform
+import random
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        return Path(path).read_text().strip()
+    except OSError:
+        return None
+
+
+def _parse_cpu_list(text: Optional[str]) -> List[int]:
+    """Parse a kernel CPU list such as '2-3,6'"""
+    cpus: List[int] = []
+    for part in (text or '').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            low, high = part.split('-', 1)
+            cpus.extend(range(int(low), int(high) + 1))
+        else:
+            cpus.append(int(part))
+    return cpus
+
+
+class RunProtocol:
+    """
+    How benchmark runs are ordered and where they execute
+
+    warmup_runs: runs per operation executed first and discarded, so
+        cold caches, page faults and lazy elaboration do not land in
+        the first measured run
+    cpu: core the benchmark process is pinned to with
+        os.sched_setaffinity; a number must be in the process's
+        affinity mask (ValueError otherwise); 'auto' prefers a core from
+        the kernel's isolcpus list, else the highest-numbered allowed
+        core; None leaves scheduling to the OS
+    interleave: shuffle the order of operations within every round of
+        runs, so thermal and cache drift spread over all operations
+        instead of biasing whichever ran last
+    seed: seed for the interleaving, recorded with the results
+    """
+
+    def __init__(self, warmup_runs: int = 1, cpu: Optional[str] = 'auto',
+                 interleave: bool = True, seed: int = 0):
+        self.warmup_runs = warmup_runs
+        self.interleave = interleave
+        self.seed = seed
+        self.cpu = self._resolve_cpu(cpu)
+
+    @staticmethod
+    def _resolve_cpu(cpu: Optional[str]) -> Optional[int]:
+        if cpu is None or cpu == 'none' or not hasattr(os, 'sched_setaffinity'):
+            return None
+        allowed = sorted(os.sched_getaffinity(0))
+        if cpu != 'auto':
+            try:
+                requested = int(cpu)
+            except ValueError:
+                raise ValueError(f"invalid CPU {cpu!r}: expected a number, 'auto' or 'none'")
+            if requested not in allowed:
+                raise ValueError(f"CPU {requested} is not available to this process "
+                                 f"(allowed: {', '.join(map(str, allowed))})")
+            return requested
+        isolated = [c for c in _parse_cpu_list(_read('/sys/devices/system/cpu/isolated'))
+                    if c in allowed]
+        if isolated:
+            return isolated[0]
+        # Core 0 takes most interrupts and housekeeping; use the last one
+        return allowed[-1] if len(allowed) > 1 else None
+
+    def pin(self, pid: int = 0):
+        """Pin a process (0: the calling process) to the protocol's core"""
+        if self.cpu is not None:
+            os.sched_setaffinity(pid, {self.cpu})
+
+    @contextmanager
+    def pinned(self):
+        """
+        Pin the calling thread while the block runs
+
+        Children started in the block inherit the affinity from their
+        first instruction. Unlike a preexec_fn, this is safe while other
+        threads are running.
+        """
+        if self.cpu is None:
+            yield
+            return
+        previous = os.sched_getaffinity(0)
+        os.sched_setaffinity(0, {self.cpu})
+        try:
+            yield
+        finally:
+            os.sched_setaffinity(0, previous)
+
+    def schedule(self, hot_paths: List[Dict], runs: int) -> List[Tuple[Dict, bool]]:
+        """
+        Order of single runs: [(path_config, is_warmup), ...]
+
+        Warmup runs for every operation come first, then `runs` rounds
+        that each run every operation once.
+        """
+        rng = random.Random(self.seed)
+        order: List[Tuple[Dict, bool]] = []
+        for _ in range(self.warmup_runs):
+            order.extend((path_config, True) for path_config in hot_paths)
+        for _ in range(runs):
+            round_paths = list(hot_paths)
+            if self.interleave:
+                rng.shuffle(round_paths)
+            order.extend((path_config, False) for path_config in round_paths)
+        return order
+
+    def describe(self) -> str:
+        pinned = f"pinned to CPU {self.cpu}" if self.cpu is not None else "not pinned"
+        order = f"interleaved (seed {self.seed})" if self.interleave else "in fixed order"
+        return f"{self.warmup_runs} warmup run(s) discarded, {pinned}, {order}"
+
+    def settings(self) -> Dict:
+        return {
+            'warmup_runs': self.warmup_runs,
+            'pinned_cpu': self.cpu,
+            'interleave': self.interleave,
+            'seed': self.seed,
+        }
+
+
+def noise_indicators() -> Dict:
+    """
+    Snapshot of system state that affects timing stability
+
+    Everything is best effort: values the platform does not expose are
+    None. 'warnings' lists the conditions that make a 5% difference
+    hard to trust.
+    """
+    try:
+        load = list(os.getloadavg())
+    except OSError:
+        load = None
+
+    governors = sorted({g for g in (
+        _read(path) for path in glob.glob('/sys/devices/system/cpu/cpu[0-9]*/cpufreq/scaling_governor')
+    ) if g})
+
+    no_turbo = _read('/sys/devices/system/cpu/intel_pstate/no_turbo')
+    boost = _read('/sys/devices/system/cpu/cpufreq/boost')
+    if no_turbo is not None:
+        turbo = no_turbo == '0'
+    elif boost is not None:
+        turbo = boost == '1'
+    else:
+        turbo = None
+
+    cpus = os.cpu_count() or 1
+    indicators = {
+        'hostname': platform.node(),
+        'kernel': platform.release(),
+        'cpu_count': cpus,
+        'loadavg': load,
+        'governors': governors or None,
+        'turbo': turbo,
+        'isolated_cpus': _parse_cpu_list(_read('/sys/devices/system/cpu/isolated')) or None,
+    }
+
+    warnings = []
+    if load is not None and load[0] > 0.25 * cpus:
+        warnings.append(f"load average {load[0]:.2f} on {cpus} CPUs")
+    if governors and governors != ['performance']:
+        warnings.append(f"CPU frequency governor is {', '.join(governors)} (not performance)")
+    if turbo:
+        warnings.append("turbo boost is enabled")
+    indicators['warnings'] = warnings
+    return indicators
+
+
+def environment_differences(baseline: Optional[Dict], current: Optional[Dict]) -> List[str]:
+    """Conditions that differ between two recorded environments"""
+    if not baseline or not current:
+        return []
+    differences = []
+    for key, label in (('hostname', 'host'), ('kernel', 'kernel'),
+                       ('governors', 'CPU governor'), ('turbo', 'turbo boost'),
+                       ('simulated', 'simulated timings')):
+        if baseline.get(key) != current.get(key):
+            differences.append(f"{label} {baseline.get(key)} → {current.get(key)}")
+    base_protocol = baseline.get('protocol') or {}
+    current_protocol = current.get('protocol') or {}
+    for key in ('warmup_runs', 'pinned_cpu', 'interleave'):
+        if base_protocol.get(key) != current_protocol.get(key):
+            differences.append(f"{key} {base_protocol.get(key)} → {current_protocol.get(key)}")
+    return differences
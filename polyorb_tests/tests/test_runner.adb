@@ -2,8 +2,12 @@
 -- Task 306a6a: Ada Test Framework (AUnit) Setup
 -- PolyORB Integration - Phase 2-4
 
+with Ada.Command_Line;
+
+with AUnit.Options;
 with AUnit.Run;
 with AUnit.Reporter.Text;
+with AUnit.Test_Filters;
 with AUnit.Test_Suites; use AUnit.Test_Suites;
 
 with Calculator_Test_Suite;
@@ -42,7 +46,16 @@ procedure Test_Runner is
 
    procedure Runner is new AUnit.Run.Test_Runner (Master_Suite);
    Reporter : AUnit.Reporter.Text.Text_Reporter;
+   Filter   : aliased AUnit.Test_Filters.Name_Filter;
+   Options  : AUnit.Options.AUnit_Options := AUnit.Options.Default_Options;
 
 begin
-   Runner (Reporter);
+   -- Optional argument: run only the tests whose name starts with it
+   -- (used by generate_mutants.py for coverage-guided test selection)
+   if Ada.Command_Line.Argument_Count > 0 then
+      AUnit.Test_Filters.Set_Name (Filter, Ada.Command_Line.Argument (1));
+      Options.Filter := Filter'Unchecked_Access;
+   end if;
+
+   Runner (Reporter, Options);
 end Test_Runner;
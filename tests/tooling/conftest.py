@@ -0,0 +1,14 @@
+"""
+pytest configuration for the tooling unit tests
+
+The modules under test are the scripts in improvements/, which are not
+an installed package; their directory is put on sys.path here. They need
+only the standard library.
+"""
+
+import os
+import sys
+
+IMPROVEMENTS_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', '..', 'improvements'))
+sys.path.insert(0, IMPROVEMENTS_DIR)
@@ -0,0 +1,109 @@
+"""
+Unit tests: DiffScope (improvements/generate_mutants.py)
+
+The diff-scoped mutation mode only mutates lines touched since a base
+revision and maps the verdicts of the other lines through the diff.
+"""
+
+import subprocess
+
+import pytest
+
+from generate_mutants import DiffScope
+
+
+def git(repo, *args):
+    subprocess.run(['git', '-C', str(repo), '-c', 'user.name=test', '-c', 'user.email=test@example.com',
+                    *args], check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """A repository whose only commit holds ten numbered lines in unit.adb"""
+    git(tmp_path, 'init', '-q')
+    (tmp_path / 'unit.adb').write_text(''.join(f"line {i}\n" for i in range(1, 11)))
+    git(tmp_path, 'add', 'unit.adb')
+    git(tmp_path, 'commit', '-q', '-m', 'base')
+    return tmp_path
+
+
+def edit(repo, lines):
+    (repo / 'unit.adb').write_text(''.join(f"{line}\n" for line in lines))
+
+
+class TestFromGit:
+    """Parsing `git diff -U0` hunks of the working copy."""
+
+    def test_unchanged_file_has_no_scope(self, repo):
+        scope = DiffScope.from_git(repo / 'unit.adb', 'HEAD')
+        assert scope.hunks == []
+        assert not any(scope.changed(line) for line in range(1, 11))
+        assert scope.map_base_line(7) == 7
+
+    def test_modified_line(self, repo):
+        lines = [f"line {i}" for i in range(1, 11)]
+        lines[4] = "line 5 changed"
+        edit(repo, lines)
+
+        scope = DiffScope.from_git(repo / 'unit.adb', 'HEAD')
+        assert scope.hunks == [(5, 1, 5, 1)]
+        assert [line for line in range(1, 11) if scope.changed(line)] == [5]
+        assert scope.map_base_line(5) is None
+        assert scope.map_base_line(4) == 4
+        assert scope.map_base_line(6) == 6
+
+    def test_insertion_shifts_later_lines(self, repo):
+        lines = [f"line {i}" for i in range(1, 11)]
+        lines[3:3] = ["new a", "new b"]
+        edit(repo, lines)
+
+        scope = DiffScope.from_git(repo / 'unit.adb', 'HEAD')
+        assert scope.hunks == [(3, 0, 4, 2)]
+        assert [line for line in range(1, 13) if scope.changed(line)] == [4, 5]
+        assert scope.map_base_line(3) == 3
+        assert scope.map_base_line(4) == 6
+        assert scope.map_base_line(10) == 12
+
+    def test_deletion_marks_both_sides_of_the_gap(self, repo):
+        lines = [f"line {i}" for i in range(1, 11)]
+        del lines[5:7]
+        edit(repo, lines)
+
+        scope = DiffScope.from_git(repo / 'unit.adb', 'HEAD')
+        assert scope.hunks == [(6, 2, 5, 0)]
+        assert [line for line in range(1, 9) if scope.changed(line)] == [5, 6]
+        assert scope.map_base_line(6) is None
+        assert scope.map_base_line(7) is None
+        assert scope.map_base_line(8) == 6
+
+    def test_context_widens_the_scope(self, repo):
+        lines = [f"line {i}" for i in range(1, 11)]
+        lines[4] = "line 5 changed"
+        edit(repo, lines)
+
+        scope = DiffScope.from_git(repo / 'unit.adb', 'HEAD', context=2)
+        assert [line for line in range(1, 11) if scope.changed(line)] == [3, 4, 5, 6, 7]
+
+    def test_untracked_file_is_in_scope_entirely(self, repo):
+        (repo / 'new.adb').write_text("line 1\n")
+        scope = DiffScope.from_git(repo / 'new.adb', 'HEAD')
+        assert scope.whole_file
+        assert scope.changed(1)
+        assert scope.map_base_line(1) is None
+
+    def test_unknown_base_is_an_error(self, repo):
+        with pytest.raises(RuntimeError):
+            DiffScope.from_git(repo / 'unit.adb', 'no-such-revision')
+
+
+class TestMapBaseLine:
+    """Line mapping across several hunks."""
+
+    def test_offsets_accumulate(self):
+        # Line 2 replaced by three lines, lines 6-7 deleted
+        scope = DiffScope([(2, 1, 2, 3), (6, 2, 7, 0)])
+        assert scope.map_base_line(1) == 1
+        assert scope.map_base_line(2) is None
+        assert scope.map_base_line(5) == 7
+        assert scope.map_base_line(6) is None
+        assert scope.map_base_line(8) == 8
@@ -0,0 +1,155 @@
+"""
+Unit tests: LatencyHistogram (improvements/latency_histogram.py)
+
+The bucket layout is shared with performance_benchmark.adb, so index_of
+and bucket_bounds must agree exactly and stay stable.
+"""
+
+import pytest
+
+from latency_histogram import LatencyHistogram
+
+
+class TestBuckets:
+    """index_of / bucket_bounds round-trips."""
+
+    @pytest.mark.parametrize('sub_bucket_bits', [3, 7])
+    def test_every_value_lands_in_its_bucket(self, sub_bucket_bits):
+        histogram = LatencyHistogram(sub_bucket_bits)
+        for value in list(range(5000)) + [2 ** 20 - 1, 2 ** 20, 2 ** 30 + 12345, 2 ** 40 - 1]:
+            low, high = histogram.bucket_bounds(histogram.index_of(value))
+            assert low <= value < high
+
+    def test_bounds_round_trip_and_tile_the_range(self):
+        histogram = LatencyHistogram()
+        previous_high = 0
+        for index in range(2000):
+            low, high = histogram.bucket_bounds(index)
+            assert low == previous_high
+            assert histogram.index_of(low) == index
+            assert histogram.index_of(high - 1) == index
+            previous_high = high
+
+    def test_exact_below_sub_bucket_count(self):
+        histogram = LatencyHistogram()
+        for value in range(128):
+            assert histogram.bucket_bounds(histogram.index_of(value)) == (value, value + 1)
+
+    def test_relative_precision(self):
+        histogram = LatencyHistogram()
+        for value in (128, 1000, 123456, 10 ** 9):
+            low, high = histogram.bucket_bounds(histogram.index_of(value))
+            assert (high - low) / low <= 1 / 64
+
+    def test_layout_matches_the_benchmark_driver(self):
+        # Bucket_Index in performance_benchmark.adb halves the value until
+        # it is below Sub_Bucket_Count, counting the halvings
+        def bucket_index(value, bits=7):
+            count, half = 1 << bits, 1 << (bits - 1)
+            if value < count:
+                return value
+            exponent = 0
+            while value >= count:
+                value //= 2
+                exponent += 1
+            return count + (exponent - 1) * half + value - half
+
+        histogram = LatencyHistogram()
+        for value in [0, 1, 127, 128, 129, 255, 256, 1000, 65535, 10 ** 6, 10 ** 9]:
+            assert histogram.index_of(value) == bucket_index(value)
+
+
+class TestStatistics:
+    """Percentiles, mean and stddev."""
+
+    def test_empty(self):
+        histogram = LatencyHistogram()
+        assert histogram.percentile(50) is None
+        assert histogram.mean() is None
+        assert histogram.stddev() is None
+
+    def test_exact_values(self):
+        histogram = LatencyHistogram()
+        histogram.record_all(range(1, 101))
+        assert histogram.percentile(50) == 50
+        assert histogram.percentile(99) == 99
+        assert histogram.percentile(100) == 100
+        assert histogram.percentiles((50.0, 99.9)) == {'p50': 50, 'p99.9': 100}
+        assert histogram.mean() == pytest.approx(50.5)
+        assert histogram.stddev() == pytest.approx(29.011, abs=1e-3)
+
+    def test_percentiles_are_clamped_to_min_and_max(self):
+        histogram = LatencyHistogram()
+        histogram.record(100000)
+        assert histogram.percentile(50) == 100000
+        assert histogram.percentile(0) == 100000
+
+    def test_large_values_are_within_precision(self):
+        histogram = LatencyHistogram()
+        values = [1000 * i for i in range(1, 1001)]
+        histogram.record_all(values)
+        for percent in (50, 90, 99):
+            expected = values[int(len(values) * percent / 100) - 1]
+            assert histogram.percentile(percent) == pytest.approx(expected, rel=1 / 64)
+
+    def test_counts_and_rounding(self):
+        histogram = LatencyHistogram()
+        histogram.record(10.4, count=3)
+        histogram.record(-5)
+        assert histogram.total_count == 4
+        assert histogram.counts == {10: 3, 0: 1}
+        assert (histogram.min_value, histogram.max_value) == (0, 10)
+
+
+class TestMerge:
+    """Merging and serialisation."""
+
+    def test_merge_equals_recording_everything_once(self):
+        first, second, both = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        first.record_all(range(0, 5000, 7))
+        second.record_all(range(3, 90000, 11))
+        both.record_all(list(range(0, 5000, 7)) + list(range(3, 90000, 11)))
+
+        merged = first.merge(second)
+        assert merged is first
+        assert merged.counts == both.counts
+        assert merged.total_count == both.total_count
+        assert (merged.min_value, merged.max_value) == (both.min_value, both.max_value)
+        assert merged.percentiles() == both.percentiles()
+
+    def test_merge_with_empty(self):
+        histogram, empty = LatencyHistogram(), LatencyHistogram()
+        histogram.record(42)
+        histogram.merge(empty)
+        empty.merge(histogram)
+        assert empty.to_dict() == histogram.to_dict()
+
+    def test_merged(self):
+        parts = [LatencyHistogram() for _ in range(3)]
+        for i, part in enumerate(parts):
+            part.record(10 ** (i + 2))
+        merged = LatencyHistogram.merged(parts)
+        assert merged.total_count == 3
+        assert merged is not parts[0]
+        assert parts[0].total_count == 1
+        assert LatencyHistogram.merged([]) is None
+
+    @pytest.mark.parametrize('other', [LatencyHistogram(5), LatencyHistogram(unit='us')])
+    def test_incompatible_layouts_do_not_merge(self, other):
+        with pytest.raises(ValueError):
+            LatencyHistogram().merge(other)
+
+    def test_dict_round_trip(self):
+        histogram = LatencyHistogram(unit='us')
+        histogram.record_all([3, 3, 250, 99999])
+        restored = LatencyHistogram.from_dict(histogram.to_dict())
+        assert restored.to_dict() == histogram.to_dict()
+        assert restored.unit == 'us'
+        assert histogram.to_dict()['buckets'][0] == [3, 2]
+
+    def test_from_dict_without_min_and_max(self):
+        # Without recorded min/max, the outermost bucket bounds stand in
+        histogram = LatencyHistogram.from_dict({'buckets': [[200, 1]]})
+        low, high = histogram.bucket_bounds(200)
+        assert (histogram.min_value, histogram.max_value) == (low, high - 1)
+        assert histogram.unit == 'ns'
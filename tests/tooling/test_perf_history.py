@@ -0,0 +1,129 @@
+"""
+Unit tests: PerformanceHistory drift detection (improvements/perf_history.py)
+
+Synthetic per-commit series: flat noise, a steady creep and a step.
+"""
+
+import random
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from perf_history import PerformanceHistory, _mann_kendall, _noise_sigma, _theil_sen
+
+
+def noisy(levels, sigma=0.5, seed=0):
+    rng = random.Random(seed)
+    return [level + rng.gauss(0, sigma) for level in levels]
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = PerformanceHistory(str(tmp_path / 'history.db'))
+    yield history
+    history.close()
+
+
+def record_series(history, values, series='Finalize', metric='mean_ms', higher_is_better=False):
+    """One run per commit, a day apart"""
+    start = datetime(2026, 1, 1)
+    for i, value in enumerate(values):
+        history.record_run('benchmark', f'c{i:03d}', [{
+            'series': series, 'metric': metric, 'value': value,
+            'higher_is_better': higher_is_better,
+        }], recorded_at=(start + timedelta(days=i)).strftime('%Y-%m-%dT%H:%M:%S'))
+
+
+class TestStatistics:
+    """Robust slope, trend test and noise estimate."""
+
+    def test_theil_sen_ignores_an_outlier(self):
+        xs = list(range(10))
+        ys = [2 * x + 1 for x in xs]
+        ys[4] = 100
+        assert _theil_sen(xs, ys) == pytest.approx(2)
+        assert _theil_sen([1, 1], [2, 3]) is None
+
+    def test_mann_kendall(self):
+        z, p = _mann_kendall(list(range(20)))
+        assert z > 0 and p < 0.001
+        z, p = _mann_kendall(list(range(20, 0, -1)))
+        assert z < 0 and p < 0.001
+        assert _mann_kendall([5.0] * 10) == (0.0, 1.0)
+
+    def test_noise_sigma_ignores_a_level_shift(self):
+        flat = noisy([100] * 40, sigma=1.0)
+        stepped = flat[:20] + [value + 30 for value in flat[20:]]
+        assert _noise_sigma(stepped) == pytest.approx(_noise_sigma(flat), rel=0.2)
+        assert 0.5 < _noise_sigma(flat) < 2
+
+
+class TestPoints:
+    """Per-commit aggregation."""
+
+    def test_runs_of_a_commit_are_merged_to_their_median(self, history):
+        for value in (10, 30, 11):
+            history.record_run('benchmark', 'abc', [{'series': 's', 'metric': 'm', 'value': value}])
+        history.record_run('benchmark', 'def', [{'series': 's', 'metric': 'm', 'value': 5}])
+        points = history.points('s', 'm')
+        assert [(p['commit_hash'], p['value'], p['runs']) for p in points] == \
+            [('abc', 11, 3), ('def', 5, 1)]
+
+    def test_history_is_append_only(self, history):
+        record_series(history, [1.0])
+        with pytest.raises(sqlite3.DatabaseError):
+            history.conn.execute('DELETE FROM measurements')
+        with pytest.raises(sqlite3.DatabaseError):
+            history.conn.execute('UPDATE measurements SET value = 2')
+
+
+class TestDrift:
+    """Trends and change points on synthetic series."""
+
+    def test_flat_noise_is_quiet(self, history):
+        record_series(history, noisy([100] * 30))
+        trend = history.trend('Finalize', 'mean_ms', last=30)
+        assert trend['p_value'] > 0.01
+        assert history.change_points('Finalize', 'mean_ms') == []
+        assert history.drift() == []
+
+    def test_creep_is_a_worsening_trend(self, history):
+        # 1% per commit, well below any single-comparison threshold
+        record_series(history, noisy([100 + i for i in range(20)], sigma=0.3))
+        trend = history.trend('Finalize', 'mean_ms')
+        assert trend['worsening']
+        assert trend['p_value'] < 0.001
+        assert trend['slope_pct_per_commit'] == pytest.approx(1, rel=0.2)
+        assert trend['slope_pct_per_week'] == pytest.approx(7, rel=0.2)
+        assert [f['kind'] for f in history.drift()][:1] == ['trend']
+
+    def test_falling_throughput_is_worsening(self, history):
+        record_series(history, noisy([1000 - 10 * i for i in range(20)]),
+                      metric='requests_per_second', higher_is_better=True)
+        assert history.trend('Finalize', 'requests_per_second')['worsening']
+
+    def test_step_is_one_change_point(self, history):
+        record_series(history, noisy([100] * 15 + [120] * 15))
+        changes = history.change_points('Finalize', 'mean_ms')
+        assert len(changes) == 1
+        assert changes[0]['commit_hash'] == 'c015'
+        assert changes[0]['change_pct'] == pytest.approx(20, abs=2)
+        assert changes[0]['worsening']
+        assert 'change_point' in [f['kind'] for f in history.drift(last=30)]
+
+    def test_improving_step_is_not_drift(self, history):
+        record_series(history, noisy([120] * 15 + [100] * 15))
+        changes = history.change_points('Finalize', 'mean_ms')
+        assert [c['commit_hash'] for c in changes] == ['c015']
+        assert not changes[0]['worsening']
+        assert [f for f in history.drift(last=30) if f['kind'] == 'change_point'] == []
+
+    def test_two_steps(self, history):
+        record_series(history, noisy([100] * 10 + [115] * 10 + [130] * 10))
+        changes = history.change_points('Finalize', 'mean_ms')
+        assert [c['commit_hash'] for c in changes] == ['c010', 'c020']
+
+    def test_tiny_shift_is_below_min_change(self, history):
+        record_series(history, [100.0] * 10 + [100.2] * 10)
+        assert history.change_points('Finalize', 'mean_ms') == []
@@ -0,0 +1,143 @@
+"""
+Unit tests: regression statistics (improvements/perf_stats.py)
+"""
+
+import math
+import random
+from statistics import NormalDist
+
+import pytest
+
+from perf_stats import (EXACT_LIMIT, _mann_whitney_exact_cdf, bootstrap_change_ci,
+                        cliffs_delta, compare_samples, format_p, mann_whitney, quantile)
+
+
+def gauss(mean, sigma, count, seed):
+    rng = random.Random(seed)
+    return [rng.gauss(mean, sigma) for _ in range(count)]
+
+
+class TestMannWhitney:
+    """Exact distribution for small samples, normal approximation otherwise."""
+
+    def test_exact_complete_separation(self):
+        # Only one of the C(6, 3) = 20 orderings puts all of current on top
+        assert mann_whitney([4, 5, 6], [1, 2, 3]) == (pytest.approx(1 / 20), 1.0)
+        assert mann_whitney([1, 2, 3], [4, 5, 6]) == (1.0, pytest.approx(1 / 20))
+
+    def test_exact_at_the_limit(self):
+        current = [float(i) for i in range(100, 100 + EXACT_LIMIT)]
+        baseline = [float(i) for i in range(EXACT_LIMIT)]
+        p_slower, _ = mann_whitney(current, baseline)
+        assert p_slower == pytest.approx(1 / math.comb(2 * EXACT_LIMIT, EXACT_LIMIT))
+
+    def test_exact_cdf_is_a_distribution(self):
+        m, n = 4, 5
+        assert _mann_whitney_exact_cdf(m * n, m, n) == pytest.approx(1.0)
+        # Symmetric around m * n / 2
+        for u in range(m * n):
+            assert _mann_whitney_exact_cdf(u, m, n) == pytest.approx(
+                1 - _mann_whitney_exact_cdf(m * n - u - 1, m, n))
+
+    def test_normal_approximation_above_the_limit(self):
+        size = EXACT_LIMIT + 1
+        rng = random.Random(3)
+        current = [rng.random() + 0.2 for _ in range(size)]
+        baseline = [rng.random() for _ in range(size)]
+        p_slower, p_faster = mann_whitney(current, baseline)
+
+        u_current = sum(c > b for c in current for b in baseline)
+        sigma = math.sqrt(size * size * (2 * size + 1) / 12)
+        expected = 1 - NormalDist().cdf((u_current - size * size / 2 - 0.5) / sigma)
+        assert p_slower == pytest.approx(expected)
+        # ... and close to the exact distribution it stands in for
+        exact = _mann_whitney_exact_cdf(size * size - u_current, size, size)
+        assert p_slower == pytest.approx(exact, abs=0.01)
+        assert p_faster > 0.5
+
+    def test_ties_use_the_normal_approximation(self):
+        p_slower, p_faster = mann_whitney([2, 3, 3, 4], [1, 2, 2, 3])
+        assert 0 < p_slower < 0.5 < p_faster < 1
+        assert mann_whitney([5, 5, 5], [5, 5, 5]) == (1.0, 1.0)
+
+    def test_empty_samples(self):
+        assert mann_whitney([], [1.0]) == (1.0, 1.0)
+
+
+class TestEffectSizes:
+    """Cliff's delta, quantiles and the bootstrap CI."""
+
+    def test_cliffs_delta(self):
+        assert cliffs_delta([4, 5, 6], [1, 2, 3]) == 1.0
+        assert cliffs_delta([1, 2, 3], [4, 5, 6]) == -1.0
+        assert cliffs_delta([1, 2, 3], [1, 2, 3]) == 0.0
+        assert cliffs_delta([2, 3], [1, 2]) == pytest.approx(0.75)
+        assert cliffs_delta([], [1]) == 0.0
+
+    def test_quantile_interpolates(self):
+        assert quantile([4, 1, 3, 2], 50) == 2.5
+        assert quantile([1, 2, 3, 4, 5], 25) == 2
+        assert quantile([10, 20], 95) == pytest.approx(19.5)
+        assert quantile([7], 99) == 7
+
+    def test_bootstrap_ci_covers_the_shift(self):
+        baseline = gauss(100, 1, 40, seed=1)
+        current = [value * 1.1 for value in gauss(100, 1, 40, seed=2)]
+        change = (quantile(current, 50) - quantile(baseline, 50)) / quantile(baseline, 50) * 100
+        low, high = bootstrap_change_ci(current, baseline)
+        assert low < change < high
+        assert 8 < low and high < 12
+        assert bootstrap_change_ci(current, baseline) == (low, high)
+
+
+class TestCompareSamples:
+    """Verdicts."""
+
+    baseline = gauss(100, 1, 30, seed=1)
+
+    def test_regression(self):
+        result = compare_samples(gauss(110, 1, 30, seed=2), self.baseline)
+        assert result.verdict == 'regression'
+        assert result.change_percent == pytest.approx(10, abs=1)
+        assert result.ci_low_percent < result.change_percent < result.ci_high_percent
+        assert result.p_slower < 0.01
+        assert result.cliffs_delta == 1.0
+        assert (result.baseline_runs, result.current_runs) == (30, 30)
+
+    def test_improvement(self):
+        result = compare_samples(gauss(90, 1, 30, seed=2), self.baseline)
+        assert result.verdict == 'improvement'
+        assert result.p_faster < 0.01
+        assert result.cliffs_delta == -1.0
+
+    def test_unchanged(self):
+        result = compare_samples(gauss(100, 1, 30, seed=2), self.baseline)
+        assert result.verdict == 'unchanged'
+        assert -5 < result.ci_low_percent < result.ci_high_percent < 5
+
+    def test_significant_but_below_threshold_is_unchanged(self):
+        result = compare_samples(gauss(101, 1, 30, seed=2), self.baseline)
+        assert result.p_slower < 0.01
+        assert result.verdict == 'unchanged'
+
+    def test_too_few_noisy_runs_are_inconclusive(self):
+        result = compare_samples([130, 90, 160], [100, 150, 80])
+        assert result.verdict == 'inconclusive'
+        assert result.change_percent == pytest.approx(30)
+
+    def test_tail_regression_is_gated_on_its_percentile(self):
+        baseline = gauss(100, 2, 400, seed=2)
+        # The slowest 10% of requests get 50% slower; the median does not move
+        current = gauss(100, 2, 400, seed=3)
+        cutoff = quantile(current, 90)
+        current = [value * 1.5 if value > cutoff else value for value in current]
+        assert compare_samples(current, baseline).verdict == 'unchanged'
+        tail = compare_samples(current, baseline, percentile=95.0)
+        assert tail.verdict == 'regression'
+        assert tail.change_percent > 40
+
+
+@pytest.mark.parametrize('p, text', [(0.0004, 'p<0.001'), (0.004, 'p<0.01'),
+                                     (0.04, 'p<0.05'), (0.26, 'p=0.26')])
+def test_format_p(p, text):
+    assert format_p(p) == text
@@ -0,0 +1,90 @@
+"""
+Unit tests: RunJournal (improvements/generate_mutants.py)
+
+A mutation run checkpoints every verdict to a JSON-lines journal so a
+killed run can be resumed with --resume.
+"""
+
+import json
+
+from generate_mutants import RunJournal
+
+
+def mutant(hash_value, **verdict):
+    return {'id': 1, 'hash': hash_value, 'line_number': 10, **verdict}
+
+
+class TestRunJournal:
+    """Checkpointing and resuming verdicts."""
+
+    def test_resume_restores_verdicts(self, tmp_path):
+        path = tmp_path / 'journal.jsonl'
+        journal = RunJournal(path)
+        journal.append(mutant('a', status='KILLED', killed_by='Test_Any', seconds=1.5))
+        journal.append(mutant('b', status='SURVIVED', covering_tests=3))
+        journal.close()
+
+        resumed = RunJournal(path, resume=True)
+        killed, survived, unknown = mutant('a'), mutant('b'), mutant('c')
+        assert resumed.restore(killed)
+        assert resumed.restore(survived)
+        assert not resumed.restore(unknown)
+        resumed.close()
+
+        assert killed['status'] == 'KILLED'
+        assert killed['killed_by'] == 'Test_Any'
+        assert killed['seconds'] == 1.5
+        assert killed['resumed'] is True
+        assert survived['covering_tests'] == 3
+        assert 'status' not in unknown
+
+    def test_only_verdict_fields_are_journaled(self, tmp_path):
+        path = tmp_path / 'journal.jsonl'
+        journal = RunJournal(path)
+        journal.append(mutant('a', status='KILLED', patch={'line': 10}, description='x'))
+        journal.close()
+
+        entry = json.loads(path.read_text())
+        assert entry == {'status': 'KILLED', 'hash': 'a'}
+
+    def test_without_resume_the_journal_starts_over(self, tmp_path):
+        path = tmp_path / 'journal.jsonl'
+        journal = RunJournal(path)
+        journal.append(mutant('a', status='KILLED'))
+        journal.close()
+
+        fresh = RunJournal(path)
+        assert not fresh.restore(mutant('a'))
+        fresh.close()
+        assert path.read_text() == ''
+
+    def test_later_entries_win(self, tmp_path):
+        path = tmp_path / 'journal.jsonl'
+        journal = RunJournal(path)
+        journal.append(mutant('a', status='TIMEOUT'))
+        journal.append(mutant('a', status='KILLED'))
+        journal.close()
+
+        resumed = RunJournal(path, resume=True)
+        restored = mutant('a')
+        resumed.restore(restored)
+        resumed.close()
+        assert restored['status'] == 'KILLED'
+
+    def test_torn_last_line_is_ignored_and_terminated(self, tmp_path):
+        path = tmp_path / 'journal.jsonl'
+        path.write_text(json.dumps({'hash': 'a', 'status': 'KILLED'}) + '\n'
+                        + '{"hash": "b", "sta')
+
+        resumed = RunJournal(path, resume=True)
+        assert resumed.restore(mutant('a'))
+        assert not resumed.restore(mutant('b'))
+        resumed.append(mutant('b', status='SURVIVED'))
+        resumed.close()
+
+        # The entry written after the crash survives a second resume
+        again = RunJournal(path, resume=True)
+        restored = mutant('b')
+        assert again.restore(restored)
+        again.close()
+        assert restored['status'] == 'SURVIVED'